@@ -5,8 +5,9 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 
-from core import settings, get_db
+from core import settings, get_db, SessionLocal
 from api.routes import area_calculation, spec_extraction, dia_report, qa_review, proposals, demo
+from services.module_b import idf_registry
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -109,8 +110,21 @@ async def startup_event():
     print(f"Database: {settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'configured'}")
     print(f"Docs available at: /docs")
 
+    # Compile the shared NOAA IDF tables once, including any from the specs table
+    try:
+        with SessionLocal() as db:
+            idf_registry.sync(db)
+    except Exception as e:
+        print(f"IDF registry: specs table unavailable ({e}), using built-in NOAA data")
+    for key in idf_registry.keys():
+        idf_registry.dataset(key)
+    print(f"IDF datasets loaded: {len(idf_registry.keys())}")
+
+    area_calculation.start_batch_pool()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown"""
     print(f"Shutting down {settings.APP_NAME}")
+    area_calculation.shutdown_batch_pool()
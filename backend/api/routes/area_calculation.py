@@ -6,8 +6,14 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from shapely.ops import transform as shapely_transform
 import tempfile
+import shutil
 import logging
+import time
+import uuid
 
 from core import get_db, settings
 from models import Project, Drawing, DrainageArea
@@ -16,11 +22,39 @@ from services.module_a import (
     AreaCalculator,
     WeightedCValueCalculator,
     TOCExcelUpdater,
+    SurveyCache,
+    BatchAreaCalculator,
+    SurfaceModel,
+    import_toc_directory,
 )
+from services.rounding import round_half_up
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+UPLOAD_COPY_BUFFER_BYTES = 1024 * 1024
+
+# Parsed surveys keyed by file content - re-uploads of the same CSV skip parsing
+survey_cache = SurveyCache(settings.SURVEY_CACHE_DIR, max_bytes=settings.SURVEY_CACHE_MAX_BYTES)
+
+# Worker pool for /calculate-batch and /import-toc-workbooks, started and shut down with the app (see main.py)
+batch_pool: Optional[ProcessPoolExecutor] = None
+
+
+def start_batch_pool():
+    """Create the shared batch worker pool"""
+    global batch_pool
+    if batch_pool is None:
+        batch_pool = ProcessPoolExecutor(max_workers=settings.AREA_BATCH_MAX_WORKERS)
+
+
+def shutdown_batch_pool():
+    """Shut down the shared batch worker pool"""
+    global batch_pool
+    if batch_pool is not None:
+        batch_pool.shutdown(wait=True, cancel_futures=True)
+        batch_pool = None
+
 
 # ============================================================================
 # Pydantic Models (Request/Response schemas)
@@ -45,6 +79,10 @@ class AreaCalculationRequest(BaseModel):
     area_label: str = Field(..., description="Drainage area label (e.g., 'E-DA1')")
     total_polygon: PolygonCoordinates
     impervious_polygons: Optional[List[PolygonCoordinates]] = None
+    overlay_impervious: bool = Field(
+        False,
+        description="Clip impervious polygons to the basin and union overlaps instead of summing their areas"
+    )
     land_use_breakdown: List[LandUseArea] = Field(..., description="Land use breakdown for C-value calculation")
 
 
@@ -64,6 +102,39 @@ class AreaCalculationResponse(BaseModel):
     centroid_y: float
 
 
+class BasinInput(BaseModel):
+    """One drainage basin in a batch calculation"""
+    area_label: str = Field(..., description="Drainage area label (e.g., 'E-DA1')")
+    total_polygon: PolygonCoordinates
+    impervious_polygons: Optional[List[PolygonCoordinates]] = None
+    land_use_breakdown: List[LandUseArea] = Field(..., description="Land use breakdown for C-value calculation")
+
+
+class BatchAreaCalculationRequest(BaseModel):
+    """Request to calculate many drainage areas at once"""
+    project_id: str = Field(..., description="Project UUID")
+    drawing_id: Optional[str] = Field(None, description="Drawing UUID (optional)")
+    basins: List[BasinInput] = Field(..., description="Drainage basins to calculate")
+    overlay_impervious: bool = Field(
+        False,
+        description="Clip impervious polygons to the basin and union overlaps instead of summing their areas"
+    )
+
+
+class BasinCalculationResponse(AreaCalculationResponse):
+    """Calculated basin with its database ID and processing time"""
+    drainage_area_id: str
+    elapsed_ms: float
+
+
+class BatchAreaCalculationResponse(BaseModel):
+    """Response with all calculated basins"""
+    project_id: str
+    total_basins: int
+    total_elapsed_ms: float
+    basins: List[BasinCalculationResponse]
+
+
 class WeightedCRequest(BaseModel):
     """Request to calculate weighted C-value"""
     land_use_areas: Dict[str, float] = Field(
@@ -80,6 +151,13 @@ class WeightedCResponse(BaseModel):
     breakdown: Dict
 
 
+class TOCImportRequest(BaseModel):
+    """Request to import historical TOC workbooks"""
+    directory: str = Field(..., description="Project directory to scan for .xlsx workbooks, relative to the TOC import root")
+    project_id: Optional[str] = Field(None, description="Project UUID - when given, records are saved as drainage areas")
+    pattern: str = Field("**/*.xlsx", description="Glob pattern for workbooks, relative to the directory")
+
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -114,7 +192,8 @@ async def calculate_drainage_area(
 
         area_result = area_calc.calculate_split_areas(
             total_polygon=request.total_polygon.coordinates,
-            impervious_polygons=impervious_coords
+            impervious_polygons=impervious_coords,
+            overlay=request.overlay_impervious
         )
 
         # Calculate weighted C-value
@@ -165,6 +244,121 @@ async def calculate_drainage_area(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/calculate-batch", response_model=BatchAreaCalculationResponse)
+def calculate_drainage_areas_batch(
+    request: BatchAreaCalculationRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Calculate many drainage areas in one request.
+
+    Basins are calculated in parallel on the app's shared process pool
+    (the handler runs in the threadpool, so the event loop is not blocked
+    while it waits) and every DrainageArea row is inserted in a single
+    transaction. If any basin
+    fails, nothing is saved and the failing basins are returned.
+
+    **Returns:**
+    - Per-basin areas, C-values and processing time (elapsed_ms)
+    """
+    try:
+        started = time.perf_counter()
+
+        basins = [
+            {
+                "area_label": basin.area_label,
+                "total_polygon": basin.total_polygon.coordinates,
+                "impervious_polygons": (
+                    [poly.coordinates for poly in basin.impervious_polygons]
+                    if basin.impervious_polygons else None
+                ),
+                "land_use_areas": {item.land_use: item.area for item in basin.land_use_breakdown},
+            }
+            for basin in request.basins
+        ]
+
+        batch_calc = BatchAreaCalculator(
+            precision=settings.AREA_CALCULATION_PRECISION,
+            max_workers=settings.AREA_BATCH_MAX_WORKERS,
+            executor=batch_pool,
+        )
+        try:
+            results = batch_calc.calculate(basins, overlay=request.overlay_impervious)
+        except BrokenProcessPool:
+            # A worker died and the pool is unusable; replace it for later requests
+            shutdown_batch_pool()
+            start_batch_pool()
+            raise
+
+        failures = [
+            {"area_label": result["area_label"], "error": result["error"]}
+            for result in results if "error" in result
+        ]
+        if failures:
+            raise HTTPException(
+                status_code=400,
+                detail={"message": "Basin calculation failed", "failures": failures}
+            )
+
+        # Bulk insert in a single transaction
+        drainage_areas = [
+            DrainageArea(
+                id=uuid.uuid4(),
+                project_id=request.project_id,
+                drawing_id=request.drawing_id,
+                area_label=result["area_label"],
+                total_area_sqft=result["area_result"]["total_area_sqft"],
+                total_area_acres=result["area_result"]["total_area_acres"],
+                impervious_area_sqft=result["area_result"]["impervious_area_sqft"],
+                impervious_area_acres=result["area_result"]["impervious_area_acres"],
+                pervious_area_sqft=result["area_result"]["pervious_area_sqft"],
+                pervious_area_acres=result["area_result"]["pervious_area_acres"],
+                weighted_c_value=result["c_result"]["weighted_c_value"],
+                land_use_breakdown=basin["land_use_areas"],
+            )
+            for basin, result in zip(basins, results)
+        ]
+
+        db.add_all(drainage_areas)
+        db.commit()
+
+        total_elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+
+        logger.info(f"Calculated {len(results)} drainage areas for project {request.project_id} in {total_elapsed_ms} ms")
+
+        return BatchAreaCalculationResponse(
+            project_id=request.project_id,
+            total_basins=len(results),
+            total_elapsed_ms=total_elapsed_ms,
+            basins=[
+                BasinCalculationResponse(
+                    drainage_area_id=str(drainage_area.id),
+                    area_label=result["area_label"],
+                    total_area_sqft=result["area_result"]["total_area_sqft"],
+                    total_area_acres=result["area_result"]["total_area_acres"],
+                    impervious_area_sqft=result["area_result"]["impervious_area_sqft"],
+                    impervious_area_acres=result["area_result"]["impervious_area_acres"],
+                    pervious_area_sqft=result["area_result"]["pervious_area_sqft"],
+                    pervious_area_acres=result["area_result"]["pervious_area_acres"],
+                    impervious_percentage=result["area_result"]["impervious_percentage"],
+                    weighted_c_value=result["c_result"]["weighted_c_value"],
+                    c_value_breakdown=result["c_result"]["breakdown"],
+                    centroid_x=result["centroid_x"],
+                    centroid_y=result["centroid_y"],
+                    elapsed_ms=result["elapsed_ms"],
+                )
+                for drainage_area, result in zip(drainage_areas, results)
+            ],
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error calculating drainage area batch: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/weighted-c", response_model=WeightedCResponse)
 async def calculate_weighted_c(request: WeightedCRequest):
     """
@@ -206,6 +400,8 @@ async def parse_survey_csv(
     Parse survey CSV file and extract point data.
 
     Accepts CSV files exported from Civil 3D or survey equipment.
+    The file is streamed in chunks, so uploads larger than available
+    memory are supported.
 
     **Required columns:**
     - Point Name
@@ -220,30 +416,39 @@ async def parse_survey_csv(
     - Optional: GeoJSON export
     """
     try:
-        # Save uploaded file to temporary location
+        # Save uploaded file to temporary location (copied in blocks, never fully in memory)
         with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
+            shutil.copyfileobj(file.file, tmp_file, UPLOAD_COPY_BUFFER_BYTES)
             tmp_path = tmp_file.name
 
-        # Parse CSV
-        parser = SurveyCSVParser(tmp_path)
-        points = parser.parse()
+        # Stream CSV in chunks - memory stays fixed regardless of file size.
+        # A previously parsed file is served from the on-disk cache instead.
+        parser = SurveyCSVParser(tmp_path, chunksize=settings.SURVEY_CSV_CHUNKSIZE, cache=survey_cache)
         stats = parser.get_statistics()
+        total_points = stats.get("total_points", 0)
+
+        # Return first 100 points
+        preview = parser.preview(100)
 
         response = {
             "filename": file.filename,
-            "total_points": len(points),
+            "total_points": total_points,
             "statistics": stats,
             "points_preview": [
                 {
-                    "name": p.point_name,
-                    "northing": p.northing,
-                    "easting": p.easting,
-                    "elevation": p.elevation,
-                    "code": p.point_code,
+                    "name": name,
+                    "northing": northing,
+                    "easting": easting,
+                    "elevation": elevation,
+                    "code": code,
                 }
-                for p in points[:100]  # Return first 100 points
+                for name, northing, easting, elevation, code in zip(
+                    preview["point_name"].tolist(),
+                    preview["northing"].tolist(),
+                    preview["easting"].tolist(),
+                    preview["elevation"].tolist(),
+                    preview["point_code"].astype(str).tolist(),
+                )
             ],
         }
 
@@ -257,7 +462,7 @@ async def parse_survey_csv(
         # Clean up temp file
         Path(tmp_path).unlink()
 
-        logger.info(f"Parsed survey CSV: {file.filename} ({len(points)} points)")
+        logger.info(f"Parsed survey CSV: {file.filename} ({total_points} points)")
 
         return response
 
@@ -266,6 +471,110 @@ async def parse_survey_csv(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/delineate-basins")
+def delineate_basins(
+    file: UploadFile = File(...),
+    pour_points_json: str = "",
+    cell_size_ft: Optional[float] = None,
+    snap_distance_ft: Optional[float] = None,
+    min_area_acres: float = 0.0,
+    project_id: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Delineate drainage basins from a topo survey CSV.
+
+    The survey is triangulated and rasterized, flow is routed over the
+    surface (depressions drain over their spill point) and each cell is
+    assigned to the outlet it drains to. The work is CPU-bound, so the
+    handler is synchronous and runs in the threadpool instead of on the
+    event loop.
+
+    **Upload:**
+    - file: Survey CSV (same format as /parse-survey-csv)
+    - pour_points_json: JSON object mapping area labels to [easting, northing]
+      outlets, e.g. {"DA1": [3041780.1, 620791.1]}; without it every outlet
+      on the survey edge becomes a basin
+    - cell_size_ft: DEM cell size (default: average survey point spacing)
+    - snap_distance_ft: How far an outlet may move onto the flow line (default: 2 cells)
+    - min_area_acres: Drop smaller basins
+    - project_id: Save basins as drainage areas of this project
+
+    **Returns:**
+    - Basin outlines (survey coordinates, for /calculate), outlets and areas
+    """
+    try:
+        import json
+        from geoalchemy2.shape import from_shape
+        from pyproj import Transformer
+
+        pour_points = json.loads(pour_points_json) if pour_points_json else {}
+        labels = list(pour_points)
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp_file:
+            shutil.copyfileobj(file.file, tmp_file, UPLOAD_COPY_BUFFER_BYTES)
+            tmp_path = tmp_file.name
+
+        try:
+            parser = SurveyCSVParser(tmp_path, chunksize=settings.SURVEY_CSV_CHUNKSIZE, cache=survey_cache)
+            surface = SurfaceModel.from_survey(parser.parse())
+        finally:
+            Path(tmp_path).unlink()
+
+        basins = surface.delineate_basins(
+            pour_points=[tuple(point) for point in pour_points.values()] or None,
+            cell_size=cell_size_ft,
+            snap_distance=snap_distance_ft,
+            min_area_acres=min_area_acres,
+        )
+
+        area_calc = AreaCalculator(precision=settings.AREA_CALCULATION_PRECISION)
+        results = []
+        for basin in basins:
+            label = labels[basin.label - 1] if labels else f"DA{basin.label}"
+            results.append({
+                "area_label": label,
+                **basin.to_dict(),
+                "area_result": area_calc.calculate_split_areas(basin.coordinates),
+            })
+
+        if project_id:
+            to_wgs84 = Transformer.from_crs(settings.SURVEY_CRS, "EPSG:4326", always_xy=True).transform
+            db.add_all([
+                DrainageArea(
+                    project_id=project_id,
+                    area_label=result["area_label"],
+                    total_area_sqft=result["area_result"]["total_area_sqft"],
+                    total_area_acres=result["area_result"]["total_area_acres"],
+                    pervious_area_sqft=result["area_result"]["pervious_area_sqft"],
+                    pervious_area_acres=result["area_result"]["pervious_area_acres"],
+                    geometry=from_shape(shapely_transform(to_wgs84, basin.polygon), srid=4326),
+                    centroid=from_shape(shapely_transform(to_wgs84, basin.polygon.centroid), srid=4326),
+                    notes=f"Delineated from {file.filename} (outlet {basin.outlet[0]:.1f}, {basin.outlet[1]:.1f})",
+                )
+                for basin, result in zip(basins, results)
+            ])
+            db.commit()
+
+        logger.info(f"Delineated {len(basins)} basins from {file.filename}")
+
+        return {
+            "filename": file.filename,
+            "total_basins": len(basins),
+            "basins": results,
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error delineating basins: {e}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/project/{project_id}/drainage-areas")
 async def get_project_drainage_areas(
     project_id: str,
@@ -308,15 +617,21 @@ async def get_project_drainage_areas(
 
 @router.post("/update-excel-toc")
 async def update_excel_toc(
-    template_file: UploadFile = File(...),
+    template_file: Optional[UploadFile] = File(None),
     drainage_areas_json: str = "",
+    write_only: bool = False,
+    named_values_json: str = "",
 ):
     """
     Update Excel TOC (Time of Concentration) workbook with drainage area data.
 
     **Upload:**
-    - template_file: Existing Excel workbook or use new blank workbook
+    - template_file: Existing Excel workbook (not needed with write_only)
     - drainage_areas_json: JSON string with drainage area data
+    - write_only: Stream a new workbook row by row instead of updating the template
+      (fast, low memory - use for large projects)
+    - named_values_json: JSON object mapping template named ranges to values;
+      when given, only those ranges are filled and the sheets are left as-is
 
     **Returns:**
     - Path to updated Excel file
@@ -326,25 +641,37 @@ async def update_excel_toc(
 
         # Parse drainage areas
         drainage_areas = json.loads(drainage_areas_json) if drainage_areas_json else []
+        named_values = json.loads(named_values_json) if named_values_json else None
 
-        # Save uploaded template
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_file:
-            content = await template_file.read()
-            tmp_file.write(content)
-            template_path = tmp_file.name
+        stem = Path(template_file.filename).stem if template_file else "workbook"
+        output_path = Path(settings.OUTPUT_DIR) / f"TOC_{stem}_updated.xlsx"
+        output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Update Excel
         updater = TOCExcelUpdater()
-        updater.load_template(template_path)
-        updater.update_drainage_area_data("Drainage Areas", drainage_areas)
 
-        # Save output
-        output_path = Path(settings.OUTPUT_DIR) / f"TOC_{Path(template_file.filename).stem}_updated.xlsx"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        updater.save(str(output_path))
-
-        # Clean up temp file
-        Path(template_path).unlink()
+        if write_only:
+            updater.export_streaming(str(output_path), drainage_areas=drainage_areas)
+        else:
+            if template_file is None:
+                raise ValueError("template_file is required unless write_only is set")
+
+            # Save uploaded template
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_file:
+                shutil.copyfileobj(template_file.file, tmp_file, UPLOAD_COPY_BUFFER_BYTES)
+                template_path = tmp_file.name
+
+            try:
+                # Update Excel
+                updater.load_template(template_path)
+                if named_values is not None:
+                    updater.fill_named_ranges(named_values)
+                else:
+                    updater.update_drainage_area_data("Drainage Areas", drainage_areas)
+
+                updater.save(str(output_path))
+            finally:
+                # Clean up temp file
+                Path(template_path).unlink(missing_ok=True)
 
         logger.info(f"Updated Excel TOC workbook: {output_path}")
 
@@ -357,3 +684,116 @@ async def update_excel_toc(
     except Exception as e:
         logger.error(f"Error updating Excel TOC: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/import-toc-workbooks")
+def import_toc_workbooks(
+    request: TOCImportRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Import drainage areas and Tc inputs from historical TOC workbooks.
+
+    Workbooks are opened read-only and parsed on the shared batch pool (the
+    handler runs in the threadpool, so the event loop is not blocked while
+    it waits). The directory and every matched workbook must resolve inside
+    settings.TOC_IMPORT_ROOT, and at most settings.TOC_IMPORT_MAX_FILES
+    workbooks are read.
+
+    With a project_id, every record with an area is saved as a DrainageArea
+    in a single transaction. A label and condition found in several
+    workbooks is saved once, from the first workbook by path. The import is
+    rejected if the project already has drainage areas with those labels.
+
+    **Returns:**
+    - Parsed records per workbook, with errors for workbooks that failed
+    """
+    try:
+        try:
+            imports = import_toc_directory(
+                request.directory,
+                pattern=request.pattern,
+                max_workers=settings.AREA_BATCH_MAX_WORKERS,
+                root=settings.TOC_IMPORT_ROOT,
+                max_files=settings.TOC_IMPORT_MAX_FILES,
+                executor=batch_pool,
+            )
+        except BrokenProcessPool:
+            # A worker died and the pool is unusable; replace it for later requests
+            shutdown_batch_pool()
+            start_batch_pool()
+            raise
+
+        saved = 0
+        duplicates = 0
+        if request.project_id:
+            # One drainage area per (label, condition) across all workbooks
+            records = {}
+            for workbook in imports:
+                for record in workbook.records:
+                    if record.total_area_acres is None:
+                        continue
+                    key = (record.area_label, record.condition)
+                    if key in records:
+                        duplicates += 1
+                        continue
+                    records[key] = (workbook, record)
+
+            labels = sorted({label for label, _ in records})
+            existing_labels = sorted(
+                label for (label,) in db.query(DrainageArea.area_label).filter(
+                    DrainageArea.project_id == request.project_id,
+                    DrainageArea.area_label.in_(labels),
+                ).distinct()
+            ) if labels else []
+            if existing_labels:
+                raise HTTPException(
+                    status_code=409,
+                    detail={
+                        "message": "Project already has drainage areas with these labels",
+                        "existing_labels": existing_labels,
+                    }
+                )
+
+            drainage_areas = [
+                DrainageArea(
+                    project_id=request.project_id,
+                    area_label=record.area_label,
+                    total_area_sqft=round_half_up(
+                        record.total_area_acres * AreaCalculator.SQFT_TO_ACRES,
+                        settings.AREA_CALCULATION_PRECISION,
+                    ),
+                    total_area_acres=record.total_area_acres,
+                    impervious_area_acres=record.impervious_area_acres,
+                    pervious_area_acres=record.pervious_area_acres,
+                    weighted_c_value=record.weighted_c_value,
+                    notes=(
+                        f"Imported from {Path(workbook.path).name} ({record.sheet_name}, row {record.row}"
+                        + (f", {record.condition} condition" if record.condition else "")
+                        + ")"
+                    ),
+                )
+                for workbook, record in records.values()
+            ]
+
+            db.add_all(drainage_areas)
+            db.commit()
+            saved = len(drainage_areas)
+
+        logger.info(f"Imported {len(imports)} TOC workbooks from {request.directory} ({saved} drainage areas saved)")
+
+        return {
+            "success": True,
+            "workbooks": len(imports),
+            "failed": sum(1 for workbook in imports if workbook.error),
+            "drainage_areas_saved": saved,
+            "duplicates_skipped": duplicates,
+            "imports": [workbook.to_dict() for workbook in imports],
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error importing TOC workbooks: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,29 +1,41 @@
 """
 Module C - DIA Report Generation API Endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, UploadFile, File
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 import logging
+import os
+import shutil
 import uuid
 
+import numpy as np
+
 from core import get_db, settings
 from models import Project, DrainageArea, Run, Result
 from services.module_c import (
     RationalMethodCalculator,
     TimeOfConcentration,
+    TcSegment,
     DIAReportGenerator,
     ExhibitGenerator,
 )
-from services.module_b import NOAAAtlas14Parser
+from services.module_a import SurveyCSVParser, SurfaceModel, TINCache
+from services.module_b import NOAAAtlas14Parser, idf_registry
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+tin_cache = TINCache(settings.SURFACE_CACHE_DIR, max_bytes=settings.SURFACE_CACHE_MAX_BYTES)
+
+DEFAULT_TC_MINUTES = 12.5
+
+UPLOAD_COPY_BUFFER_BYTES = 1024 * 1024
+
 
 # ============================================================================
 # Pydantic Models
@@ -48,6 +60,26 @@ class TcCalculationResponse(BaseModel):
     elevation_change_ft: float
 
 
+class TcSegmentInput(BaseModel):
+    """One TR-55 flow path segment"""
+    flow_type: str = Field(..., description="sheet, shallow or channel")
+    length_ft: float = Field(..., description="Segment length in feet")
+    slope: float = Field(..., description="Slope in ft/ft")
+    mannings_n: Optional[float] = Field(None, description="Manning's n (sheet and channel flow)")
+    paved: bool = Field(False, description="Paved surface (shallow concentrated flow)")
+    hydraulic_radius_ft: Optional[float] = Field(None, description="Hydraulic radius (channel flow)")
+    flow_area_sqft: Optional[float] = Field(None, description="Channel flow area, with wetted_perimeter_ft")
+    wetted_perimeter_ft: Optional[float] = Field(None, description="Channel wetted perimeter")
+
+
+class SegmentedTcRequest(BaseModel):
+    """Request for TR-55 segmented Tc over many flow paths"""
+    flow_paths: Dict[str, List[TcSegmentInput]] = Field(
+        ..., description="Flow path segments (upstream to downstream) keyed by area label"
+    )
+    p2_inches: float = Field(..., description="2-year, 24-hour rainfall depth in inches (NOAA Atlas 14)")
+
+
 class RationalMethodRequest(BaseModel):
     """Request for Rational Method calculation"""
     c_value: float = Field(..., description="Weighted runoff coefficient (0.0 to 1.0)")
@@ -78,6 +110,18 @@ class DIAReportRequest(BaseModel):
     include_exhibits: bool = Field(True, description="Generate exhibits (3A-3D)")
     include_noaa_appendix: bool = Field(True, description="Include NOAA Atlas 14 appendix")
     tc_method: str = Field("nrcs", description="Tc calculation method")
+    survey_file: Optional[str] = Field(
+        None,
+        description="Topo survey CSV used to trace flow paths for Tc - the filename "
+                    "returned by /project/{project_id}/survey-csv"
+    )
+    basin_boundaries: Optional[Dict[str, List[List[float]]]] = Field(
+        None, description="Basin boundary (easting, northing) coordinates keyed by area label"
+    )
+    cell_size_ft: Optional[float] = Field(
+        None, description="DEM cell size for flow tracing (default: average survey point spacing)"
+    )
+    curve_number: float = Field(70.0, description="Curve Number for NRCS Tc method")
 
 
 class DIAReportResponse(BaseModel):
@@ -155,6 +199,41 @@ async def calculate_time_of_concentration(request: TcCalculationRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/calculate-tc-segmented")
+async def calculate_segmented_tc(request: SegmentedTcRequest):
+    """
+    Calculate TR-55 Tc from sheet, shallow concentrated and channel segments.
+
+    Each flow path's Tc is the sum of its segment travel times:
+    - **sheet**: Manning's kinematic solution (300 ft maximum)
+    - **shallow**: TR-55 Figure 3-1 velocity (paved / unpaved)
+    - **channel**: Manning's equation velocity
+
+    All flow paths are computed in one batch.
+
+    **Returns:**
+    - Per-area lengths and tc_sheet / tc_shallow / tc_channel / tc_total,
+      in the format the TOC workbook export takes
+    """
+    results = TimeOfConcentration.tr55_segmented_batch(
+        {
+            label: [TcSegment(**segment.model_dump()) for segment in segments]
+            for label, segments in request.flow_paths.items()
+        },
+        request.p2_inches,
+    )
+
+    failures = {label: result["error"] for label, result in results.items() if "error" in result}
+    if failures:
+        raise HTTPException(status_code=400, detail={"failures": failures})
+
+    return {
+        "method": "TR-55",
+        "p2_inches": request.p2_inches,
+        "results": results,
+    }
+
+
 @router.post("/calculate-flow", response_model=RationalMethodResponse)
 async def calculate_peak_flow(request: RationalMethodRequest):
     """
@@ -210,6 +289,52 @@ async def calculate_peak_flow(request: RationalMethodRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/project/{project_id}/survey-csv")
+async def upload_project_survey(
+    project_id: str,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Store a topo survey CSV with a project for flow path Tc.
+
+    Pass the returned survey_file to /generate-report along with
+    basin_boundaries. Uploading a file with the same name replaces it.
+
+    **Returns:**
+    - survey_file: Name to reference the survey by
+    """
+    try:
+        survey_file = Path(file.filename or "").name
+        if not survey_file.lower().endswith(".csv"):
+            raise HTTPException(status_code=400, detail="Survey must be a .csv file")
+
+        survey_dir = _project_survey_dir(project_id)
+        if not db.query(Project).filter(Project.id == project_id).first():
+            raise HTTPException(status_code=404, detail=f"Project not found: {project_id}")
+
+        survey_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = survey_dir / f".{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(file.file, f, UPLOAD_COPY_BUFFER_BYTES)
+            os.replace(tmp_path, survey_dir / survey_file)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        logger.info(f"Stored survey {survey_file} for project {project_id}")
+
+        return {"project_id": project_id, "survey_file": survey_file}
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error storing survey CSV: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/generate-report", response_model=DIAReportResponse)
 async def generate_dia_report(
     request: DIAReportRequest,
@@ -265,6 +390,24 @@ async def generate_dia_report(
             f"{len(request.storm_events)} storm events"
         )
 
+        # Trace flow paths for Tc before starting the run, so bad survey input fails fast
+        if request.basin_boundaries:
+            known_labels = {da.area_label for da in drainage_areas}
+            unknown_labels = sorted(set(request.basin_boundaries) - known_labels)
+            if unknown_labels:
+                raise HTTPException(
+                    status_code=422,
+                    detail={
+                        "message": "basin_boundaries labels match no drainage area of the project",
+                        "unknown_labels": unknown_labels,
+                    }
+                )
+
+        try:
+            tc_by_area = _flow_path_tc(request, drainage_areas)
+        except (ValueError, FileNotFoundError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
         # Create run record
         run = Run(
             project_id=request.project_id,
@@ -273,6 +416,7 @@ async def generate_dia_report(
             status="running",
             parameters={
                 "tc_method": request.tc_method,
+                "tc_from_flow_paths": sorted(tc_by_area),
                 "include_exhibits": request.include_exhibits,
                 "include_noaa_appendix": request.include_noaa_appendix
             }
@@ -284,59 +428,47 @@ async def generate_dia_report(
         # Initialize calculators
         tc_calc = TimeOfConcentration()
         rational_calc = RationalMethodCalculator()
-        noaa_parser = NOAAAtlas14Parser()
-        noaa_parser.load_standard_lafayette_data()
-
-        # Calculate results for all storm events
-        all_results = {}
+        noaa_parser = idf_registry.parser()
 
-        for storm_event in request.storm_events:
+        # Calculate results for all storm events: one intensity per unique
+        # (Tc, storm), then every peak flow in a single grid
+        return_periods = [
             # Extract return period (e.g., "10-year" -> 10)
-            return_period = int(storm_event.split('-')[0])
+            int(storm_event.split('-')[0])
+            for storm_event in request.storm_events
+        ]
+        tc_values = [
+            # Tc from the traced flow path, or the default when there's no survey
+            tc_by_area.get(da.area_label, DEFAULT_TC_MINUTES)
+            for da in drainage_areas
+        ]
+        c_values = [float(da.weighted_c_value or 0.5) for da in drainage_areas]
+        areas = [float(da.total_area_acres or 0) for da in drainage_areas]
+        intensities, intensity_stats = _intensity_matrix(noaa_parser, tc_values, return_periods)
 
-            storm_results = []
+        flow_grid = rational_calc.calculate_peak_flow_grid(c_values, intensities, areas)
+        error = flow_grid.first_error()
+        if error:
+            raise ValueError(f"Peak flow calculation failed: {error}")
 
-            for da in drainage_areas:
-                # Calculate Tc (use stored value or default)
-                tc_minutes = 12.5  # Default, should be calculated from actual flow paths
+        all_results = {}
 
-                # Get rainfall intensity from NOAA
-                intensity = noaa_parser.get_intensity(
-                    duration_minutes=tc_minutes,
-                    return_period_years=return_period
-                )
+        for s, storm_event in enumerate(request.storm_events):
+            storm_results = []
 
-                if intensity is None:
-                    # Try interpolation
-                    intensity = noaa_parser.interpolate_intensity(
-                        duration_minutes=tc_minutes,
-                        return_period_years=return_period
-                    )
-
-                if intensity is None:
-                    logger.warning(
-                        f"Could not find intensity for Tc={tc_minutes} min, "
-                        f"return period={return_period} years. Using default."
-                    )
-                    intensity = 7.0  # Fallback
-
-                # Calculate peak flow using Rational Method
-                flow_result = rational_calc.calculate_peak_flow(
-                    c_value=float(da.weighted_c_value or 0.5),
-                    intensity_in_per_hr=intensity,
-                    area_acres=float(da.total_area_acres or 0)
-                )
+            for b, da in enumerate(drainage_areas):
+                peak_flow_cfs = float(flow_grid.peak_flow_cfs[b, s])
 
                 # Save result to database
                 result = Result(
                     run_id=run.id,
                     drainage_area_id=da.id,
                     storm_event=storm_event,
-                    c_value=flow_result["c_value"],
-                    i_value=flow_result["intensity_in_per_hr"],
-                    area_acres=flow_result["area_acres"],
-                    peak_flow_cfs=flow_result["peak_flow_cfs"],
-                    tc_minutes=tc_minutes,
+                    c_value=c_values[b],
+                    i_value=float(intensities[b, s]),
+                    area_acres=areas[b],
+                    peak_flow_cfs=peak_flow_cfs,
+                    tc_minutes=tc_values[b],
                     tc_method=request.tc_method,
                     development_condition="post"
                 )
@@ -344,11 +476,11 @@ async def generate_dia_report(
 
                 storm_results.append({
                     "area_label": da.area_label,
-                    "c_value": float(da.weighted_c_value or 0.5),
-                    "i_value": intensity,
-                    "area_acres": float(da.total_area_acres or 0),
-                    "peak_flow_cfs": flow_result["peak_flow_cfs"],
-                    "tc_minutes": tc_minutes,
+                    "c_value": c_values[b],
+                    "i_value": float(intensities[b, s]),
+                    "area_acres": areas[b],
+                    "peak_flow_cfs": peak_flow_cfs,
+                    "tc_minutes": tc_values[b],
                     "tc_method": request.tc_method,
                     "development_condition": "post"
                 })
@@ -409,7 +541,8 @@ async def generate_dia_report(
             "total_drainage_areas": len(drainage_areas),
             "storm_events": request.storm_events,
             "report_path": report_path,
-            "exhibit_paths": exhibit_paths
+            "exhibit_paths": exhibit_paths,
+            "intensity_lookup": intensity_stats,
         }
         db.commit()
 
@@ -440,6 +573,128 @@ async def generate_dia_report(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _flow_path_tc(request: DIAReportRequest, drainage_areas: List[DrainageArea]) -> Dict[str, float]:
+    """
+    Tc per area label from flow paths traced over the survey surface.
+
+    The survey is triangulated once (cached by point coordinates) and each
+    basin boundary's longest steepest-descent path supplies the flow length
+    and elevation drop for the requested Tc method.
+
+    Returns:
+        Tc minutes keyed by area label; empty when no survey/boundaries were given
+    """
+    if not request.survey_file or not request.basin_boundaries:
+        return {}
+
+    points = SurveyCSVParser(str(_project_survey_path(request.project_id, request.survey_file))).parse()
+    surface = SurfaceModel.from_survey(points, cache=tin_cache)
+    c_values = {da.area_label: float(da.weighted_c_value or 0.5) for da in drainage_areas}
+
+    method = request.tc_method.lower()
+    tc_by_area = {}
+
+    for label, boundary in request.basin_boundaries.items():
+        path = surface.flow_path(boundary, cell_size=request.cell_size_ft)
+
+        if method == "nrcs":
+            tc_minutes = TimeOfConcentration.nrcs_method(
+                path.length_ft, path.elevation_change_ft, request.curve_number
+            )
+        elif method == "kirpich":
+            tc_minutes = TimeOfConcentration.kirpich_method(path.length_ft, path.elevation_change_ft)
+        elif method == "faa":
+            tc_minutes = TimeOfConcentration.faa_method(
+                path.length_ft, c_values.get(label, 0.5), path.slope * 100
+            )
+        else:
+            raise ValueError(f"Unsupported Tc method for flow path tracing: {request.tc_method}")
+
+        tc_by_area[label] = tc_minutes
+        logger.info(
+            f"{label}: flow path {path.length_ft:.0f} ft, drop {path.elevation_change_ft:.2f} ft, "
+            f"Tc {tc_minutes:.2f} min ({method})"
+        )
+
+    return tc_by_area
+
+
+def _project_survey_dir(project_id: str) -> Path:
+    """Directory holding a project's uploaded survey CSVs"""
+    try:
+        project_uuid = uuid.UUID(str(project_id))
+    except ValueError:
+        raise ValueError(f"Invalid project id: {project_id}")
+    return Path(settings.UPLOAD_DIR) / "projects" / str(project_uuid) / "surveys"
+
+
+def _project_survey_path(project_id: str, filename: str) -> Path:
+    """
+    Path of an uploaded survey CSV of a project.
+
+    Raises:
+        ValueError: If the name is not a plain .csv filename
+        FileNotFoundError: If no such survey was uploaded to the project
+    """
+    if not filename or Path(filename).name != filename or not filename.lower().endswith(".csv"):
+        raise ValueError(f"Invalid survey file name: {filename}")
+
+    path = _project_survey_dir(project_id) / filename
+    if not path.is_file():
+        raise FileNotFoundError(f"Survey file not found for project {project_id}: {filename}")
+    return path
+
+
+def _intensity_matrix(
+    noaa_parser: NOAAAtlas14Parser,
+    tc_values: List[float],
+    return_periods: List[int]
+) -> Tuple[np.ndarray, Dict]:
+    """
+    Rainfall intensities (in/hr) for every drainage area x storm.
+
+    The (Tc, return period) pairs are deduplicated - areas sharing a Tc
+    (e.g. the default) resolve once - and the unique pairs are interpolated
+    in one batch against the compiled IDF table. Pairs outside the table
+    fall back to 7.0 in/hr.
+
+    Returns:
+        (intensity matrix [areas, storms], lookup stats for results_summary)
+    """
+    tc_grid, period_grid = np.meshgrid(
+        np.asarray(tc_values, dtype=np.float64),
+        np.asarray(return_periods, dtype=np.float64),
+        indexing="ij",
+    )
+    pairs = np.column_stack([tc_grid.ravel(), period_grid.ravel()])
+    unique_pairs, inverse = np.unique(pairs, axis=0, return_inverse=True)
+
+    unique_intensities = noaa_parser.intensities(unique_pairs[:, 0], unique_pairs[:, 1])
+
+    missing = np.isnan(unique_intensities)
+    for tc_minutes, return_period in unique_pairs[missing]:
+        logger.warning(
+            f"Could not find intensity for Tc={tc_minutes} min, "
+            f"return period={return_period:.0f} years. Using default."
+        )
+    unique_intensities[missing] = 7.0  # Fallback
+
+    total = len(pairs)
+    stats = {
+        "pairs": total,
+        "unique_pairs": len(unique_pairs),
+        "cache_hits": total - len(unique_pairs),
+        "cache_hit_rate": round((total - len(unique_pairs)) / total, 4) if total else 0.0,
+        "fallback_pairs": int(missing.sum()),
+    }
+    logger.info(
+        f"IDF stage: {stats['unique_pairs']} unique of {total} (Tc, storm) pairs "
+        f"({stats['cache_hit_rate']:.0%} hits)"
+    )
+
+    return unique_intensities[inverse.reshape(-1)].reshape(tc_grid.shape), stats
+
+
 @router.get("/download/{filename}")
 async def download_report_file(filename: str):
     """
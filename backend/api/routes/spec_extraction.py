@@ -13,14 +13,17 @@ from core import get_db, settings
 from models import Spec
 from services.module_b import (
     PDFParser,
+    PDFExtractionCache,
     SpecificationExtractor,
-    NOAAAtlas14Parser,
     SpecificationWebScraper,
+    idf_registry,
 )
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+pdf_cache = PDFExtractionCache(settings.PDF_CACHE_DIR, max_bytes=settings.PDF_CACHE_MAX_BYTES)
+
 
 # ============================================================================
 # Pydantic Models
@@ -110,8 +113,18 @@ async def extract_specifications_from_pdf(
 
         # Parse PDF
         openai_key = settings.OPENAI_API_KEY if use_langchain else None
-        parser = PDFParser(tmp_path, use_langchain=use_langchain, openai_api_key=openai_key)
-        parser.extract_text()
+        parser = PDFParser(
+            tmp_path,
+            use_langchain=use_langchain,
+            openai_api_key=openai_key,
+            table_keywords=SpecificationExtractor.TABLE_KEYWORDS,
+            cache=pdf_cache,
+        )
+        parser.extract_text(
+            parallel=True,
+            max_workers=settings.PDF_EXTRACT_MAX_WORKERS,
+            progress_callback=lambda done, total: logger.debug(f"{doc_name}: extracted {done}/{total} pages"),
+        )
 
         metadata = parser.get_metadata()
         total_pages = metadata.get("total_pages", len(parser.pages))
@@ -134,6 +147,7 @@ async def extract_specifications_from_pdf(
             saved_count += 1
 
         db.commit()
+        idf_registry.sync(db)
 
         # Clean up temp file
         Path(tmp_path).unlink()
@@ -272,9 +286,8 @@ async def get_rainfall_intensity(
                 interpolated=False,
             )
 
-        # If not found, try interpolation using NOAA parser
-        noaa = NOAAAtlas14Parser()
-        noaa.load_standard_lafayette_data()
+        # If not found, try interpolation using the shared NOAA data
+        noaa = idf_registry.parser()
 
         interpolated_intensity = noaa.interpolate_intensity(
             query.duration_minutes,
@@ -325,10 +338,7 @@ async def load_noaa_atlas_data(db: Session = Depends(get_db)):
     - Number of records loaded
     """
     try:
-        noaa = NOAAAtlas14Parser()
-        noaa.load_standard_lafayette_data()
-
-        specs = noaa.export_to_database_format()
+        specs = idf_registry.parser().export_to_database_format()
 
         # Check if data already exists
         existing = db.query(Spec).filter(
@@ -350,6 +360,7 @@ async def load_noaa_atlas_data(db: Session = Depends(get_db)):
             db.add(spec)
 
         db.commit()
+        idf_registry.sync(db)
 
         logger.info(f"Loaded {len(specs)} NOAA Atlas 14 records")
 
@@ -479,6 +490,7 @@ async def scrape_web_specifications(
                         saved_count += 1
 
             db.commit()
+            idf_registry.sync(db)
             logger.info(f"Saved {saved_count} new specifications to database")
 
         return {
@@ -36,6 +36,20 @@ class Settings(BaseSettings):
     # Module A - Area Calculation
     AREA_CALCULATION_PRECISION: int = 2  # Decimal places
     C_VALUE_PRECISION: int = 3  # Decimal places for runoff coefficients
+    SURVEY_CSV_CHUNKSIZE: int = 100000  # Rows per chunk when streaming survey CSVs
+    SURVEY_CACHE_DIR: str = "/app/cache/surveys"
+    SURVEY_CACHE_MAX_BYTES: int = 2 * 1024 ** 3  # LRU eviction above 2 GB
+    AREA_BATCH_MAX_WORKERS: Optional[int] = None  # Shared process pool size for /calculate-batch and /import-toc-workbooks (default: CPU count)
+    SURFACE_CACHE_DIR: str = "/app/cache/surfaces"  # Persisted survey triangulations
+    SURFACE_CACHE_MAX_BYTES: int = 1024 ** 3  # LRU eviction above 1 GB
+    SURVEY_CRS: str = "EPSG:3452"  # Survey coordinates: NAD83 Louisiana South (ftUS)
+    TOC_IMPORT_ROOT: str = "/app/projects"  # /import-toc-workbooks only reads workbooks below this directory
+    TOC_IMPORT_MAX_FILES: int = 500  # Workbooks per import request
+
+    # Module B - Specification Extraction
+    PDF_EXTRACT_MAX_WORKERS: Optional[int] = None  # Process pool size for PDF page extraction (default: CPU count)
+    PDF_CACHE_DIR: str = "/app/cache/pdfs"  # Extracted pages of uploaded regulatory PDFs
+    PDF_CACHE_MAX_BYTES: int = 1024 ** 3  # LRU eviction above 1 GB
 
     # Module C - DIA Report
     RATIONAL_METHOD_ACCURACY: float = 0.02  # ±2% for Q=CiA
@@ -10,7 +10,7 @@ from decimal import Decimal
 import logging
 from models.base import Project, DrainageArea, Run, Result
 from services.module_c.rational_method import RationalMethodCalculator, TimeOfConcentration
-from services.module_b.noaa_parser import NOAAAtlas14Parser
+from services.module_b.idf_registry import idf_registry
 from services.module_c.report_generator import DIAReportGenerator
 from services.module_c.exhibit_generator import ExhibitGenerator
 from core import settings
@@ -31,7 +31,7 @@ class DemoService:
     def __init__(self, db: Session):
         self.db = db
         self.rational_calc = RationalMethodCalculator()
-        self.noaa_parser = NOAAAtlas14Parser()
+        self.noaa_parser = idf_registry.parser()
 
     def create_demo_project(self) -> Dict[str, Any]:
         """
@@ -200,7 +200,12 @@ class DemoService:
 
                 for drainage_area in drainage_areas:
                     # Calculate Time of Concentration
-                    # For demo, use realistic flow length and elevation change
+                    # For demo, use realistic flow length and elevation change.
+                    # The demo areas have no boundary geometry and the sample
+                    # survey (demo_data/test_survey.csv, ~60 ft across) does not
+                    # cover them, so there is no basin to trace with
+                    # SurfaceModel.flow_path; /generate-report traces real paths
+                    # from an uploaded survey_file and basin_boundaries.
                     flow_length_ft = 850.0  # feet
                     elevation_change_ft = 8.5  # feet
 
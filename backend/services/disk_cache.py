@@ -0,0 +1,111 @@
+"""
+Shared on-disk cache directory with LRU eviction.
+
+Entries are one or more files named {key}{suffix}. DiskCache owns the
+directory bookkeeping (content hashing, size accounting, least recently used
+eviction by mtime); subclasses define the entry suffixes and read/write
+their own serialization format.
+"""
+from pathlib import Path
+from typing import List, Optional, Tuple
+import hashlib
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Content-addressed cache directory bounded by total size.
+
+    Subclasses set ENTRY_SUFFIXES and implement get/put. An entry counts
+    only when all its files exist; files whose key contains a "." (part and
+    temporary files) are never treated as entries.
+    """
+
+    # Bump in a subclass when its entry layout changes so old entries are ignored
+    FORMAT_VERSION = 1
+
+    DEFAULT_MAX_BYTES = 1024 ** 3  # 1 GB
+
+    HASH_BLOCK_BYTES = 1024 * 1024
+
+    # Files making up one entry; the first marks the entry in the directory
+    ENTRY_SUFFIXES: Tuple[str, ...] = ()
+
+    # Name used in log messages
+    LABEL = "cache"
+
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory for cache entries (created on first write)
+            max_bytes: Total size limit before LRU eviction (default: DEFAULT_MAX_BYTES)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = self.DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+
+    @classmethod
+    def file_digest(cls, file_path: str) -> str:
+        """SHA-256 hex digest of a file's bytes, read in blocks"""
+        digest = hashlib.sha256()
+
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(cls.HASH_BLOCK_BYTES), b""):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    def entry_files(self, key: str) -> List[Path]:
+        """Every file of an entry"""
+        return [self.cache_dir / f"{key}{suffix}" for suffix in self.ENTRY_SUFFIXES]
+
+    def touch(self, key: str):
+        """Mark an entry as used for LRU ordering"""
+        for path in self.entry_files(key):
+            os.utime(path)
+
+    def remove(self, key: str):
+        """Delete a cache entry"""
+        for path in self.entry_files(key):
+            path.unlink(missing_ok=True)
+
+    def total_bytes(self) -> int:
+        """Total size of all cache entries"""
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+
+        for key, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(key)
+            total -= size
+            logger.info(f"Evicted {self.LABEL} entry {key[:12]} ({size} bytes)")
+
+    def _entries(self) -> List:
+        """(key, last_used, size_bytes) for every complete entry"""
+        if not self.cache_dir.exists():
+            return []
+
+        marker = self.ENTRY_SUFFIXES[0]
+        entries = []
+        for marker_path in self.cache_dir.glob(f"*{marker}"):
+            key = marker_path.name[:-len(marker)]
+            if "." in key:
+                continue  # temporary or part file
+
+            try:
+                stats = [path.stat() for path in self.entry_files(key)]
+            except FileNotFoundError:
+                continue  # incomplete entry
+
+            entries.append((key, stats[0].st_mtime, sum(stat.st_size for stat in stats)))
+
+        return entries
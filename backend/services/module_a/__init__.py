@@ -1,11 +1,28 @@
 """Module A - Automated Area Calculation Engine"""
 from .csv_parser import SurveyCSVParser
 from .area_calculator import AreaCalculator, WeightedCValueCalculator
+from .c_value_resolver import CValueResolver
 from .excel_updater import TOCExcelUpdater
+from .survey_cache import SurveyCache
+from .batch_calculator import BatchAreaCalculator
+from .toc_importer import TOCWorkbookReader, TOCRecord, import_toc_directory
+from .surface_model import SurfaceModel, TINCache, FlowPath
+from .watershed import FlowRouter, Basin
 
 __all__ = [
     "SurveyCSVParser",
     "AreaCalculator",
     "WeightedCValueCalculator",
+    "CValueResolver",
     "TOCExcelUpdater",
+    "SurveyCache",
+    "BatchAreaCalculator",
+    "TOCWorkbookReader",
+    "TOCRecord",
+    "import_toc_directory",
+    "SurfaceModel",
+    "TINCache",
+    "FlowPath",
+    "FlowRouter",
+    "Basin",
 ]
@@ -5,8 +5,12 @@ Calculate drainage areas, impervious/pervious split, and weighted runoff coeffic
 from typing import Dict, List, Tuple, Optional
 from shapely.geometry import Polygon, Point
 from shapely import wkt
+import numpy as np
+import shapely
 import logging
-from decimal import Decimal, ROUND_HALF_UP
+
+from .c_value_resolver import CValueResolver
+from ..rounding import round_half_up, round_half_up_array, round_builtin_array
 
 logger = logging.getLogger(__name__)
 
@@ -72,15 +76,15 @@ class AreaCalculator:
             area_acres = area_sqft / self.SQFT_TO_ACRES
 
             # Round to specified precision
-            area_sqft = self._round_decimal(area_sqft, self.precision)
-            area_acres = self._round_decimal(area_acres, 4)  # Always 4 decimal places for acres
+            area_sqft = round_half_up(area_sqft, self.precision)
+            area_acres = round_half_up(area_acres, 4)  # Always 4 decimal places for acres
 
             logger.debug(f"Calculated area: {area_acres} acres ({area_sqft} sqft)")
 
             return {
                 "area_sqft": area_sqft,
                 "area_acres": area_acres,
-                "perimeter_ft": self._round_decimal(polygon.length, self.precision),
+                "perimeter_ft": round_half_up(polygon.length, self.precision),
                 "centroid_x": polygon.centroid.x,
                 "centroid_y": polygon.centroid.y,
             }
@@ -89,17 +93,201 @@ class AreaCalculator:
             logger.error(f"Error calculating polygon area: {e}")
             raise ValueError(f"Invalid polygon geometry: {e}")
 
+    def calculate_polygon_areas(
+        self,
+        polygons: List[List[Tuple[float, float]]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate areas of many polygons at once.
+
+        Vectorized equivalent of calculate_polygon_area: builds one Shapely
+        geometry array and measures it with shapely.area / length / centroid,
+        with rounding applied to whole arrays. Results match the per-polygon
+        method element for element.
+
+        Args:
+            polygons: List of polygons, each a list of (x, y) vertices
+
+        Returns:
+            Dictionary of arrays (one element per polygon): area_sqft,
+            area_acres, perimeter_ft, centroid_x, centroid_y
+
+        Raises:
+            ValueError: If any polygon has fewer than 3 vertices
+        """
+        if not polygons:
+            empty = np.empty(0, dtype=np.float64)
+            return {key: empty.copy() for key in
+                    ("area_sqft", "area_acres", "perimeter_ft", "centroid_x", "centroid_y")}
+
+        try:
+            geometries = self._build_polygons(polygons)
+
+            area_sqft = np.abs(shapely.area(geometries))
+            area_acres = area_sqft / self.SQFT_TO_ACRES
+            centroids = shapely.centroid(geometries)
+
+            return {
+                "area_sqft": round_half_up_array(area_sqft, self.precision),
+                "area_acres": round_half_up_array(area_acres, 4),  # Always 4 decimal places for acres
+                "perimeter_ft": round_half_up_array(shapely.length(geometries), self.precision),
+                "centroid_x": shapely.get_x(centroids),
+                "centroid_y": shapely.get_y(centroids),
+            }
+
+        except Exception as e:
+            logger.error(f"Error calculating polygon areas: {e}")
+            raise ValueError(f"Invalid polygon geometry: {e}")
+
+    def _build_polygons(self, polygons: List[List[Tuple[float, float]]]) -> np.ndarray:
+        """
+        Build a Shapely geometry array from vertex lists, repairing invalid polygons.
+
+        Raises:
+            ValueError: If any polygon has fewer than 3 vertices
+        """
+        vertex_counts = np.array([len(coords) for coords in polygons])
+        too_small = np.flatnonzero(vertex_counts < 3)
+        if len(too_small):
+            raise ValueError(f"Polygon must have at least 3 vertices (polygon index {too_small[0]})")
+
+        coords = np.concatenate([np.asarray(c, dtype=np.float64).reshape(-1, 2) for c in polygons])
+        ring_index = np.repeat(np.arange(len(polygons)), vertex_counts)
+
+        geometries = shapely.polygons(shapely.linearrings(coords, indices=ring_index))
+
+        # Try to fix invalid polygons
+        invalid = ~shapely.is_valid(geometries)
+        if invalid.any():
+            geometries[invalid] = shapely.buffer(geometries[invalid], 0)
+
+        return geometries
+
+    def calculate_overlay_impervious_area(
+        self,
+        total_polygon: List[Tuple[float, float]],
+        impervious_polygons: List[List[Tuple[float, float]]]
+    ) -> float:
+        """
+        Measure the impervious area inside a basin by geometric overlay.
+
+        Impervious features are indexed in an STRtree, clipped to the basin
+        and unioned, so overlapping features and features extending past the
+        basin boundary are counted once and only inside the basin.
+
+        Args:
+            total_polygon: Coordinates of total drainage area
+            impervious_polygons: List of impervious area polygons
+
+        Returns:
+            Unrounded impervious area (sqft) within the basin
+
+        Raises:
+            ValueError: If any polygon is degenerate or invalid
+        """
+        if not impervious_polygons:
+            return 0.0
+
+        try:
+            basin = self._build_polygons([total_polygon])[0]
+            features = self._build_polygons(impervious_polygons)
+
+            tree = shapely.STRtree(features)
+            candidates = features[tree.query(basin, predicate="intersects")]
+
+            if len(candidates) == 0:
+                return 0.0
+
+            # Only features crossing the basin boundary need clipping
+            shapely.prepare(basin)
+            inside = shapely.contains_properly(basin, candidates)
+            candidates[~inside] = shapely.intersection(candidates[~inside], basin)
+
+            return self._union_area(candidates)
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error calculating impervious overlay: {e}")
+            raise ValueError(f"Invalid polygon geometry: {e}")
+
+    def _union_area(self, geometries: np.ndarray) -> float:
+        """
+        Area of the union of a geometry array.
+
+        Features are grouped into connected components of overlapping
+        features; isolated features contribute their own area and only
+        overlapping groups go through shapely.union_all. Typical site data
+        (mostly disjoint roofs, stalls, walks) therefore skips most of the
+        expensive union work.
+        """
+        tree = shapely.STRtree(geometries)
+        left, right = tree.query(geometries, predicate="intersects")
+
+        # Keep each pair once, and ignore features that only share an edge
+        pairs = left < right
+        left, right = left[pairs], right[pairs]
+        overlapping = ~shapely.touches(geometries[left], geometries[right])
+        left, right = left[overlapping], right[overlapping]
+
+        labels = self._component_labels(len(geometries), left, right)
+        sizes = np.bincount(labels, minlength=len(geometries))[labels]
+
+        total = float(shapely.area(geometries[sizes == 1]).sum())
+
+        # Pairs: one vectorized union for all of them
+        pair_members = np.flatnonzero(sizes == 2)
+        if len(pair_members):
+            pair_members = pair_members[np.argsort(labels[pair_members], kind="stable")]
+            total += float(shapely.area(
+                shapely.union(geometries[pair_members[0::2]], geometries[pair_members[1::2]])
+            ).sum())
+
+        # Larger groups: cascaded union per group
+        group_members = np.flatnonzero(sizes > 2)
+        if len(group_members):
+            group_members = group_members[np.argsort(labels[group_members], kind="stable")]
+            boundaries = np.flatnonzero(np.diff(labels[group_members])) + 1
+            for members in np.split(group_members, boundaries):
+                total += float(shapely.union_all(geometries[members]).area)
+
+        return total
+
+    @staticmethod
+    def _component_labels(count: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Connected-component label (smallest member index) for each node of an edge list"""
+        labels = np.arange(count)
+
+        while True:
+            updated = labels.copy()
+            np.minimum.at(updated, left, labels[right])
+            np.minimum.at(updated, right, labels[left])
+            # Pointer jumping - collapses long chains in a few iterations
+            updated = updated[updated]
+            updated = updated[updated]
+
+            if np.array_equal(updated, labels):
+                return labels
+            labels = updated
+
     def calculate_split_areas(
         self,
         total_polygon: List[Tuple[float, float]],
-        impervious_polygons: List[List[Tuple[float, float]]] = None
+        impervious_polygons: List[List[Tuple[float, float]]] = None,
+        overlay: bool = False
     ) -> Dict[str, float]:
         """
         Calculate impervious vs. pervious areas within a drainage basin.
 
+        By default the impervious area is the sum of the individual polygon
+        areas. With overlay=True it is measured geometrically (clipped to the
+        basin and unioned), which is correct when features overlap each other
+        or extend past the basin.
+
         Args:
             total_polygon: Coordinates of total drainage area
             impervious_polygons: List of impervious area polygons (pavement, roofs, etc.)
+            overlay: Use spatial overlay instead of summing polygon areas
 
         Returns:
             Dictionary with total, impervious, and pervious areas
@@ -118,11 +306,16 @@ class AreaCalculator:
                 "impervious_percentage": 0.0,
             }
 
-        # Calculate total impervious area
-        impervious_sqft = 0.0
-        for imp_coords in impervious_polygons:
-            imp_area = self.calculate_polygon_area(imp_coords)
-            impervious_sqft += imp_area["area_sqft"]
+        if overlay:
+            impervious_sqft = round_half_up(
+                self.calculate_overlay_impervious_area(total_polygon, impervious_polygons),
+                self.precision
+            )
+        else:
+            # Calculate total impervious area (one vectorized pass over all polygons;
+            # summed in order so the total matches per-polygon accumulation)
+            impervious_areas = self.calculate_polygon_areas(impervious_polygons)
+            impervious_sqft = sum(impervious_areas["area_sqft"].tolist(), 0.0)
 
         # Calculate pervious area (total - impervious)
         pervious_sqft = max(0, total_area["area_sqft"] - impervious_sqft)
@@ -134,21 +327,13 @@ class AreaCalculator:
         return {
             "total_area_sqft": total_area["area_sqft"],
             "total_area_acres": total_area["area_acres"],
-            "impervious_area_sqft": self._round_decimal(impervious_sqft, self.precision),
-            "impervious_area_acres": self._round_decimal(impervious_acres, 4),
-            "pervious_area_sqft": self._round_decimal(pervious_sqft, self.precision),
-            "pervious_area_acres": self._round_decimal(pervious_acres, 4),
-            "impervious_percentage": self._round_decimal(impervious_pct, 1),
+            "impervious_area_sqft": round_half_up(impervious_sqft, self.precision),
+            "impervious_area_acres": round_half_up(impervious_acres, 4),
+            "pervious_area_sqft": round_half_up(pervious_sqft, self.precision),
+            "pervious_area_acres": round_half_up(pervious_acres, 4),
+            "impervious_percentage": round_half_up(impervious_pct, 1),
         }
 
-    def _round_decimal(self, value: float, decimal_places: int) -> float:
-        """Round to specified decimal places using ROUND_HALF_UP"""
-        if value is None:
-            return 0.0
-        d = Decimal(str(value))
-        rounded = d.quantize(Decimal(10) ** -decimal_places, rounding=ROUND_HALF_UP)
-        return float(rounded)
-
 
 class WeightedCValueCalculator:
     """
@@ -194,25 +379,19 @@ class WeightedCValueCalculator:
         # Calculate weighted sum: Σ(Ci * Ai)
         weighted_sum = 0.0
         breakdown = {}
+        resolver = CValueResolver.for_lookup(self.c_value_lookup)
 
         for land_use, area in land_use_areas.items():
-            # Get C-value from lookup table
-            c_value = self.c_value_lookup.get(land_use.lower())
+            # Get C-value from lookup table (exact, then fuzzy match)
+            key = resolver.resolve(land_use)
 
-            if c_value is None:
-                # Try to find partial match
-                matched = False
-                for key, val in self.c_value_lookup.items():
-                    if key in land_use.lower() or land_use.lower() in key:
-                        c_value = val
-                        matched = True
-                        break
-
-                if not matched:
-                    raise ValueError(
-                        f"Land use type '{land_use}' not found in C-value lookup table. "
-                        f"Available types: {list(self.c_value_lookup.keys())}"
-                    )
+            if key is None:
+                raise ValueError(
+                    f"Land use type '{land_use}' not found in C-value lookup table. "
+                    f"Available types: {list(self.c_value_lookup.keys())}"
+                )
+
+            c_value = self.c_value_lookup[key]
 
             weighted_sum += c_value * area
             percentage = (area / total_area) * 100
@@ -238,6 +417,94 @@ class WeightedCValueCalculator:
             "breakdown": breakdown,
         }
 
+    def calculate_matrix(
+        self,
+        area_matrix,
+        land_uses: List[str],
+        include_breakdown: bool = False
+    ) -> Dict:
+        """
+        Calculate weighted C-values for many basins at once.
+
+        Vectorized equivalent of calculate_weighted_c: the C-value of each
+        land use is resolved once and all basins are weighted with a single
+        matrix product (areas @ C). Rounding matches calculate_weighted_c.
+
+        Args:
+            area_matrix: Areas shaped (basins, land uses); column j is the
+                         area of land_uses[j] in each basin
+            land_uses: Land use name for each column
+            include_breakdown: Also build the per-basin breakdown dictionaries
+                               (same format as calculate_weighted_c)
+
+        Returns:
+            Dictionary with weighted_c_values and total_areas (one element per
+            basin), c_values (one per land use) and, if requested, breakdowns
+
+        Raises:
+            ValueError: If the matrix shape doesn't match land_uses, a land use
+                        is not in the lookup table, or a basin has no area
+        """
+        areas = np.asarray(area_matrix, dtype=np.float64)
+
+        if areas.ndim != 2 or areas.shape[1] != len(land_uses):
+            raise ValueError(
+                f"Area matrix must be shaped (basins, {len(land_uses)}), got {areas.shape}"
+            )
+        if not land_uses:
+            raise ValueError("No land use areas provided")
+
+        resolver = CValueResolver.for_lookup(self.c_value_lookup)
+        c_values = np.empty(len(land_uses), dtype=np.float64)
+
+        for j, land_use in enumerate(land_uses):
+            key = resolver.resolve(land_use)
+
+            if key is None:
+                raise ValueError(
+                    f"Land use type '{land_use}' not found in C-value lookup table. "
+                    f"Available types: {list(self.c_value_lookup.keys())}"
+                )
+
+            c_values[j] = self.c_value_lookup[key]
+
+        total_areas = areas.sum(axis=1)
+
+        empty_basins = np.flatnonzero(total_areas <= 0)
+        if len(empty_basins):
+            raise ValueError(
+                f"Total area must be greater than zero (basins {empty_basins.tolist()})"
+            )
+
+        weighted_c = round_builtin_array((areas @ c_values) / total_areas, 3)
+
+        logger.info(f"Calculated weighted C-values for {len(areas)} basins")
+
+        result = {
+            "weighted_c_values": weighted_c,
+            "total_areas": total_areas,
+            "c_values": c_values,
+        }
+
+        if include_breakdown:
+            contributions = areas * c_values
+            percentages = areas / total_areas[:, None] * 100
+
+            result["breakdowns"] = [
+                {
+                    land_use: {
+                        "area": float(areas[i, j]),
+                        "percentage": round(float(percentages[i, j]), 1),
+                        "c_value": float(c_values[j]),
+                        "weighted_contribution": float(contributions[i, j]),
+                    }
+                    for j, land_use in enumerate(land_uses)
+                }
+                for i in range(len(areas))
+            ]
+
+        return result
+
     def calculate_from_percentages(self, land_use_percentages: Dict[str, float]) -> float:
         """
         Calculate weighted C-value from percentages.
@@ -0,0 +1,143 @@
+"""
+Module A - Batch Area Calculator
+Calculate many drainage basins at once across a process pool
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional
+import logging
+import time
+
+from .area_calculator import AreaCalculator, WeightedCValueCalculator
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_basin(
+    basin: Dict,
+    precision: int = 2,
+    overlay: bool = False,
+    c_value_lookup: Optional[Dict[str, float]] = None
+) -> Dict:
+    """
+    Calculate areas and weighted C-value for one basin.
+
+    Module-level so it can be sent to worker processes.
+
+    Args:
+        basin: Dictionary with area_label, total_polygon, impervious_polygons
+               (optional) and land_use_areas ({land_use: area})
+        precision: Decimal places for area calculations
+        overlay: Use spatial overlay for the impervious split
+        c_value_lookup: Custom C-value lookup table (optional)
+
+    Returns:
+        Dictionary with area_label, area_result, c_result, centroid_x,
+        centroid_y and elapsed_ms, or area_label, error and elapsed_ms on failure
+    """
+    started = time.perf_counter()
+
+    try:
+        area_calc = AreaCalculator(precision=precision)
+        c_calc = WeightedCValueCalculator(c_value_lookup)
+
+        area_result = area_calc.calculate_split_areas(
+            total_polygon=basin["total_polygon"],
+            impervious_polygons=basin.get("impervious_polygons"),
+            overlay=overlay
+        )
+        c_result = c_calc.calculate_weighted_c(basin["land_use_areas"])
+        centroid = area_calc.calculate_polygon_area(basin["total_polygon"])
+
+        return {
+            "area_label": basin["area_label"],
+            "area_result": area_result,
+            "c_result": c_result,
+            "centroid_x": centroid["centroid_x"],
+            "centroid_y": centroid["centroid_y"],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    except Exception as e:
+        return {
+            "area_label": basin.get("area_label"),
+            "error": str(e),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+
+class BatchAreaCalculator:
+    """
+    Calculate drainage areas and C-values for many basins in parallel.
+
+    Basins are independent, so the Shapely and C-value work is spread over
+    a process pool. Pass a long-lived executor to reuse its workers across
+    calls; without one, each parallel call starts and stops its own pool.
+    Small batches run in-process, where dispatch would cost more than it saves.
+
+    Usage:
+        calc = BatchAreaCalculator(precision=2, executor=pool)
+        results = calc.calculate(basins)
+    """
+
+    def __init__(
+        self,
+        precision: int = 2,
+        max_workers: Optional[int] = None,
+        min_parallel_basins: int = 8,
+        c_value_lookup: Optional[Dict[str, float]] = None,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize calculator.
+
+        Args:
+            precision: Decimal places for area calculations
+            max_workers: Worker processes (default: CPU count)
+            min_parallel_basins: Batches smaller than this run in-process
+            c_value_lookup: Custom C-value lookup table (optional)
+            executor: Shared process pool to run on (optional, not shut down here)
+        """
+        self.precision = precision
+        self.max_workers = max_workers
+        self.min_parallel_basins = min_parallel_basins
+        self.c_value_lookup = c_value_lookup
+        self.executor = executor
+
+    def calculate(self, basins: List[Dict], overlay: bool = False) -> List[Dict]:
+        """
+        Calculate every basin, preserving input order.
+
+        Args:
+            basins: List of basin dictionaries (see calculate_basin)
+            overlay: Use spatial overlay for the impervious split
+
+        Returns:
+            List of per-basin results (see calculate_basin); failed basins
+            carry an "error" key instead of results
+        """
+        if not basins:
+            return []
+
+        started = time.perf_counter()
+        args = (
+            basins,
+            [self.precision] * len(basins),
+            [overlay] * len(basins),
+            [self.c_value_lookup] * len(basins),
+        )
+
+        if len(basins) < self.min_parallel_basins or self.max_workers == 1:
+            results = list(map(calculate_basin, *args))
+        elif self.executor is not None:
+            results = list(self.executor.map(calculate_basin, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                results = list(pool.map(calculate_basin, *args))
+
+        failed = sum(1 for r in results if "error" in r)
+        logger.info(
+            f"Calculated {len(basins)} basins in {(time.perf_counter() - started) * 1000:.1f} ms"
+            + (f" ({failed} failed)" if failed else "")
+        )
+
+        return results
@@ -0,0 +1,165 @@
+"""
+Module A - C-Value Resolver
+Match free-text land use names (e.g., from PDF tables) to C-value lookup keys
+"""
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_land_use(name: str) -> str:
+    """
+    Normalize a land use name for matching.
+
+    Lowercases and collapses underscores, punctuation and whitespace to
+    single spaces, so "Grass_Flat", "grass flat" and "GRASS - FLAT" compare equal.
+
+    Args:
+        name: Raw land use name
+
+    Returns:
+        Normalized name
+    """
+    return _NON_ALNUM.sub(" ", name.lower()).strip()
+
+
+class CValueResolver:
+    """
+    Resolve land use names to keys of a C-value lookup table.
+
+    Built once per lookup table: keys are normalized and indexed by
+    character trigram, so a fuzzy lookup only checks the few keys that
+    share a trigram with the name instead of scanning the whole table.
+    Resolutions are memoized in an LRU cache.
+
+    Matching rules, in order:
+    1. Normalized name equals a normalized key
+    2. A key is contained in the name - the longest such key wins
+       ("Asphalt Pavement" -> "pavement")
+    3. The name is contained in a key - the shortest such key wins
+       ("grass" -> "grass_flat")
+    Remaining ties are broken alphabetically, so the result never depends
+    on the insertion order of the lookup table.
+
+    Usage:
+        resolver = CValueResolver.for_lookup(STANDARD_C_VALUES)
+        key = resolver.resolve("Asphalt Pavement")  # "pavement"
+    """
+
+    NGRAM_SIZE = 3
+
+    DEFAULT_CACHE_SIZE = 4096
+
+    def __init__(self, keys, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Build the index.
+
+        Args:
+            keys: Lookup table keys
+            cache_size: Maximum memoized resolutions
+        """
+        self.exact: Dict[str, str] = {}
+        self.normalized: Dict[str, str] = {}
+        self.key_norms: Dict[str, str] = {}
+        self.index: Dict[str, Set[str]] = defaultdict(set)
+        self.short_keys: Set[str] = set()  # too short to index
+
+        # Sorted so that duplicate normalized forms resolve deterministically
+        for key in sorted(keys):
+            norm = normalize_land_use(key)
+            self.key_norms[key] = norm
+            self.exact.setdefault(key.lower(), key)
+            self.normalized.setdefault(norm, key)
+
+            ngrams = self._ngrams(norm)
+            if not ngrams:
+                self.short_keys.add(key)
+            for ngram in ngrams:
+                self.index[ngram].add(key)
+
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    @classmethod
+    def for_lookup(cls, c_value_lookup: Dict[str, float]) -> "CValueResolver":
+        """
+        Get the shared resolver for a lookup table.
+
+        Resolvers are cached by the table's keys, so calculators sharing a
+        table share one index and one memo cache, and a table that gains
+        or loses keys gets a fresh resolver.
+
+        Args:
+            c_value_lookup: C-value lookup table
+
+        Returns:
+            CValueResolver for the table's keys
+        """
+        return _resolver_for_keys(frozenset(c_value_lookup))
+
+    def _ngrams(self, text: str) -> Set[str]:
+        """Character n-grams of a normalized name"""
+        n = self.NGRAM_SIZE
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def _resolve(self, name: str) -> Optional[str]:
+        """
+        Resolve a land use name to a lookup key.
+
+        Args:
+            name: Land use name
+
+        Returns:
+            Matching lookup key, or None if nothing matches
+        """
+        key = self.exact.get(name.lower())
+        if key is not None:
+            return key
+
+        norm = normalize_land_use(name)
+        if not norm:
+            return None
+
+        key = self.normalized.get(norm)
+        if key is not None:
+            return key
+
+        # Containment in either direction shares every n-gram of the shorter
+        # string, so keys sharing no n-gram with the name cannot match
+        ngrams = self._ngrams(norm)
+        if ngrams:
+            candidates = set(self.short_keys)
+            for ngram in ngrams:
+                candidates |= self.index.get(ngram, set())
+        else:
+            candidates = set(self.key_norms)
+
+        best: Optional[Tuple] = None
+        for candidate in candidates:
+            candidate_norm = self.key_norms[candidate]
+
+            if candidate_norm in norm:
+                rank = (0, -len(candidate_norm), candidate)
+            elif norm in candidate_norm:
+                rank = (1, len(candidate_norm), candidate)
+            else:
+                continue
+
+            if best is None or rank < best:
+                best = rank
+
+        if best is None:
+            return None
+
+        logger.debug(f"Resolved land use '{name}' to '{best[2]}'")
+        return best[2]
+
+
+@lru_cache(maxsize=32)
+def _resolver_for_keys(keys: FrozenSet[str]) -> CValueResolver:
+    return CValueResolver(keys)
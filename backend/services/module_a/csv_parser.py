@@ -2,10 +2,15 @@
 Module A - Survey CSV Parser
 Parses survey CSV files from Civil 3D / survey equipment
 """
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, Union, TYPE_CHECKING
 from pathlib import Path
 import logging
+import math
+
+if TYPE_CHECKING:
+    from .survey_cache import SurveyCache
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +18,8 @@ logger = logging.getLogger(__name__)
 class SurveyPoint:
     """Represents a single survey point"""
 
+    __slots__ = ("point_name", "northing", "easting", "elevation", "point_code")
+
     def __init__(self, point_name: str, northing: float, easting: float, elevation: float, point_code: str = ""):
         self.point_name = point_name
         self.northing = northing
@@ -24,6 +31,290 @@ class SurveyPoint:
         return f"SurveyPoint({self.point_name}, N:{self.northing}, E:{self.easting}, Z:{self.elevation})"
 
 
+class SurveyPointView:
+    """
+    Lightweight view of one point in a SurveyPointArray.
+
+    Exposes the SurveyPoint attributes, reading from and writing to the
+    underlying structured array. Holds no point data of its own.
+    """
+
+    __slots__ = ("_points", "_index")
+
+    def __init__(self, points: "SurveyPointArray", index: int):
+        self._points = points
+        self._index = index
+
+    @property
+    def point_name(self) -> str:
+        return str(self._points.data["point_name"][self._index])
+
+    @point_name.setter
+    def point_name(self, value: str):
+        self._points.set_name(self._index, value)
+
+    @property
+    def northing(self) -> float:
+        return float(self._points.data["northing"][self._index])
+
+    @northing.setter
+    def northing(self, value: float):
+        self._points.data["northing"][self._index] = value
+
+    @property
+    def easting(self) -> float:
+        return float(self._points.data["easting"][self._index])
+
+    @easting.setter
+    def easting(self, value: float):
+        self._points.data["easting"][self._index] = value
+
+    @property
+    def elevation(self) -> float:
+        return float(self._points.data["elevation"][self._index])
+
+    @elevation.setter
+    def elevation(self, value: float):
+        self._points.data["elevation"][self._index] = value
+
+    @property
+    def point_code(self) -> str:
+        return self._points.code_at(self._index)
+
+    @point_code.setter
+    def point_code(self, value: str):
+        self._points.set_code(self._index, value)
+
+    def to_point(self) -> SurveyPoint:
+        """Copy into a standalone SurveyPoint"""
+        return SurveyPoint(self.point_name, self.northing, self.easting, self.elevation, self.point_code)
+
+    def __repr__(self):
+        return f"SurveyPoint({self.point_name}, N:{self.northing}, E:{self.easting}, Z:{self.elevation})"
+
+
+class SurveyPointArray:
+    """
+    Compact container of survey points backed by a NumPy structured array.
+
+    Each point costs one fixed-width record (name, northing, easting,
+    elevation, code index) instead of a Python object with five attribute
+    objects. Point codes are stored once in `code_categories` and referenced
+    by index.
+
+    Behaves like a read/write list of SurveyPoint for existing callers:
+        points[0].northing          # SurveyPointView
+        points[10:20]               # SurveyPointArray
+        for point in points: ...
+
+    Slices are NumPy views and write through to their parent; boolean masks
+    and index arrays return copies. Containers derived from one another share
+    the same `code_categories` list, so codes added through any of them
+    resolve in all of them.
+
+    Whole columns are available as arrays: points.northing, points.elevation, ...
+    """
+
+    def __init__(self, data: np.ndarray, code_categories: Optional[List[str]] = None):
+        """
+        Initialize container.
+
+        Args:
+            data: Structured array with point_name, northing, easting,
+                  elevation and point_code (int32 index) fields
+            code_categories: Distinct point codes referenced by data["point_code"]
+        """
+        self.data = data
+        # Shared, not copied: slices reference the parent's code indices
+        self.code_categories: List[str] = code_categories if code_categories is not None else []
+
+    @staticmethod
+    def record_dtype(name_length: int = 1) -> np.dtype:
+        """Structured dtype for one survey point record"""
+        return np.dtype([
+            ("point_name", f"U{max(name_length, 1)}"),
+            ("northing", np.float64),
+            ("easting", np.float64),
+            ("elevation", np.float64),
+            ("point_code", np.int32),
+        ])
+
+    @classmethod
+    def empty(cls) -> "SurveyPointArray":
+        """Create an empty container"""
+        return cls(np.empty(0, dtype=cls.record_dtype()))
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray]) -> "SurveyPointArray":
+        """
+        Build from columnar arrays (as produced by SurveyCSVParser.parse_columns).
+
+        Args:
+            columns: Dictionary with point_name, northing, easting, elevation
+                     arrays and a pandas Categorical point_code
+
+        Returns:
+            SurveyPointArray
+        """
+        names = np.asarray(columns["point_name"], dtype=str)
+        codes = pd.Categorical(columns["point_code"])
+
+        data = np.empty(len(names), dtype=cls.record_dtype(names.dtype.itemsize // 4))
+        data["point_name"] = names
+        data["northing"] = columns["northing"]
+        data["easting"] = columns["easting"]
+        data["elevation"] = columns["elevation"]
+        data["point_code"] = codes.codes
+
+        return cls(data, [str(category) for category in codes.categories])
+
+    @classmethod
+    def from_points(cls, points: List[SurveyPoint]) -> "SurveyPointArray":
+        """Build from a list of SurveyPoint objects"""
+        return cls.from_columns({
+            "point_name": [p.point_name for p in points],
+            "northing": np.array([p.northing for p in points], dtype=np.float64),
+            "easting": np.array([p.easting for p in points], dtype=np.float64),
+            "elevation": np.array([p.elevation for p in points], dtype=np.float64),
+            "point_code": [p.point_code for p in points],
+        })
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            index = int(key)
+            if index < 0:
+                index += len(self.data)
+            if not 0 <= index < len(self.data):
+                raise IndexError("SurveyPointArray index out of range")
+            return SurveyPointView(self, index)
+
+        # Slices, boolean masks and index arrays return a new container
+        return SurveyPointArray(self.data[key], self.code_categories)
+
+    def __iter__(self) -> Iterator[SurveyPointView]:
+        for index in range(len(self.data)):
+            yield SurveyPointView(self, index)
+
+    def __repr__(self):
+        return f"SurveyPointArray({len(self)} points, {self.nbytes} bytes)"
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the point records"""
+        return int(self.data.nbytes)
+
+    @property
+    def point_name(self) -> np.ndarray:
+        return self.data["point_name"]
+
+    @property
+    def northing(self) -> np.ndarray:
+        return self.data["northing"]
+
+    @property
+    def easting(self) -> np.ndarray:
+        return self.data["easting"]
+
+    @property
+    def elevation(self) -> np.ndarray:
+        return self.data["elevation"]
+
+    @property
+    def point_code(self) -> pd.Categorical:
+        return pd.Categorical.from_codes(self.data["point_code"], categories=self.code_categories)
+
+    def set_name(self, index: int, name: str):
+        """Set the name of a single record, widening the name field if needed"""
+        width = self.data.dtype["point_name"].itemsize // 4
+        if len(name) > width:
+            self.data = self.data.astype(self.record_dtype(len(name)))
+        self.data["point_name"][index] = name
+
+    def code_at(self, index: int) -> str:
+        """Point code of a single record"""
+        code = self.data["point_code"][index]
+        return self.code_categories[code] if code >= 0 else ""
+
+    def set_code(self, index: int, code: str):
+        """Set the point code of a single record, adding new codes as needed"""
+        if code not in self.code_categories:
+            self.code_categories.append(code)
+        self.data["point_code"][index] = self.code_categories.index(code)
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """Columnar arrays (coordinate arrays are views of the records)"""
+        return {
+            "point_name": self.point_name,
+            "northing": self.northing,
+            "easting": self.easting,
+            "elevation": self.elevation,
+            "point_code": self.point_code,
+        }
+
+
+class SurveyStatistics:
+    """
+    Running survey statistics, updated one batch of points at a time.
+
+    Keeps only counts and extents, so memory use is independent of the
+    number of points seen.
+    """
+
+    def __init__(self):
+        self.total_points = 0
+        self.northing_min = math.inf
+        self.northing_max = -math.inf
+        self.easting_min = math.inf
+        self.easting_max = -math.inf
+        self.elevation_min = math.inf
+        self.elevation_max = -math.inf
+
+    def update(self, columns: Dict[str, np.ndarray]) -> "SurveyStatistics":
+        """
+        Fold a batch of columnar points into the running statistics.
+
+        Args:
+            columns: Dictionary with northing, easting and elevation arrays
+
+        Returns:
+            self, for chaining
+        """
+        northings = columns['northing']
+        if len(northings) == 0:
+            return self
+
+        eastings = columns['easting']
+        elevations = columns['elevation']
+
+        self.total_points += int(len(northings))
+        self.northing_min = min(self.northing_min, float(northings.min()))
+        self.northing_max = max(self.northing_max, float(northings.max()))
+        self.easting_min = min(self.easting_min, float(eastings.min()))
+        self.easting_max = max(self.easting_max, float(eastings.max()))
+        self.elevation_min = min(self.elevation_min, float(elevations.min()))
+        self.elevation_max = max(self.elevation_max, float(elevations.max()))
+        return self
+
+    def to_dict(self) -> Dict:
+        """Statistics in the SurveyCSVParser.get_statistics() format"""
+        if self.total_points == 0:
+            return {}
+
+        return {
+            "total_points": self.total_points,
+            "northing_min": self.northing_min,
+            "northing_max": self.northing_max,
+            "easting_min": self.easting_min,
+            "easting_max": self.easting_max,
+            "elevation_min": self.elevation_min,
+            "elevation_max": self.elevation_max,
+            "elevation_range": self.elevation_max - self.elevation_min,
+        }
+
+
 class SurveyCSVParser:
     """
     Parses survey CSV files exported from Civil 3D or survey equipment.
@@ -35,23 +326,118 @@ class SurveyCSVParser:
     - Elevation
     - Point Code (optional)
 
+    Only the columns above are read from the file, so wide Trimble exports
+    (90+ columns) parse at the same speed as a five-column CSV.
+
+    Points are stored in a SurveyPointArray (one structured-array record per
+    point); indexing it returns SurveyPoint-compatible views.
+
     Usage:
         parser = SurveyCSVParser("path/to/survey.csv")
         points = parser.parse()
         boundary = parser.get_boundary_points()
+
+    Columnar mode works with plain column arrays instead of point views:
+        parser = SurveyCSVParser("path/to/survey.csv", columnar=True)
+        columns = parser.parse_columns()
+        stats = parser.get_statistics()
+
+    Streaming mode reads the file in chunks and never holds more than one
+    chunk in memory (statistics and GeoJSON export run in a single pass):
+        parser = SurveyCSVParser("path/to/lidar.csv", chunksize=100_000)
+        stats = parser.get_statistics()
+        for batch in parser.iter_batches():
+            ...
+
+    With a SurveyCache, a file whose bytes were parsed before is loaded as a
+    memory-mapped array instead of being re-read (streamed parses populate
+    the cache too):
+        parser = SurveyCSVParser("path/to/survey.csv", cache=SurveyCache(cache_dir))
     """
 
-    def __init__(self, csv_path: str):
+    REQUIRED_COLUMNS = ['Point Name', 'Northing', 'Easting', 'Elevation']
+    COORDINATE_COLUMNS = ['Northing', 'Easting', 'Elevation']
+    CODE_COLUMN = 'Point Code'
+
+    DEFAULT_CHUNKSIZE = 100_000
+
+    # Explicit dtypes so pandas skips type inference on large files
+    COLUMN_DTYPES = {
+        'Point Name': str,
+        'Northing': 'float64',
+        'Easting': 'float64',
+        'Elevation': 'float64',
+        'Point Code': 'category',
+    }
+
+    def __init__(
+        self,
+        csv_path: str,
+        columnar: bool = False,
+        chunksize: Optional[int] = None,
+        cache: Optional["SurveyCache"] = None
+    ):
+        """
+        Initialize parser.
+
+        Args:
+            csv_path: Path to survey CSV file
+            columnar: Return column arrays rather than point containers
+            chunksize: Rows per chunk; enables streaming statistics and GeoJSON export
+            cache: Optional on-disk cache of parsed surveys keyed by file content
+        """
         self.csv_path = Path(csv_path)
-        self.df: Optional[pd.DataFrame] = None
-        self.points: List[SurveyPoint] = []
+        self.columnar = columnar
+        self.chunksize = chunksize
+        self.cache = cache
+        self._cache_key: Optional[str] = None
+        self.points: SurveyPointArray = SurveyPointArray.empty()
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        self._columns_data: Optional[np.ndarray] = None
+
+    @property
+    def columns(self) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Columnar views of the parsed points (None until parsed).
 
-    def parse(self) -> List[SurveyPoint]:
+        SurveyPointArray.set_name replaces the record array when a longer
+        name needs a wider field, so the views are rebuilt whenever
+        self.points no longer holds the array they were taken from.
+        """
+        if self._columns is not None and self._columns_data is not self.points.data:
+            self._columns = self.points.to_columns()
+            self._columns_data = self.points.data
+        return self._columns
+
+    @columns.setter
+    def columns(self, columns: Optional[Dict[str, np.ndarray]]):
+        self._columns = columns
+        self._columns_data = self.points.data
+
+    def parse(self) -> SurveyPointArray:
         """
         Parse the CSV file and extract survey points.
 
         Returns:
-            List of SurveyPoint objects
+            SurveyPointArray (list-like; items behave as SurveyPoint)
+
+        Raises:
+            FileNotFoundError: If CSV file doesn't exist
+            ValueError: If required columns are missing
+        """
+        self.parse_columns()
+        return self.points
+
+    def parse_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Parse the CSV file into columnar arrays.
+
+        Reads only the survey columns with explicit dtypes. Points are stored
+        once in a SurveyPointArray; the returned coordinate arrays are views of
+        it and point codes a pandas Categorical.
+
+        Returns:
+            Dictionary with point_name, northing, easting, elevation and point_code arrays
 
         Raises:
             FileNotFoundError: If CSV file doesn't exist
@@ -60,44 +446,247 @@ class SurveyCSVParser:
         if not self.csv_path.exists():
             raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
 
+        if self._load_from_cache():
+            return self.columns
+
         try:
-            # Read CSV, handling potential BOM (byte order mark)
-            self.df = pd.read_csv(self.csv_path, encoding='utf-8-sig')
-
-            # Validate required columns
-            required_columns = ['Point Name', 'Northing', 'Easting', 'Elevation']
-            missing_columns = [col for col in required_columns if col not in self.df.columns]
-
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {missing_columns}")
-
-            # Remove rows with NaN in critical columns
-            self.df = self.df.dropna(subset=['Northing', 'Easting', 'Elevation'])
-
-            # Convert to SurveyPoint objects
-            self.points = []
-            for _, row in self.df.iterrows():
-                try:
-                    point = SurveyPoint(
-                        point_name=str(row['Point Name']),
-                        northing=float(row['Northing']),
-                        easting=float(row['Easting']),
-                        elevation=float(row['Elevation']),
-                        point_code=str(row.get('Point Code', ''))
-                    )
-                    self.points.append(point)
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Skipping row due to conversion error: {e}")
-                    continue
+            df = self._prepare_frame(self._read_csv())
+            self.points = SurveyPointArray.from_columns(self._frame_to_columns(df))
+            self.columns = self.points.to_columns()
 
             logger.info(f"Parsed {len(self.points)} survey points from {self.csv_path.name}")
-            return self.points
+
+            if self.cache is not None:
+                self.cache.put(self._get_cache_key(), self.points)
+
+            return self.columns
 
         except Exception as e:
             logger.error(f"Error parsing CSV file: {e}")
             raise
 
-    def get_boundary_points(self, point_code_filter: Optional[str] = None) -> List[SurveyPoint]:
+    def iter_batches(self, chunksize: Optional[int] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Stream the CSV file as batches of columnar arrays.
+
+        Only one chunk is held in memory at a time, so files larger than RAM
+        can be processed at a fixed memory limit. Nothing is stored on the parser.
+
+        Args:
+            chunksize: Rows per batch (default: parser chunksize or DEFAULT_CHUNKSIZE)
+
+        Yields:
+            Dictionaries with the same arrays as parse_columns()
+
+        Raises:
+            FileNotFoundError: If CSV file doesn't exist
+            ValueError: If required columns are missing
+        """
+        if not self.csv_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
+
+        chunksize = chunksize or self.chunksize or self.DEFAULT_CHUNKSIZE
+        total_points = 0
+
+        for chunk in self._iter_csv_chunks(chunksize):
+            columns = self._frame_to_columns(self._prepare_frame(chunk))
+            total_points += len(columns['northing'])
+            yield columns
+
+        logger.info(f"Streamed {total_points} survey points from {self.csv_path.name}")
+
+    def preview(self, max_points: int = 100) -> pd.DataFrame:
+        """
+        Read the first points of the file without parsing the rest.
+
+        Args:
+            max_points: Number of points to return
+
+        Returns:
+            DataFrame with the same columns as to_dataframe()
+        """
+        if self.columns is not None:
+            # Slice before building the frame so a memory-mapped survey is only
+            # read (and its names boxed as objects) for the previewed rows
+            return pd.DataFrame({key: values[:max_points] for key, values in self.columns.items()})
+
+        frames = []
+        remaining = max_points
+
+        for columns in self.iter_batches(chunksize=max_points):
+            frames.append(pd.DataFrame(columns).head(remaining))
+            remaining -= len(frames[-1])
+            if remaining <= 0:
+                break
+
+        if not frames:
+            return pd.DataFrame(columns=['point_name', 'northing', 'easting', 'elevation', 'point_code'])
+        return pd.concat(frames, ignore_index=True)
+
+    def _get_cache_key(self) -> str:
+        """Content hash of the CSV file (computed once per parser)"""
+        if self._cache_key is None:
+            self._cache_key = self.cache.key_for(str(self.csv_path))
+        return self._cache_key
+
+    def _load_from_cache(self) -> bool:
+        """Load points from the cache if this file was parsed before"""
+        if self.cache is None or self.columns is not None:
+            return False
+
+        if not self.csv_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
+
+        cached = self.cache.get(self._get_cache_key())
+        if cached is None:
+            return False
+
+        self.points = cached
+        self.columns = self.points.to_columns()
+        logger.info(f"Loaded {len(self.points)} survey points for {self.csv_path.name} from cache")
+        return True
+
+    def _stream_batches(self) -> Iterator[Dict[str, np.ndarray]]:
+        """iter_batches() that also writes a cache entry when a cache is configured"""
+        if self.cache is None:
+            yield from self.iter_batches()
+            return
+
+        writer = self.cache.writer(self._get_cache_key())
+        try:
+            for columns in self.iter_batches():
+                writer.append(SurveyPointArray.from_columns(columns))
+                yield columns
+        except BaseException:
+            writer.abort()
+            raise
+
+        writer.commit()
+
+    def _prepare_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Validate required columns and drop rows missing coordinates"""
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
+
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        # Remove rows with NaN in critical columns
+        return df.dropna(subset=self.COORDINATE_COLUMNS)
+
+    def _frame_to_columns(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Convert a prepared DataFrame into columnar arrays"""
+        if self.CODE_COLUMN in df.columns:
+            codes = df[self.CODE_COLUMN]
+            if codes.isna().any():
+                if '' not in codes.cat.categories:
+                    codes = codes.cat.add_categories([''])
+                codes = codes.fillna('')
+            point_codes = pd.Categorical(codes)
+        else:
+            point_codes = pd.Categorical([''] * len(df))
+
+        return {
+            'point_name': df['Point Name'].fillna('').to_numpy(dtype=object),
+            'northing': df['Northing'].to_numpy(dtype=np.float64),
+            'easting': df['Easting'].to_numpy(dtype=np.float64),
+            'elevation': df['Elevation'].to_numpy(dtype=np.float64),
+            'point_code': point_codes,
+        }
+
+    def _read_csv(self) -> pd.DataFrame:
+        """Read the survey columns, coercing malformed coordinates to NaN"""
+        try:
+            # Read CSV, handling potential BOM (byte order mark)
+            return pd.read_csv(
+                self.csv_path,
+                encoding='utf-8-sig',
+                usecols=self._use_column,
+                dtype=self.COLUMN_DTYPES,
+            )
+        except ValueError as e:
+            # Non-numeric coordinates - fall back to per-column coercion
+            logger.warning(f"Coordinate dtype conversion failed, coercing bad rows: {e}")
+
+        df = pd.read_csv(
+            self.csv_path,
+            encoding='utf-8-sig',
+            usecols=self._use_column,
+            dtype=self._text_dtypes(),
+        )
+        return self._coerce_coordinates(df)
+
+    def _iter_csv_chunks(self, chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Read the survey columns in chunks.
+
+        If a chunk contains non-numeric coordinates, the reader is reopened
+        in coercing mode and resumes at the first row of that chunk. Rows
+        already yielded are counted off the parsed chunks rather than skipped
+        by line number, since blank lines (dropped by read_csv) and quoted
+        newlines make line numbers drift from row counts.
+        """
+        rows_read = 0
+        coerce = False
+
+        while True:
+            reader = pd.read_csv(
+                self.csv_path,
+                encoding='utf-8-sig',
+                usecols=self._use_column,
+                dtype=self._text_dtypes() if coerce else self.COLUMN_DTYPES,
+                chunksize=chunksize,
+            )
+            rows_to_skip = rows_read
+
+            try:
+                with reader:
+                    for chunk in reader:
+                        if rows_to_skip:
+                            skipped = min(rows_to_skip, len(chunk))
+                            rows_to_skip -= skipped
+                            chunk = chunk.iloc[skipped:]
+                            if chunk.empty:
+                                continue
+                        rows_read += len(chunk)
+                        yield self._coerce_coordinates(chunk) if coerce else chunk
+                return
+            except ValueError as e:
+                if coerce:
+                    raise
+                logger.warning(f"Coordinate dtype conversion failed, coercing bad rows: {e}")
+                coerce = True
+
+    def _use_column(self, column: str) -> bool:
+        """usecols filter - only read the survey columns"""
+        return column in self.COLUMN_DTYPES
+
+    def _text_dtypes(self) -> Dict:
+        """Column dtypes with coordinates read as text for coercion"""
+        return {
+            col: (str if col in self.COORDINATE_COLUMNS else dtype)
+            for col, dtype in self.COLUMN_DTYPES.items()
+        }
+
+    def _coerce_coordinates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert coordinate columns to float64, turning bad values into NaN"""
+        for col in self.COORDINATE_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float64)
+        return df
+
+    def _should_stream(self) -> bool:
+        """Streaming mode applies until the points are loaded (or found in the cache)"""
+        return bool(self.chunksize) and self.columns is None and not self._load_from_cache()
+
+    def _ensure_parsed(self):
+        """Parse the file on first access"""
+        if self.columns is None:
+            self.parse_columns()
+
+    def get_boundary_points(
+        self,
+        point_code_filter: Optional[str] = None
+    ) -> Union[SurveyPointArray, List[SurveyPointView], Dict[str, np.ndarray]]:
         """
         Extract boundary points (e.g., points marked with specific codes).
 
@@ -105,89 +694,128 @@ class SurveyCSVParser:
             point_code_filter: Filter points by code (e.g., "BOUNDARY", "EDGE")
 
         Returns:
-            Filtered list of SurveyPoint objects
+            All points, or a list of views of the matching points (edits write
+            through to self.points); filtered column arrays in columnar mode
         """
-        if not self.points:
-            self.parse()
+        self._ensure_parsed()
+
+        if self.columnar:
+            if not point_code_filter:
+                return self.columns
+            mask = self._code_mask(point_code_filter)
+            return {key: values[mask] for key, values in self.columns.items()}
 
         if point_code_filter:
-            return [p for p in self.points if point_code_filter.upper() in p.point_code.upper()]
+            return [self.points[index] for index in np.flatnonzero(self._code_mask(point_code_filter))]
         return self.points
 
+    def _code_mask(self, point_code_filter: str) -> np.ndarray:
+        """Boolean mask of points whose code contains the filter (case-insensitive)"""
+        codes = self.columns['point_code']
+        needle = point_code_filter.upper()
+        # Match against the distinct codes only; the trailing False catches missing codes (-1)
+        matching = np.array(
+            [needle in str(category).upper() for category in codes.categories] + [False],
+            dtype=bool,
+        )
+        return matching[codes.codes]
+
     def get_statistics(self) -> Dict:
         """
         Get statistics about the survey points.
 
+        In streaming mode (chunksize set) this is a single pass over the file
+        unless the points are already loaded or cached.
+
         Returns:
             Dictionary with min/max elevations, extents, etc.
         """
-        if not self.points:
-            self.parse()
-
-        if not self.points:
-            return {}
+        if self._should_stream():
+            stats = SurveyStatistics()
+            for columns in self._stream_batches():
+                stats.update(columns)
+            return stats.to_dict()
 
-        northings = [p.northing for p in self.points]
-        eastings = [p.easting for p in self.points]
-        elevations = [p.elevation for p in self.points]
+        self._ensure_parsed()
 
-        return {
-            "total_points": len(self.points),
-            "northing_min": min(northings),
-            "northing_max": max(northings),
-            "easting_min": min(eastings),
-            "easting_max": max(eastings),
-            "elevation_min": min(elevations),
-            "elevation_max": max(elevations),
-            "elevation_range": max(elevations) - min(elevations),
-        }
+        return SurveyStatistics().update(self.columns).to_dict()
 
     def export_to_geojson(self, output_path: str) -> str:
         """
         Export survey points to GeoJSON format.
 
+        In streaming mode (chunksize set) features are written one chunk at
+        a time, one feature per line.
+
         Args:
             output_path: Path for output GeoJSON file
 
         Returns:
             Path to created GeoJSON file
         """
-        if not self.points:
-            self.parse()
-
         import json
 
-        features = []
-        for point in self.points:
-            feature = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    # NOTE: GeoJSON uses [longitude, latitude] = [easting, northing]
-                    "coordinates": [point.easting, point.northing, point.elevation]
-                },
-                "properties": {
-                    "name": point.point_name,
-                    "elevation": point.elevation,
-                    "code": point.point_code
-                }
-            }
-            features.append(feature)
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self._should_stream():
+            feature_count = 0
+            with open(output_path, 'w') as f:
+                f.write('{"type": "FeatureCollection", "features": [\n')
+                for columns in self._stream_batches():
+                    for feature in self._geojson_features(columns):
+                        if feature_count:
+                            f.write(',\n')
+                        f.write(json.dumps(feature))
+                        feature_count += 1
+                f.write('\n]}\n')
+
+            logger.info(f"Exported {feature_count} points to GeoJSON: {output_path}")
+            return str(output_path)
+
+        self._ensure_parsed()
+
+        features = self._geojson_features(self.columns)
 
         geojson = {
             "type": "FeatureCollection",
             "features": features
         }
 
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
         with open(output_path, 'w') as f:
             json.dump(geojson, f, indent=2)
 
         logger.info(f"Exported {len(features)} points to GeoJSON: {output_path}")
         return str(output_path)
 
+    def _geojson_features(self, columns: Dict[str, np.ndarray]) -> List[Dict]:
+        """Build GeoJSON point features from columnar arrays"""
+        # NOTE: GeoJSON uses [longitude, latitude] = [easting, northing]
+        coordinates = np.column_stack((
+            columns['easting'],
+            columns['northing'],
+            columns['elevation'],
+        )).tolist()
+        names = columns['point_name'].tolist()
+        elevations = columns['elevation'].tolist()
+        codes = np.asarray(columns['point_code']).tolist()
+
+        return [
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "Point",
+                    "coordinates": coords
+                },
+                "properties": {
+                    "name": name,
+                    "elevation": elevation,
+                    "code": code
+                }
+            }
+            for coords, name, elevation, code in zip(coordinates, names, elevations, codes)
+        ]
+
     def to_dataframe(self) -> pd.DataFrame:
         """
         Convert points to pandas DataFrame.
@@ -195,15 +823,12 @@ class SurveyCSVParser:
         Returns:
             DataFrame with point data
         """
-        if not self.points:
-            self.parse()
-
-        data = {
-            'point_name': [p.point_name for p in self.points],
-            'northing': [p.northing for p in self.points],
-            'easting': [p.easting for p in self.points],
-            'elevation': [p.elevation for p in self.points],
-            'point_code': [p.point_code for p in self.points],
-        }
-
-        return pd.DataFrame(data)
+        self._ensure_parsed()
+
+        return pd.DataFrame({
+            'point_name': self.columns['point_name'],
+            'northing': self.columns['northing'],
+            'easting': self.columns['easting'],
+            'elevation': self.columns['elevation'],
+            'point_code': self.columns['point_code'],
+        })
@@ -3,13 +3,81 @@ Module A - Excel TOC Workbook Updater
 Auto-populate Time of Concentration (TOC) calculation workbooks
 """
 from openpyxl import load_workbook, Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 import logging
 
+from .formula_evaluator import FormulaEvaluator, FormulaError, write_cached_values
+from .toc_importer import TOCWorkbookReader
+
 logger = logging.getLogger(__name__)
 
+DRAINAGE_AREA_HEADERS = [
+    "Drainage Area",
+    "Total Area (ac)",
+    "Impervious (ac)",
+    "Pervious (ac)",
+    "Weighted C",
+    "Impervious %"
+]
+
+TOC_HEADERS = [
+    "Drainage Area",
+    "Sheet Flow (ft)",
+    "Shallow Flow (ft)",
+    "Channel Flow (ft)",
+    "Tc Sheet (min)",
+    "Tc Shallow (min)",
+    "Tc Channel (min)",
+    "Tc Total (min)"
+]
+
+# Shared cell styles - registered once per workbook and referenced by name
+HEADER_STYLE = "TOC Header"
+LABEL_STYLE = "TOC Label"
+AREA_STYLE = "TOC Area"
+VALUE_STYLE = "TOC Value"
+
+
+# Data cell formatting (border, alignment and number format only, so
+# template fonts and fills survive when rows are written into a template)
+THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+CENTER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+
+
+def _build_named_styles() -> List[NamedStyle]:
+    """Create the TOC named styles (NamedStyle objects bind to one workbook)"""
+    border = THIN_BORDER
+    center = CENTER_ALIGNMENT
+
+    return [
+        NamedStyle(
+            name=HEADER_STYLE,
+            font=Font(bold=True, size=11),
+            alignment=center,
+            fill=PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid"),
+        ),
+        NamedStyle(name=LABEL_STYLE, font=DEFAULT_FONT, border=border, alignment=center),
+        NamedStyle(name=AREA_STYLE, font=DEFAULT_FONT, border=border, alignment=center, number_format='0.00'),
+        NamedStyle(name=VALUE_STYLE, font=DEFAULT_FONT, border=border, alignment=center, number_format='0.000'),
+    ]
+
+
+def _data_style(col: int) -> str:
+    """Named style for a data column (1-based, columns A-H)"""
+    if col == 1:
+        return LABEL_STYLE
+    return AREA_STYLE if col <= 4 else VALUE_STYLE
+
 
 class TOCExcelUpdater:
     """
@@ -20,6 +88,14 @@ class TOCExcelUpdater:
     - Weighted C-value insertion
     - Area calculations (sqft and acres)
     - Formatting and formulas
+
+    For large projects, export_streaming() writes a new workbook row by row
+    in openpyxl write-only mode, and fill_named_ranges() fills a template's
+    named ranges without rebuilding its sheets.
+
+    Formula results (e.g. Tc total) are computed when the workbook is saved
+    and stored as cached values, so the file reads correctly in data_only
+    mode without being opened in Excel first.
     """
 
     def __init__(self, template_path: Optional[str] = None):
@@ -85,23 +161,8 @@ class TOCExcelUpdater:
         current_row = start_row
 
         for area in drainage_areas:
-            # Column A: Drainage Area Label
-            ws.cell(row=current_row, column=1, value=area.get("area_label", ""))
-
-            # Column B: Total Area (acres)
-            ws.cell(row=current_row, column=2, value=area.get("total_area_acres", 0))
-
-            # Column C: Impervious Area (acres)
-            ws.cell(row=current_row, column=3, value=area.get("impervious_area_acres", 0))
-
-            # Column D: Pervious Area (acres)
-            ws.cell(row=current_row, column=4, value=area.get("pervious_area_acres", 0))
-
-            # Column E: Weighted C-value
-            ws.cell(row=current_row, column=5, value=area.get("weighted_c_value", 0))
-
-            # Column F: Impervious %
-            ws.cell(row=current_row, column=6, value=area.get("impervious_percentage", 0))
+            for col, value in enumerate(self._drainage_area_values(area), start=1):
+                ws.cell(row=current_row, column=col, value=value)
 
             # Apply formatting
             self._format_data_row(ws, current_row)
@@ -147,28 +208,153 @@ class TOCExcelUpdater:
         current_row = start_row
 
         for area_label, data in toc_data.items():
-            ws.cell(row=current_row, column=1, value=area_label)
-            ws.cell(row=current_row, column=2, value=data.get("sheet_flow_length", 0))
-            ws.cell(row=current_row, column=3, value=data.get("shallow_flow_length", 0))
-            ws.cell(row=current_row, column=4, value=data.get("channel_flow_length", 0))
-            ws.cell(row=current_row, column=5, value=data.get("tc_sheet", 0))
-            ws.cell(row=current_row, column=6, value=data.get("tc_shallow", 0))
-            ws.cell(row=current_row, column=7, value=data.get("tc_channel", 0))
-
-            # Total Tc formula (sum of components)
-            ws.cell(row=current_row, column=8, value=f"=SUM(E{current_row}:G{current_row})")
+            for col, value in enumerate(self._toc_values(area_label, data, current_row), start=1):
+                ws.cell(row=current_row, column=col, value=value)
 
             self._format_data_row(ws, current_row)
             current_row += 1
 
         logger.info(f"Updated TOC calculations for {len(toc_data)} areas")
 
-    def save(self, output_path: str):
+    def export_streaming(
+        self,
+        output_path: str,
+        drainage_areas: Optional[Iterable[Dict]] = None,
+        toc_data: Optional[Dict[str, Dict]] = None,
+        drainage_sheet_name: str = "Drainage Areas",
+        toc_sheet_name: str = "TOC Calculations"
+    ) -> int:
+        """
+        Write a new TOC workbook in write-only mode.
+
+        Rows are streamed to disk as they are generated and every cell
+        references a shared named style, so memory stays flat no matter how
+        many drainage areas are written. The output matches a workbook built
+        with update_drainage_area_data() / update_toc_calculations().
+
+        Args:
+            output_path: Path for output Excel file
+            drainage_areas: Drainage area dictionaries (any iterable, may be a generator)
+            toc_data: Dictionary mapping area_label to TOC data
+            drainage_sheet_name: Worksheet name for drainage areas
+            toc_sheet_name: Worksheet name for TOC calculations
+
+        Returns:
+            Number of data rows written
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        wb = Workbook(write_only=True)
+        self._register_named_styles(wb)
+        rows_written = 0
+        cached_values: Dict[str, Dict[str, Any]] = {}
+
+        if drainage_areas is not None:
+            ws = wb.create_sheet(drainage_sheet_name)
+            for col, width in zip("ABCDEF", (15, 14, 14, 14, 12, 12)):
+                ws.column_dimensions[col].width = width
+            ws.append(self._styled_row(ws, DRAINAGE_AREA_HEADERS, header=True))
+
+            # Columns G-H are styled but empty, as in _format_data_row
+            cells = self._styled_row(ws, [None] * 8)
+            for area in drainage_areas:
+                self._stream_row(ws, cells, self._drainage_area_values(area))
+                rows_written += 1
+
+        if toc_data is not None:
+            ws = wb.create_sheet(toc_sheet_name)
+            for col in "ABCDEFGH":
+                ws.column_dimensions[col].width = 15
+            ws.append(self._styled_row(ws, TOC_HEADERS, header=True))
+
+            cells = self._styled_row(ws, [None] * 8)
+            toc_cached = cached_values.setdefault(toc_sheet_name, {})
+            for row, (area_label, data) in enumerate(toc_data.items(), start=2):
+                values = self._toc_values(area_label, data, row)
+                self._stream_row(ws, cells, values)
+                toc_cached.update(self._evaluate_row(toc_sheet_name, row, values))
+                rows_written += 1
+
+        try:
+            wb.save(output_path)
+            write_cached_values(str(output_path), cached_values)
+            logger.info(f"Streamed {rows_written} rows to Excel workbook: {output_path}")
+        except Exception as e:
+            logger.error(f"Error saving workbook: {e}")
+            raise
+
+        return rows_written
+
+    def fill_named_ranges(self, values: Dict[str, Any]) -> int:
+        """
+        Write values into the template's named ranges.
+
+        Only the cells behind each defined name are touched - sheets,
+        formatting and formulas elsewhere in the template are left as-is.
+
+        Args:
+            values: Dictionary mapping defined name to a value. A scalar fills
+                    the first cell of the range; a list fills the range in
+                    row-major order; a list of lists fills it row by row.
+
+        Returns:
+            Number of cells written
+
+        Raises:
+            ValueError: If no workbook is loaded or a name is not defined
+        """
+        if not self.workbook:
+            raise ValueError("No workbook loaded. Call load_template() first")
+
+        cells_written = 0
+
+        for name, value in values.items():
+            defined_name = self._find_defined_name(name)
+            if defined_name is None:
+                raise ValueError(f"Named range '{name}' not found in workbook")
+
+            for sheet_title, coord in defined_name.destinations:
+                rows = self.workbook[sheet_title][coord]
+                if not isinstance(rows, tuple):
+                    rows = ((rows,),)  # single cell
+                elif rows and not isinstance(rows[0], tuple):
+                    rows = (rows,)  # single row or column returned flat
+
+                if not isinstance(value, (list, tuple)):
+                    value = [value]
+                if value and isinstance(value[0], (list, tuple)):
+                    targets = zip(rows, value)
+                    pairs = (pair for row_cells, row_values in targets for pair in zip(row_cells, row_values))
+                else:
+                    pairs = zip((cell for row_cells in rows for cell in row_cells), value)
+
+                for cell, cell_value in pairs:
+                    cell.value = cell_value
+                    cells_written += 1
+
+        logger.info(f"Filled {len(values)} named ranges ({cells_written} cells)")
+        return cells_written
+
+    def _find_defined_name(self, name: str):
+        """Look up a workbook-scoped or sheet-scoped defined name"""
+        if name in self.workbook.defined_names:
+            return self.workbook.defined_names[name]
+
+        for ws in self.workbook.worksheets:
+            if name in ws.defined_names:
+                return ws.defined_names[name]
+
+        return None
+
+    def save(self, output_path: str, cache_formula_values: bool = True):
         """
         Save workbook to file.
 
         Args:
             output_path: Path for output Excel file
+            cache_formula_values: Evaluate formulas and store their results
+                                  in the file (unsupported formulas are left uncached)
         """
         if not self.workbook:
             raise ValueError("No workbook to save")
@@ -178,27 +364,117 @@ class TOCExcelUpdater:
 
         try:
             self.workbook.save(output_path)
+            if cache_formula_values:
+                write_cached_values(str(output_path), self.evaluate_formulas())
             logger.info(f"Saved Excel workbook: {output_path}")
         except Exception as e:
             logger.error(f"Error saving workbook: {e}")
             raise
 
+    def evaluate_formulas(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute every supported formula in the loaded workbook.
+
+        Returns:
+            {sheet title: {coordinate: value}} for formulas that could be evaluated
+        """
+        if not self.workbook:
+            raise ValueError("No workbook loaded")
+
+        evaluator = FormulaEvaluator.for_workbook(self.workbook)
+        results: Dict[str, Dict[str, Any]] = {}
+        skipped = 0
+
+        for ws in self.workbook.worksheets:
+            sheet_results = results.setdefault(ws.title, {})
+
+            for row in ws.iter_rows(min_row=ws.min_row, min_col=ws.min_column):
+                for cell in row:
+                    if cell.data_type != "f" or not isinstance(cell.value, str):
+                        continue
+                    try:
+                        sheet_results[cell.coordinate] = evaluator.evaluate(cell.value, ws.title)
+                    except FormulaError as e:
+                        skipped += 1
+                        logger.debug(f"Not caching {ws.title}!{cell.coordinate}: {e}")
+
+        if skipped:
+            logger.info(f"Left {skipped} unsupported formulas uncached")
+
+        return results
+
+    def _evaluate_row(self, sheet_name: str, row: int, values: List) -> Dict[str, Any]:
+        """Evaluate the formulas of a streamed row against that row's values"""
+        row_cells = {f"{get_column_letter(col)}{row}": value for col, value in enumerate(values, start=1)}
+        evaluator = FormulaEvaluator(lambda sheet, coord: row_cells.get(coord))
+        results = {}
+
+        for coord, value in row_cells.items():
+            if isinstance(value, str) and value.startswith("="):
+                try:
+                    results[coord] = evaluator.evaluate(value, sheet_name)
+                except FormulaError as e:
+                    logger.debug(f"Not caching {sheet_name}!{coord}: {e}")
+
+        return results
+
+    def _register_named_styles(self, wb: Workbook):
+        """Add the shared TOC styles to a workbook (templates may already define them)"""
+        for style in _build_named_styles():
+            if style.name not in wb.named_styles:
+                wb.add_named_style(style)
+
+    def _drainage_area_values(self, area: Dict) -> List:
+        """Column A-F values for a drainage area row"""
+        return [
+            area.get("area_label", ""),
+            area.get("total_area_acres", 0),
+            area.get("impervious_area_acres", 0),
+            area.get("pervious_area_acres", 0),
+            area.get("weighted_c_value", 0),
+            area.get("impervious_percentage", 0),
+        ]
+
+    def _toc_values(self, area_label: str, data: Dict, row: int) -> List:
+        """Column A-H values for a TOC row"""
+        return [
+            area_label,
+            data.get("sheet_flow_length", 0),
+            data.get("shallow_flow_length", 0),
+            data.get("channel_flow_length", 0),
+            data.get("tc_sheet", 0),
+            data.get("tc_shallow", 0),
+            data.get("tc_channel", 0),
+            f"=SUM(E{row}:G{row})",  # Total Tc formula (sum of components)
+        ]
+
+    def _styled_row(self, ws, values: List, header: bool = False) -> List[WriteOnlyCell]:
+        """Build a write-only row with shared named styles"""
+        row = []
+        for col, value in enumerate(values, start=1):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = HEADER_STYLE if header else _data_style(col)
+            row.append(cell)
+        return row
+
+    def _stream_row(self, ws, cells: List[WriteOnlyCell], values: List):
+        """
+        Append one row, reusing pre-styled cells.
+
+        Write-only sheets serialize a row as soon as it is appended, so the
+        same styled cells can carry every row's values.
+        """
+        for cell, value in zip(cells, values):
+            cell.value = value
+        ws.append(cells)
+
     def _create_headers(self, ws):
         """Create header row for drainage area sheet"""
-        headers = [
-            "Drainage Area",
-            "Total Area (ac)",
-            "Impervious (ac)",
-            "Pervious (ac)",
-            "Weighted C",
-            "Impervious %"
-        ]
+        self._register_named_styles(ws.parent)
 
-        for col, header in enumerate(headers, start=1):
+        for col, header in enumerate(DRAINAGE_AREA_HEADERS, start=1):
             cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, size=11)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+            cell.style = HEADER_STYLE
 
         # Set column widths
         ws.column_dimensions['A'].width = 15
@@ -210,40 +486,28 @@ class TOCExcelUpdater:
 
     def _create_toc_headers(self, ws):
         """Create header row for TOC calculation sheet"""
-        headers = [
-            "Drainage Area",
-            "Sheet Flow (ft)",
-            "Shallow Flow (ft)",
-            "Channel Flow (ft)",
-            "Tc Sheet (min)",
-            "Tc Shallow (min)",
-            "Tc Channel (min)",
-            "Tc Total (min)"
-        ]
+        self._register_named_styles(ws.parent)
 
-        for col, header in enumerate(headers, start=1):
+        for col, header in enumerate(TOC_HEADERS, start=1):
             cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, size=11)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+            cell.style = HEADER_STYLE
 
         # Set column widths
         for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
             ws.column_dimensions[col].width = 15
 
     def _format_data_row(self, ws, row: int):
-        """Apply formatting to a data row"""
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        """
+        Apply formatting to a data row.
 
+        Sets border, alignment and number format on the existing cells
+        rather than a named style, which would also reset the font and fill
+        of a template's data rows.
+        """
         for col in range(1, 9):  # Columns A-H
             cell = ws.cell(row=row, column=col)
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            cell.border = THIN_BORDER
+            cell.alignment = CENTER_ALIGNMENT
 
             # Format numbers
             if col > 1:  # Numeric columns
@@ -253,26 +517,42 @@ class TOCExcelUpdater:
         """
         Read data from a sheet.
 
+        If no workbook has been loaded but a template path was given, the
+        file is streamed read-only instead of being loaded for editing.
+
         Args:
             sheet_name: Name of worksheet
 
         Returns:
             List of row dictionaries
         """
+        if not self.workbook and self.template_path and self.template_path.exists():
+            return list(TOCWorkbookReader(str(self.template_path)).iter_rows(sheet_name))
+
         if not self.workbook or sheet_name not in self.workbook.sheetnames:
             return []
 
         ws = self.workbook[sheet_name]
         data = []
+        evaluator = FormulaEvaluator.for_workbook(self.workbook)
 
         # Assuming row 1 is headers
         headers = [cell.value for cell in ws[1]]
 
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if all(cell is None for cell in row):
+        for row in ws.iter_rows(min_row=2):
+            if all(cell.value is None for cell in row):
                 continue  # Skip empty rows
 
-            row_dict = dict(zip(headers, row))
+            row_dict = dict(zip(headers, (self._cell_value(evaluator, ws.title, cell) for cell in row)))
             data.append(row_dict)
 
         return data
+
+    def _cell_value(self, evaluator: FormulaEvaluator, sheet_name: str, cell):
+        """Cell value, with formulas replaced by their result where supported"""
+        if cell.data_type != "f" or not isinstance(cell.value, str):
+            return cell.value
+        try:
+            return evaluator.evaluate(cell.value, sheet_name)
+        except FormulaError:
+            return cell.value
@@ -0,0 +1,574 @@
+"""
+Module A - Workbook Formula Evaluator
+Compute the formulas used by TOC templates and store their cached values
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import math
+import os
+import posixpath
+import tempfile
+import zipfile
+
+from lxml import etree
+from openpyxl.formula import Tokenizer
+from openpyxl.formula.tokenizer import Token
+from openpyxl.utils.cell import range_boundaries, get_column_letter, coordinate_to_tuple
+
+from ..rounding import round_half_up
+
+logger = logging.getLogger(__name__)
+
+SHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+class FormulaError(ValueError):
+    """Formula uses syntax or a function the evaluator doesn't support"""
+
+
+class _Range:
+    """Values of a cell range, row-major"""
+
+    def __init__(self, rows: List[List[Any]]):
+        self.rows = rows
+
+    def flat(self) -> List[Any]:
+        return [value for row in self.rows for value in row]
+
+    def scalar(self) -> Any:
+        if len(self.rows) == 1 and len(self.rows[0]) == 1:
+            return self.rows[0][0]
+        raise FormulaError("Range used where a single value is expected")
+
+
+def _numbers(args) -> List[float]:
+    """Numeric values of function arguments (text, blanks and booleans in ranges are ignored)"""
+    values = []
+    for arg in args:
+        items = arg.flat() if isinstance(arg, _Range) else [arg]
+        for item in items:
+            if isinstance(item, (int, float)) and not isinstance(item, bool):
+                values.append(item)
+    return values
+
+
+def _scalar(value) -> Any:
+    return value.scalar() if isinstance(value, _Range) else value
+
+
+def _number(value) -> float:
+    value = _scalar(value)
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise FormulaError(f"Expected a number, got {value!r}")
+
+
+def _excel_round(value, digits=0) -> float:
+    """Excel ROUND: half away from zero"""
+    return round_half_up(float(_number(value)), int(_number(digits)))
+
+
+def _lookup_equal(a, b) -> bool:
+    # A blank cell equals "" and 0, as in Excel
+    if a is None:
+        a = "" if isinstance(b, str) else 0 if b is not None else None
+    if b is None:
+        b = "" if isinstance(a, str) else 0 if a is not None else None
+    if isinstance(a, str) and isinstance(b, str):
+        return a.lower() == b.lower()
+    return a == b
+
+
+def _match_position(value, items: List[Any], match_type=1) -> int:
+    """0-based position for MATCH/VLOOKUP (exact, or largest value <= lookup)"""
+    value = _scalar(value)
+
+    if match_type == 0:
+        for i, item in enumerate(items):
+            if _lookup_equal(item, value):
+                return i
+        raise FormulaError(f"Lookup value {value!r} not found")
+
+    position = None
+    for i, item in enumerate(items):
+        if item is None or isinstance(item, str) != isinstance(value, str):
+            continue
+        if item <= value:
+            position = i
+        else:
+            break
+    if position is None:
+        raise FormulaError(f"Lookup value {value!r} not found")
+    return position
+
+
+def _vlookup(value, table, col, range_lookup=True):
+    if not isinstance(table, _Range):
+        raise FormulaError("VLOOKUP table must be a range")
+    match_type = 1 if _scalar(range_lookup) else 0
+    row = _match_position(value, [r[0] for r in table.rows], match_type)
+    return table.rows[row][int(_number(col)) - 1]
+
+
+def _index(table, row, col=None):
+    if not isinstance(table, _Range):
+        raise FormulaError("INDEX table must be a range")
+    row, col = int(_number(row)), int(_number(col)) if col is not None else None
+    if col is None:
+        # One-dimensional ranges index along their only axis
+        if len(table.rows) == 1:
+            return table.rows[0][row - 1]
+        col = 1
+    return table.rows[row - 1][col - 1]
+
+
+def _match(value, items, match_type=1):
+    if not isinstance(items, _Range):
+        raise FormulaError("MATCH lookup must be a range")
+    return _match_position(value, items.flat(), int(_number(match_type))) + 1
+
+
+def _sumproduct(*ranges):
+    arrays = [r.flat() if isinstance(r, _Range) else [r] for r in ranges]
+    if len({len(a) for a in arrays}) != 1:
+        raise FormulaError("SUMPRODUCT ranges must be the same size")
+    total = 0
+    for values in zip(*arrays):
+        product = 1
+        for item in values:
+            product *= item if isinstance(item, (int, float)) and not isinstance(item, bool) else 0
+        total += product
+    return total
+
+
+def _product(*args):
+    result = 1
+    for value in _numbers(args):
+        result *= value
+    return result
+
+
+def _average(*args):
+    values = _numbers(args)
+    if not values:
+        raise FormulaError("AVERAGE of no numbers")
+    return sum(values) / len(values)
+
+
+FUNCTIONS: Dict[str, Callable] = {
+    "SUM": lambda *args: sum(_numbers(args)),
+    "PRODUCT": _product,
+    "SUMPRODUCT": _sumproduct,
+    "MIN": lambda *args: min(_numbers(args), default=0),
+    "MAX": lambda *args: max(_numbers(args), default=0),
+    "AVERAGE": _average,
+    "ROUND": _excel_round,
+    "ABS": lambda value: abs(_number(value)),
+    "VLOOKUP": _vlookup,
+    "INDEX": _index,
+    "MATCH": _match,
+}
+
+BINARY_OPERATORS = {
+    "=": (1, lambda a, b: _lookup_equal(a, b)),
+    "<>": (1, lambda a, b: not _lookup_equal(a, b)),
+    "<": (1, lambda a, b: a < b),
+    ">": (1, lambda a, b: a > b),
+    "<=": (1, lambda a, b: a <= b),
+    ">=": (1, lambda a, b: a >= b),
+    "&": (2, lambda a, b: f"{'' if a is None else a}{'' if b is None else b}"),
+    "+": (3, lambda a, b: _number(a) + _number(b)),
+    "-": (3, lambda a, b: _number(a) - _number(b)),
+    "*": (4, lambda a, b: _number(a) * _number(b)),
+    "/": (4, lambda a, b: _divide(a, b)),
+    "^": (5, lambda a, b: _number(a) ** _number(b)),
+}
+
+
+def _divide(a, b):
+    if _number(b) == 0:
+        raise FormulaError("Division by zero")
+    return _number(a) / _number(b)
+
+
+def split_reference(reference: str, default_sheet: Optional[str]) -> Tuple[Optional[str], str]:
+    """Split "Sheet!A1:B2" / "'My Sheet'!A1" into (sheet, "A1:B2")"""
+    if "!" not in reference:
+        return default_sheet, reference.replace("$", "")
+    sheet, coord = reference.rsplit("!", 1)
+    if sheet.startswith("'") and sheet.endswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    return sheet, coord.replace("$", "")
+
+
+class FormulaEvaluator:
+    """
+    Evaluate the spreadsheet formulas used by TOC templates.
+
+    Supports numbers, text, cell and range references (including other
+    sheets), arithmetic (+ - * / ^ %), comparisons, & and the functions
+    SUM, PRODUCT, SUMPRODUCT, MIN, MAX, AVERAGE, ROUND, ABS, IF, VLOOKUP,
+    INDEX and MATCH. Anything else raises FormulaError so the caller can
+    leave that cell uncached.
+
+    Usage:
+        evaluator = FormulaEvaluator.for_workbook(workbook)
+        tc_total = evaluator.evaluate("=SUM(E2:G2)", sheet="TOC Calculations")
+    """
+
+    def __init__(self, get_value: Callable[[Optional[str], str], Any]):
+        """
+        Initialize evaluator.
+
+        Args:
+            get_value: Callable (sheet, coordinate) -> cell value
+        """
+        self.get_value = get_value
+
+    @classmethod
+    def for_workbook(cls, workbook) -> "FormulaEvaluator":
+        """
+        Evaluator over an in-memory openpyxl workbook.
+
+        Referenced cells that hold formulas are evaluated recursively and
+        memoized; circular references raise FormulaError.
+        """
+        memo: Dict[Tuple[str, str], Any] = {}
+        in_progress = set()
+        used_ranges: Dict[str, Tuple[int, int]] = {}
+        evaluator = cls(lambda sheet, coord: None)
+
+        def get_value(sheet: Optional[str], coord: str):
+            if sheet is None or sheet not in workbook.sheetnames:
+                raise FormulaError(f"Unknown sheet: {sheet}")
+
+            key = (sheet, coord)
+            if key in memo:
+                return memo[key]
+
+            # Cells outside the used range are blank - ws.cell would add them
+            ws = workbook[sheet]
+            if sheet not in used_ranges:
+                used_ranges[sheet] = (ws.max_row, ws.max_column)
+            max_row, max_col = used_ranges[sheet]
+
+            row, col = coordinate_to_tuple(coord)
+            value = ws.cell(row=row, column=col).value if row <= max_row and col <= max_col else None
+            if isinstance(value, str) and value.startswith("="):
+                if key in in_progress:
+                    raise FormulaError(f"Circular reference at {sheet}!{coord}")
+                in_progress.add(key)
+                try:
+                    value = evaluator.evaluate(value, sheet)
+                finally:
+                    in_progress.discard(key)
+
+            memo[key] = value
+            return value
+
+        evaluator.get_value = get_value
+        return evaluator
+
+    def evaluate(self, formula: str, sheet: Optional[str] = None) -> Any:
+        """
+        Evaluate a formula.
+
+        Args:
+            formula: Formula text, with or without the leading "="
+            sheet: Sheet that unqualified references point to
+
+        Returns:
+            Computed value (number, text or boolean)
+
+        Raises:
+            FormulaError: If the formula can't be evaluated
+        """
+        if not formula.startswith("="):
+            formula = "=" + formula
+
+        try:
+            tokens = [t for t in Tokenizer(formula).items if t.type != Token.WSPACE]
+        except Exception as e:
+            raise FormulaError(f"Cannot parse formula {formula}: {e}")
+
+        # Referenced formula cells are evaluated re-entrantly - keep the caller's state
+        saved_state = getattr(self, "_tokens", None), getattr(self, "_pos", 0), getattr(self, "_sheet", None)
+        self._tokens, self._pos, self._sheet = tokens, 0, sheet
+
+        try:
+            value = self._expression(0)
+
+            if self._pos != len(tokens):
+                raise FormulaError(f"Unexpected token in {formula}: {tokens[self._pos].value}")
+
+            value = _scalar(value)
+
+            # Excel's #NUM!: negative base to a fractional power, overflow
+            if isinstance(value, complex) or (isinstance(value, (int, float)) and not math.isfinite(value)):
+                raise FormulaError(f"Cannot evaluate {formula}: result {value!r} is not a real number")
+
+            return value
+        except FormulaError:
+            raise
+        except (TypeError, ValueError, IndexError, ZeroDivisionError, OverflowError) as e:
+            raise FormulaError(f"Cannot evaluate {formula}: {e}")
+        finally:
+            self._tokens, self._pos, self._sheet = saved_state
+
+    # -- recursive descent over openpyxl tokens --------------------------------
+
+    def _peek(self) -> Optional[Token]:
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else None
+
+    def _next(self) -> Token:
+        token = self._peek()
+        if token is None:
+            raise FormulaError("Unexpected end of formula")
+        self._pos += 1
+        return token
+
+    def _expression(self, min_precedence: int):
+        left = self._unary()
+
+        while True:
+            token = self._peek()
+            if token is None or token.type != Token.OP_IN or token.value not in BINARY_OPERATORS:
+                return left
+
+            precedence, operator = BINARY_OPERATORS[token.value]
+            if precedence < min_precedence:
+                return left
+
+            self._next()
+            # ^ is left-associative in Excel, like the others
+            right = self._expression(precedence + 1)
+            left = operator(_scalar(left), _scalar(right))
+
+    def _unary(self):
+        token = self._peek()
+        if token is not None and token.type == Token.OP_PRE:
+            self._next()
+            value = self._unary()
+            return -_number(value) if token.value == "-" else _number(value)
+
+        value = self._primary()
+
+        while self._peek() is not None and self._peek().type == Token.OP_POST:
+            self._next()
+            value = _number(value) / 100
+
+        return value
+
+    def _primary(self):
+        token = self._next()
+
+        if token.type == Token.OPERAND:
+            if token.subtype == Token.NUMBER:
+                number = float(token.value)
+                return int(number) if number.is_integer() and "." not in token.value else number
+            if token.subtype == Token.TEXT:
+                return token.value[1:-1].replace('""', '"')
+            if token.subtype == Token.LOGICAL:
+                return token.value.upper() == "TRUE"
+            if token.subtype == Token.RANGE:
+                return self._reference(token.value)
+            raise FormulaError(f"Unsupported operand: {token.value}")
+
+        if token.type == Token.PAREN and token.subtype == Token.OPEN:
+            value = self._expression(0)
+            closing = self._next()
+            if closing.type != Token.PAREN:
+                raise FormulaError("Unbalanced parentheses")
+            return value
+
+        if token.type == Token.FUNC and token.subtype == Token.OPEN:
+            name = token.value[:-1].upper()
+            if name == "IF":
+                return self._if()
+
+            function = FUNCTIONS.get(name)
+            if function is None:
+                raise FormulaError(f"Unsupported function: {name}")
+
+            args = []
+            following = self._peek()
+            if following is None or not (following.type == Token.FUNC and following.subtype == Token.CLOSE):
+                while True:
+                    args.append(self._expression(0))
+                    separator = self._next()
+                    if separator.type == Token.FUNC and separator.subtype == Token.CLOSE:
+                        break
+                    if separator.type != Token.SEP or separator.subtype != Token.ARG:
+                        raise FormulaError(f"Unexpected token: {separator.value}")
+            else:
+                self._next()
+
+            return function(*args)
+
+        raise FormulaError(f"Unexpected token: {token.value}")
+
+    def _if(self):
+        """
+        IF(condition, [if_true], [if_false]), evaluating only the chosen branch.
+
+        The other branch is skipped token by token, so =IF(B2=0,0,A2/B2)
+        does not divide by zero.
+        """
+        condition = _scalar(self._expression(0))
+        branches = [True, False]  # Excel defaults for omitted branches
+
+        for index in range(2):
+            separator = self._next()
+            if separator.type == Token.FUNC and separator.subtype == Token.CLOSE:
+                break
+            if separator.type != Token.SEP or separator.subtype != Token.ARG:
+                raise FormulaError(f"Unexpected token: {separator.value}")
+
+            if bool(condition) == (index == 0):
+                branches[index] = self._expression(0)
+            else:
+                self._skip_argument()
+        else:
+            closing = self._next()
+            if closing.type != Token.FUNC or closing.subtype != Token.CLOSE:
+                raise FormulaError("IF takes at most three arguments")
+
+        return branches[0] if condition else branches[1]
+
+    def _skip_argument(self):
+        """Advance past one function argument without evaluating it"""
+        depth = 0
+        while True:
+            token = self._peek()
+            if token is None:
+                raise FormulaError("Unexpected end of formula")
+            if depth == 0 and (
+                (token.type == Token.SEP and token.subtype == Token.ARG)
+                or (token.type == Token.FUNC and token.subtype == Token.CLOSE)
+            ):
+                return
+            if token.subtype == Token.OPEN:
+                depth += 1
+            elif token.subtype == Token.CLOSE:
+                depth -= 1
+            self._pos += 1
+
+    def _reference(self, reference: str):
+        sheet, coord = split_reference(reference, self._sheet)
+
+        try:
+            min_col, min_row, max_col, max_row = range_boundaries(coord)
+        except ValueError:
+            raise FormulaError(f"Unsupported reference: {reference}")
+
+        if min_row is None or max_row is None or min_col is None or max_col is None:
+            raise FormulaError(f"Whole row/column references are not supported: {reference}")
+
+        if (min_col, min_row) == (max_col, max_row):
+            return self.get_value(sheet, f"{get_column_letter(min_col)}{min_row}")
+
+        return _Range([
+            [self.get_value(sheet, f"{get_column_letter(col)}{row}") for col in range(min_col, max_col + 1)]
+            for row in range(min_row, max_row + 1)
+        ])
+
+
+def _sheet_parts(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """Map sheet title -> worksheet part name inside the .xlsx"""
+    workbook = etree.fromstring(archive.read("xl/workbook.xml"))
+    rels = etree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+
+    targets = {}
+    for rel in rels.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        target = rel.get("Target")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join("xl", target))
+        targets[rel.get("Id")] = target
+
+    return {
+        sheet.get("name"): targets[sheet.get(f"{{{REL_NS}}}id")]
+        for sheet in workbook.iter(f"{{{SHEET_NS}}}sheet")
+        if sheet.get(f"{{{REL_NS}}}id") in targets
+    }
+
+
+def write_cached_values(xlsx_path: str, cached_values: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Store computed values next to formulas in a saved workbook.
+
+    openpyxl writes formulas without results, so data_only readers see
+    None. This fills each formula cell's <v> element in place.
+
+    Args:
+        xlsx_path: Saved .xlsx workbook
+        cached_values: {sheet title: {coordinate: value}}
+
+    Returns:
+        Number of cells updated
+    """
+    xlsx_path = Path(xlsx_path)
+    cached_values = {sheet: values for sheet, values in cached_values.items() if values}
+    if not cached_values:
+        return 0
+
+    updated = 0
+    fd, tmp_name = tempfile.mkstemp(suffix=".xlsx", dir=xlsx_path.parent)
+    os.close(fd)
+
+    try:
+        with zipfile.ZipFile(xlsx_path) as source, \
+                zipfile.ZipFile(tmp_name, "w", zipfile.ZIP_DEFLATED) as target:
+            parts = _sheet_parts(source)
+            patched = {parts[sheet]: values for sheet, values in cached_values.items() if sheet in parts}
+
+            for item in source.infolist():
+                data = source.read(item.filename)
+
+                values = patched.get(item.filename)
+                if values:
+                    root = etree.fromstring(data)
+                    for cell in root.iter(f"{{{SHEET_NS}}}c"):
+                        coord = cell.get("r")
+                        if coord not in values or cell.find(f"{{{SHEET_NS}}}f") is None:
+                            continue
+                        _set_cell_value(cell, values[coord])
+                        updated += 1
+                    data = etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+                target.writestr(item, data)
+
+        os.replace(tmp_name, xlsx_path)
+    finally:
+        Path(tmp_name).unlink(missing_ok=True)
+
+    logger.debug(f"Cached {updated} formula values in {xlsx_path.name}")
+    return updated
+
+
+def _set_cell_value(cell, value):
+    """Write a cached result into a formula <c> element"""
+    v = cell.find(f"{{{SHEET_NS}}}v")
+    if v is None:
+        v = etree.SubElement(cell, f"{{{SHEET_NS}}}v")
+
+    if isinstance(value, bool):
+        cell.set("t", "b")
+        v.text = "1" if value else "0"
+    elif isinstance(value, (int, float)):
+        cell.attrib.pop("t", None)
+        v.text = repr(float(value)) if isinstance(value, float) else str(value)
+    else:
+        cell.set("t", "str")
+        v.text = "" if value is None else str(value)
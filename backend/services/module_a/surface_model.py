@@ -0,0 +1,515 @@
+"""
+Module A - Surface Model
+Triangulate survey points into a TIN, rasterize it to a DEM and trace flow paths
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import logging
+import math
+import os
+import uuid
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+
+from ..disk_cache import DiskCache
+from .csv_parser import SurveyPointArray
+from .watershed import D8_OFFSETS, D8_DISTANCES, FLAT_SLOPE, Basin, FlowRouter, shifted_slices
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FlowPath:
+    """Steepest-descent flow path from the hydraulically most distant point"""
+    coordinates: np.ndarray  # (n, 3) easting, northing, elevation - upstream to downstream
+    length_ft: float
+    elevation_change_ft: float
+
+    @property
+    def slope(self) -> float:
+        """Average slope (ft/ft)"""
+        return self.elevation_change_ft / self.length_ft if self.length_ft > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "flow_length_ft": round(self.length_ft, 2),
+            "elevation_change_ft": round(self.elevation_change_ft, 2),
+            "slope_percent": round(self.slope * 100, 3),
+            "start": self.coordinates[0].tolist(),
+            "end": self.coordinates[-1].tolist(),
+        }
+
+
+class TINCache(DiskCache):
+    """
+    Cache of triangulations keyed by the SHA-256 of the point coordinates.
+
+    Triangulating is the expensive step for large surveys, so triangles are
+    kept in memory (LRU) and, with a cache_dir, persisted as .npy files.
+    Persisted entries are evicted least recently used first once they
+    exceed max_bytes.
+    """
+
+    ENTRY_SUFFIXES = (".tin.npy",)
+
+    LABEL = "triangulation cache"
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 8, max_bytes: Optional[int] = None):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory for persisted triangulations (optional)
+            max_entries: Triangulations kept in memory
+            max_bytes: Size limit of the persisted triangulations (default: DEFAULT_MAX_BYTES)
+        """
+        super().__init__(cache_dir or "", max_bytes)
+        if not cache_dir:
+            self.cache_dir = None  # memory only
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    @staticmethod
+    def key_for(x: np.ndarray, y: np.ndarray) -> str:
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(x, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        if self.cache_dir is not None:
+            path = self.cache_dir / f"{key}.tin.npy"
+            if path.exists():
+                try:
+                    triangles = np.load(path)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Discarding unreadable triangulation {key[:12]}: {e}")
+                    self.remove(key)
+                    return None
+                self.touch(key)
+                self._remember(key, triangles)
+                return triangles
+
+        return None
+
+    def put(self, key: str, triangles: np.ndarray):
+        self._remember(key, triangles)
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_dir / f"{key}.{uuid.uuid4().hex}.tmp.npy"
+            np.save(tmp_path, triangles)
+            os.replace(tmp_path, self.cache_dir / f"{key}.tin.npy")
+            self.evict()
+
+    def _remember(self, key: str, triangles: np.ndarray):
+        self.entries[key] = triangles
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class DEMGrid:
+    """
+    Regular elevation grid rasterized from a TIN.
+
+    Row 0 is the southern edge; cell (r, c) is centred on
+    (x0 + (c + 0.5) * cell_size, y0 + (r + 0.5) * cell_size).
+    Cells outside the triangulated area are NaN.
+    """
+
+    def __init__(self, elevation: np.ndarray, x0: float, y0: float, cell_size: float):
+        self.elevation = elevation
+        self.x0 = x0
+        self.y0 = y0
+        self.cell_size = cell_size
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.elevation.shape
+
+    def cell_centers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(x, y) arrays of cell centres, shaped like the grid"""
+        rows, cols = self.shape
+        x = self.x0 + (np.arange(cols) + 0.5) * self.cell_size
+        y = self.y0 + (np.arange(rows) + 0.5) * self.cell_size
+        return np.meshgrid(x, y)
+
+    def mask_polygon(self, polygon: Polygon) -> np.ndarray:
+        """Boolean grid of cells inside a polygon with a valid elevation"""
+        x, y = self.cell_centers()
+        return shapely.contains_xy(polygon, x, y) & ~np.isnan(self.elevation)
+
+    def steepest_descent(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        D8 receiver of every cell (flat index); pits and outlets receive themselves.
+
+        Args:
+            mask: Cells that take part (default: all valid cells)
+        """
+        z = self.elevation
+        rows, cols = self.shape
+        if mask is None:
+            mask = ~np.isnan(z)
+
+        grid_index = np.arange(rows * cols).reshape(rows, cols)
+        receivers = grid_index.copy()
+        best_slope = np.full((rows, cols), FLAT_SLOPE)
+
+        for (dr, dc), distance in zip(D8_OFFSETS, D8_DISTANCES):
+            source, neighbour = shifted_slices(rows, cols, dr, dc)
+
+            with np.errstate(invalid="ignore"):
+                slope = (z[source] - z[neighbour]) / (distance * self.cell_size)
+
+            better = mask[source] & mask[neighbour] & (slope > best_slope[source])
+            best_slope[source] = np.where(better, slope, best_slope[source])
+            receivers[source] = np.where(better, grid_index[neighbour], receivers[source])
+
+        return receivers.ravel()
+
+    def downstream_lengths(self, receivers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Flow length from every cell to the end of its path.
+
+        Uses pointer jumping, so it runs in O(n log n) array operations
+        instead of walking each path.
+
+        Returns:
+            (lengths, terminals): distance along the flow path and the flat
+            index of the pit/outlet each cell drains to
+        """
+        cols = self.shape[1]
+        index = np.arange(receivers.size)
+
+        dr = receivers // cols - index // cols
+        dc = receivers % cols - index % cols
+        lengths = np.hypot(dr, dc) * self.cell_size
+
+        pointer = receivers.copy()
+        while True:
+            next_pointer = pointer[pointer]
+            if np.array_equal(next_pointer, pointer):
+                break
+            lengths = lengths + lengths[pointer]
+            pointer = next_pointer
+
+        return lengths, pointer
+
+
+class SurfaceModel:
+    """
+    Terrain model built from survey points.
+
+    Points are triangulated into a Delaunay TIN (GEOS, through
+    shapely.delaunay_triangles), which can be rasterized to a DEMGrid with
+    vectorized barycentric interpolation. flow_path() traces the
+    steepest-descent (D8) path from a basin's hydraulically most distant
+    point, giving the flow length and elevation drop for Tc calculations.
+
+    Usage:
+        surface = SurfaceModel.from_survey(parser.parse(), cache=TINCache())
+        path = surface.flow_path(basin_coordinates)
+        tc = TimeOfConcentration.kirpich_method(path.length_ft, path.elevation_change_ft)
+    """
+
+    # Pairs of (triangle, candidate cell) evaluated per rasterization chunk
+    RASTER_CHUNK = 2_000_000
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: np.ndarray):
+        """
+        Initialize model.
+
+        Args:
+            x: Easting of each vertex
+            y: Northing of each vertex
+            z: Elevation of each vertex
+            triangles: (n, 3) vertex indices
+        """
+        self.x = x
+        self.y = y
+        self.z = z
+        self.triangles = triangles
+        self._dem_cache: Dict[float, DEMGrid] = {}
+
+    @classmethod
+    def from_survey(cls, points: SurveyPointArray, cache: Optional[TINCache] = None) -> "SurfaceModel":
+        """Build from parsed survey points"""
+        return cls.from_points(points.easting, points.northing, points.elevation, cache=cache)
+
+    @classmethod
+    def from_points(
+        cls,
+        x,
+        y,
+        z,
+        cache: Optional[TINCache] = None
+    ) -> "SurfaceModel":
+        """
+        Triangulate points.
+
+        Points with duplicate (x, y) keep the first elevation; points with
+        missing coordinates are dropped.
+
+        Args:
+            x: Easting values
+            y: Northing values
+            z: Elevation values
+            cache: Triangulation cache (optional)
+
+        Raises:
+            ValueError: If fewer than 3 usable, non-collinear points
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        z = np.asarray(z, dtype=np.float64)
+
+        valid = np.isfinite(x) & np.isfinite(y) & np.isfinite(z)
+        keys, first = np.unique(x[valid] + 1j * y[valid], return_index=True)
+        x, y, z = keys.real.copy(), keys.imag.copy(), z[valid][first]
+
+        if len(x) < 3:
+            raise ValueError("At least 3 survey points are needed to build a surface")
+
+        cache_key = TINCache.key_for(x, y) if cache is not None else None
+        triangles = cache.get(cache_key) if cache is not None else None
+
+        if triangles is None:
+            triangles = cls._triangulate(x, y, keys)
+            if cache is not None:
+                cache.put(cache_key, triangles)
+        else:
+            logger.debug(f"TIN cache hit: {cache_key[:12]} ({len(triangles)} triangles)")
+
+        return cls(x, y, z, triangles)
+
+    @staticmethod
+    def _triangulate(x: np.ndarray, y: np.ndarray, sorted_keys: np.ndarray) -> np.ndarray:
+        """Delaunay triangles as vertex indices (vertices sorted by x + iy)"""
+        collection = shapely.delaunay_triangles(shapely.multipoints(np.column_stack([x, y])))
+        count = shapely.get_num_geometries(collection)
+        if count == 0:
+            raise ValueError("Survey points are collinear - cannot build a surface")
+
+        # Triangle rings come back as 4 coordinates (closed); map them to vertex indices
+        corners = shapely.get_coordinates(collection).reshape(count, 4, 2)[:, :3]
+        corner_keys = corners[..., 0] + 1j * corners[..., 1]
+
+        # Search on easting alone (fast float search); only corners sharing an
+        # easting with another vertex need the slower lexicographic search
+        last = len(sorted_keys) - 1
+        triangles = np.minimum(np.searchsorted(x, corners[..., 0]), last)
+        ties = sorted_keys[triangles] != corner_keys
+        triangles[ties] = np.minimum(np.searchsorted(sorted_keys, corner_keys[ties]), last)
+        if not np.array_equal(sorted_keys[triangles], corner_keys):
+            raise ValueError("Triangulation returned coordinates not in the survey")
+
+        logger.info(f"Triangulated {len(x)} points into {count} triangles")
+        return triangles.astype(np.int32)
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        return float(self.x.min()), float(self.y.min()), float(self.x.max()), float(self.y.max())
+
+    def default_cell_size(self) -> float:
+        """Cell size matching the average point spacing"""
+        minx, miny, maxx, maxy = self.bounds
+        return max(math.sqrt((maxx - minx) * (maxy - miny) / len(self.x)), 1e-6)
+
+    def rasterize(self, cell_size: Optional[float] = None) -> DEMGrid:
+        """
+        Rasterize the TIN to a regular grid.
+
+        Each triangle is paired with the grid cells in its bounding box and
+        cell centres are interpolated with barycentric weights, all as array
+        operations. Results are cached per cell size.
+
+        Args:
+            cell_size: Grid spacing in survey units (default: average point spacing)
+
+        Returns:
+            DEMGrid covering the survey extent
+        """
+        cell_size = float(cell_size or self.default_cell_size())
+        if cell_size in self._dem_cache:
+            return self._dem_cache[cell_size]
+
+        minx, miny, maxx, maxy = self.bounds
+        cols = max(1, int(math.ceil((maxx - minx) / cell_size)))
+        rows = max(1, int(math.ceil((maxy - miny) / cell_size)))
+        elevation = np.full((rows, cols), np.nan)
+
+        tx, ty, tz = self.x[self.triangles], self.y[self.triangles], self.z[self.triangles]
+
+        # Cell index ranges whose centres fall inside each triangle's bounding box
+        c0 = np.ceil((tx.min(axis=1) - minx) / cell_size - 0.5).astype(np.int64).clip(0, cols - 1)
+        c1 = np.floor((tx.max(axis=1) - minx) / cell_size - 0.5).astype(np.int64).clip(-1, cols - 1)
+        r0 = np.ceil((ty.min(axis=1) - miny) / cell_size - 0.5).astype(np.int64).clip(0, rows - 1)
+        r1 = np.floor((ty.max(axis=1) - miny) / cell_size - 0.5).astype(np.int64).clip(-1, rows - 1)
+        widths = np.maximum(c1 - c0 + 1, 0)
+        counts = widths * np.maximum(r1 - r0 + 1, 0)
+
+        # Barycentric denominators; degenerate (zero-area) triangles are skipped
+        det = (ty[:, 1] - ty[:, 2]) * (tx[:, 0] - tx[:, 2]) + (tx[:, 2] - tx[:, 1]) * (ty[:, 0] - ty[:, 2])
+        counts[det == 0] = 0
+
+        # Split triangles into slices of roughly RASTER_CHUNK candidate cells
+        cumulative = np.cumsum(counts)
+        splits = np.searchsorted(
+            cumulative, np.arange(self.RASTER_CHUNK, cumulative[-1], self.RASTER_CHUNK), side="right"
+        )
+        edges = np.unique(np.concatenate([[0], splits, [len(counts)]]))
+
+        for start, end in zip(edges[:-1], edges[1:]):
+            self._rasterize_chunk(
+                elevation, slice(int(start), int(end)), tx, ty, tz, det, c0, r0, widths, counts, minx, miny, cell_size
+            )
+
+        dem = DEMGrid(elevation, minx, miny, cell_size)
+        self._dem_cache[cell_size] = dem
+
+        logger.info(f"Rasterized TIN to {rows}x{cols} grid ({cell_size:.2f} ft cells)")
+        return dem
+
+    @staticmethod
+    def _rasterize_chunk(elevation, chunk, tx, ty, tz, det, c0, r0, widths, counts, minx, miny, cell_size):
+        """Interpolate the candidate cells of one slice of triangles"""
+        chunk_counts = counts[chunk]
+        total = int(chunk_counts.sum())
+        if total == 0:
+            return
+
+        tri = np.repeat(np.arange(chunk.start, chunk.stop), chunk_counts)
+        offsets = np.cumsum(chunk_counts) - chunk_counts
+        local = np.arange(total) - np.repeat(offsets, chunk_counts)
+        col = c0[tri] + local % widths[tri]
+        row = r0[tri] + local // widths[tri]
+
+        px = minx + (col + 0.5) * cell_size
+        py = miny + (row + 0.5) * cell_size
+
+        x0, x1, x2 = tx[tri, 0], tx[tri, 1], tx[tri, 2]
+        y0, y1, y2 = ty[tri, 0], ty[tri, 1], ty[tri, 2]
+        d = det[tri]
+
+        l0 = ((y1 - y2) * (px - x2) + (x2 - x1) * (py - y2)) / d
+        l1 = ((y2 - y0) * (px - x2) + (x0 - x2) * (py - y2)) / d
+        l2 = 1.0 - l0 - l1
+
+        eps = -1e-9
+        inside = (l0 >= eps) & (l1 >= eps) & (l2 >= eps)
+
+        z = l0 * tz[tri, 0] + l1 * tz[tri, 1] + l2 * tz[tri, 2]
+        elevation[row[inside], col[inside]] = z[inside]
+
+    def flow_path(self, polygon, cell_size: Optional[float] = None) -> FlowPath:
+        """
+        Trace the longest steepest-descent flow path in a basin.
+
+        Every cell in the basin is routed downhill (D8) to the cell it drains
+        to, with depressions routed out over their spill point (FlowRouter).
+        The basin outlet is the drain point collecting the most cells, and
+        the path starts at the cell whose flow distance to that outlet is
+        longest - the hydraulically most distant point.
+
+        Args:
+            polygon: Basin boundary as Polygon or list of (x, y) coordinates
+            cell_size: Grid spacing (default: average point spacing)
+
+        Returns:
+            FlowPath with length and elevation drop
+
+        Raises:
+            ValueError: If the basin doesn't overlap the surveyed surface
+        """
+        if not isinstance(polygon, Polygon):
+            polygon = Polygon(polygon)
+
+        dem = self.rasterize(cell_size)
+        sub, mask = self._clip(dem, polygon)
+
+        if mask.sum() < 2:
+            raise ValueError("Basin does not overlap the surveyed surface")
+
+        receivers = FlowRouter(sub, mask).receivers
+        lengths, terminals = sub.downstream_lengths(receivers)
+
+        # Main outlet = terminal draining the most basin cells
+        inside = np.flatnonzero(mask.ravel())
+        outlets, drained = np.unique(terminals[inside], return_counts=True)
+        outlet = outlets[np.argmax(drained)]
+
+        candidates = inside[terminals[inside] == outlet]
+        start = candidates[np.argmax(lengths[candidates])]
+
+        path = [start]
+        while receivers[path[-1]] != path[-1]:
+            path.append(receivers[path[-1]])
+        path = np.array(path)
+
+        cols = sub.shape[1]
+        x = sub.x0 + (path % cols + 0.5) * sub.cell_size
+        y = sub.y0 + (path // cols + 0.5) * sub.cell_size
+        z = sub.elevation.ravel()[path]
+
+        return FlowPath(
+            coordinates=np.column_stack([x, y, z]),
+            length_ft=float(lengths[start]),
+            elevation_change_ft=float(z[0] - z[-1]),
+        )
+
+    @staticmethod
+    def _clip(dem: DEMGrid, polygon: Polygon) -> Tuple[DEMGrid, np.ndarray]:
+        """Sub-grid covering a polygon's bounding box, and the in-basin mask"""
+        minx, miny, maxx, maxy = polygon.bounds
+        rows, cols = dem.shape
+
+        c0 = int(np.clip(math.floor((minx - dem.x0) / dem.cell_size), 0, cols))
+        c1 = int(np.clip(math.ceil((maxx - dem.x0) / dem.cell_size), 0, cols))
+        r0 = int(np.clip(math.floor((miny - dem.y0) / dem.cell_size), 0, rows))
+        r1 = int(np.clip(math.ceil((maxy - dem.y0) / dem.cell_size), 0, rows))
+
+        sub = DEMGrid(
+            dem.elevation[r0:r1, c0:c1],
+            dem.x0 + c0 * dem.cell_size,
+            dem.y0 + r0 * dem.cell_size,
+            dem.cell_size,
+        )
+        return sub, sub.mask_polygon(polygon)
+
+    def flow_paths(self, polygons: List, cell_size: Optional[float] = None) -> List[FlowPath]:
+        """Trace flow paths for many basins over one shared DEM"""
+        return [self.flow_path(polygon, cell_size) for polygon in polygons]
+
+    def flow_router(self, cell_size: Optional[float] = None) -> FlowRouter:
+        """Depression-aware flow routing over the rasterized surface"""
+        return FlowRouter(self.rasterize(cell_size))
+
+    def delineate_basins(
+        self,
+        pour_points: Optional[List[Tuple[float, float]]] = None,
+        cell_size: Optional[float] = None,
+        snap_distance: Optional[float] = None,
+        min_area_acres: float = 0.0
+    ) -> List[Basin]:
+        """
+        Delineate drainage basins from the survey surface.
+
+        Args:
+            pour_points: (easting, northing) outlets (default: every outlet on the survey edge)
+            cell_size: Grid spacing (default: average point spacing)
+            snap_distance: Pour point snap radius (default: 2 cells)
+            min_area_acres: Minimum basin area to keep
+
+        Returns:
+            Basins whose coordinates feed AreaCalculator.calculate_split_areas
+        """
+        return self.flow_router(cell_size).basins(pour_points, snap_distance, min_area_acres)
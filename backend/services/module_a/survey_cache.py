@@ -0,0 +1,195 @@
+"""
+Module A - Parsed Survey Cache
+Content-addressed on-disk cache of parsed survey points
+"""
+import numpy as np
+from typing import Dict, List, Optional
+from pathlib import Path
+import json
+import logging
+import os
+import uuid
+
+from ..disk_cache import DiskCache
+from .csv_parser import SurveyPointArray
+
+logger = logging.getLogger(__name__)
+
+
+class SurveyCacheWriter:
+    """
+    Incrementally writes one cache entry from batches of points.
+
+    Batches are spilled to disk as they arrive and merged into the final
+    memory-mapped .npy on commit, so an entry can be built from a streamed
+    survey without holding all points in memory.
+    """
+
+    def __init__(self, cache: "SurveyCache", key: str):
+        self.cache = cache
+        self.key = key
+        self.token = uuid.uuid4().hex
+        self.parts: List[Path] = []
+        self.part_categories: List[List[str]] = []
+        self.total_points = 0
+        self.name_length = 1
+
+    def append(self, points: SurveyPointArray):
+        """Spill a batch of points to a temporary part file"""
+        self.cache.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        part_path = self.cache.cache_dir / f"{self.key}.{self.token}.part{len(self.parts)}.npy"
+        np.save(part_path, points.data)
+
+        self.parts.append(part_path)
+        self.part_categories.append(list(points.code_categories))
+        self.total_points += len(points)
+        self.name_length = max(self.name_length, points.data.dtype["point_name"].itemsize // 4)
+
+    def commit(self):
+        """Merge the parts into the final cache entry and apply LRU eviction"""
+        try:
+            self.cache.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # Point codes differ per batch - remap each batch onto one category list
+            categories: List[str] = []
+            category_index: Dict[str, int] = {}
+            for part_categories in self.part_categories:
+                for category in part_categories:
+                    if category not in category_index:
+                        category_index[category] = len(categories)
+                        categories.append(category)
+
+            tmp_data = self.cache.cache_dir / f"{self.key}.{self.token}.tmp.npy"
+            merged = np.lib.format.open_memmap(
+                tmp_data,
+                mode="w+",
+                dtype=SurveyPointArray.record_dtype(self.name_length),
+                shape=(self.total_points,),
+            )
+
+            offset = 0
+            for part_path, part_categories in zip(self.parts, self.part_categories):
+                part = np.load(part_path)
+                target = merged[offset:offset + len(part)]
+
+                for field in ("point_name", "northing", "easting", "elevation"):
+                    target[field] = part[field]
+
+                # Trailing -1 keeps missing codes (-1) missing after the remap
+                code_map = np.array([category_index[c] for c in part_categories] + [-1], dtype=np.int32)
+                target["point_code"] = code_map[part["point_code"]]
+
+                offset += len(part)
+
+            merged.flush()
+            del merged
+
+            tmp_codes = self.cache.cache_dir / f"{self.key}.{self.token}.tmp.json"
+            tmp_codes.write_text(json.dumps(categories))
+
+            os.replace(tmp_codes, self.cache.codes_path(self.key))
+            os.replace(tmp_data, self.cache.data_path(self.key))
+
+            logger.info(f"Cached {self.total_points} survey points: {self.key[:12]}")
+        finally:
+            self.abort()
+
+        self.cache.evict()
+
+    def abort(self):
+        """Remove any temporary files"""
+        for part_path in self.parts:
+            part_path.unlink(missing_ok=True)
+        self.parts = []
+
+        for tmp_path in self.cache.cache_dir.glob(f"{self.key}.{self.token}.tmp.*"):
+            tmp_path.unlink(missing_ok=True)
+
+
+class SurveyCache(DiskCache):
+    """
+    On-disk cache of parsed surveys keyed by the SHA-256 of the CSV bytes.
+
+    Each entry is a NumPy structured array (.npy) plus its point-code list
+    (.codes.json). Hits are memory-mapped copy-on-write, so loading is
+    near-instant regardless of survey size. Entries are evicted least
+    recently used first once the cache exceeds max_bytes.
+
+    Usage:
+        cache = SurveyCache("/app/cache/surveys")
+        parser = SurveyCSVParser("survey.csv", cache=cache)
+        points = parser.parse()  # second parse of the same bytes is a cache hit
+    """
+
+    # Bump when the record layout changes so old entries are ignored
+    FORMAT_VERSION = 1
+
+    DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+
+    ENTRY_SUFFIXES = (".npy", ".codes.json")
+
+    LABEL = "survey cache"
+
+    def key_for(self, file_path: str) -> str:
+        """
+        Compute the cache key for a file.
+
+        Args:
+            file_path: Path to survey CSV
+
+        Returns:
+            SHA-256 hex digest of the file bytes, tagged with the format version
+        """
+        return f"{self.file_digest(file_path)}-v{self.FORMAT_VERSION}"
+
+    def data_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def codes_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.codes.json"
+
+    def get(self, key: str) -> Optional[SurveyPointArray]:
+        """
+        Load a cached survey.
+
+        Args:
+            key: Cache key from key_for()
+
+        Returns:
+            Memory-mapped SurveyPointArray, or None on a miss
+        """
+        data_path = self.data_path(key)
+        codes_path = self.codes_path(key)
+
+        if not (data_path.exists() and codes_path.exists()):
+            return None
+
+        try:
+            data = np.load(data_path, mmap_mode="c")
+            categories = json.loads(codes_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable survey cache entry {key[:12]}: {e}")
+            self.remove(key)
+            return None
+
+        self.touch(key)
+
+        logger.debug(f"Survey cache hit: {key[:12]} ({len(data)} points)")
+        return SurveyPointArray(data, categories)
+
+    def put(self, key: str, points: SurveyPointArray):
+        """
+        Store a parsed survey.
+
+        Args:
+            key: Cache key from key_for()
+            points: Parsed points
+        """
+        writer = self.writer(key)
+        writer.append(points)
+        writer.commit()
+
+    def writer(self, key: str) -> SurveyCacheWriter:
+        """Start an incremental cache entry (for streamed surveys)"""
+        return SurveyCacheWriter(self, key)
@@ -0,0 +1,403 @@
+"""
+Module A - TOC Workbook Importer
+Read drainage area and Time of Concentration data back out of TOC workbooks
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+from openpyxl import load_workbook
+
+logger = logging.getLogger(__name__)
+
+
+# Header text (normalized) -> record field. Covers workbooks written by
+# TOCExcelUpdater and the legacy "CALC SUMMARY" layout.
+HEADER_FIELDS = {
+    "drainage area": "area_label",
+    "e-da": "area_label",
+    "post-da": "area_label",
+    "total area (ac)": "total_area_acres",
+    "area (ac)": "total_area_acres",
+    "impervious (ac)": "impervious_area_acres",
+    "pervious (ac)": "pervious_area_acres",
+    "weighted c": "weighted_c_value",
+    "impervious %": "impervious_percentage",
+    "tc (min)": "tc_minutes",
+    "tc total (min)": "tc_minutes",
+    "hl(ft)": "hydraulic_length_ft",
+    "s(%)": "slope_percent",
+    "sheet flow (ft)": "sheet_flow_length",
+    "shallow flow (ft)": "shallow_flow_length",
+    "channel flow (ft)": "channel_flow_length",
+    "tc sheet (min)": "tc_sheet",
+    "tc shallow (min)": "tc_shallow",
+    "tc channel (min)": "tc_channel",
+}
+
+# Label headers of legacy summaries, where the label column holds a number
+LABEL_PREFIXES = {"e-da": ("E-DA", "existing"), "post-da": ("POST-DA", "proposed")}
+
+
+def _normalize_header(value) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    return " ".join(value.replace('"', "").lower().split())
+
+
+def _to_float(value) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class TOCRecord:
+    """One drainage area row read from a TOC workbook"""
+    area_label: str
+    sheet_name: str
+    row: int
+    condition: Optional[str] = None  # "existing" / "proposed" for legacy summaries
+    outfall: Optional[str] = None
+    total_area_acres: Optional[float] = None
+    impervious_area_acres: Optional[float] = None
+    pervious_area_acres: Optional[float] = None
+    weighted_c_value: Optional[float] = None
+    impervious_percentage: Optional[float] = None
+    tc_minutes: Optional[float] = None
+    hydraulic_length_ft: Optional[float] = None
+    slope_percent: Optional[float] = None
+    sheet_flow_length: Optional[float] = None
+    shallow_flow_length: Optional[float] = None
+    channel_flow_length: Optional[float] = None
+    tc_sheet: Optional[float] = None
+    tc_shallow: Optional[float] = None
+    tc_channel: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class TOCWorkbookImport:
+    """Records imported from one workbook"""
+    path: str
+    records: List[TOCRecord] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "path": self.path,
+            "records": [record.to_dict() for record in self.records],
+            "error": self.error,
+        }
+
+
+@dataclass
+class _Table:
+    """Column layout of one table found on a header row"""
+    label_col: int
+    columns: Dict[int, str]
+    label_prefix: Optional[str] = None
+    condition: Optional[str] = None
+
+
+class TOCWorkbookReader:
+    """
+    Read-only parser for TOC workbooks.
+
+    Opens workbooks with load_workbook(read_only=True, data_only=True), so
+    rows are streamed lazily from the file and formulas come back as their
+    cached values. Any sheet with a recognised header row is parsed - this
+    covers workbooks written by TOCExcelUpdater ("Drainage Areas",
+    "TOC Calculations") and legacy summaries such as the "CALC SUMMARY"
+    sheet with side-by-side E-DA / POST-DA tables.
+
+    Usage:
+        reader = TOCWorkbookReader("25-020 TOC Calculation SUNSET PARK.xlsx")
+        for record in reader.iter_records():
+            print(record.area_label, record.tc_minutes)
+    """
+
+    def __init__(self, workbook_path: str):
+        """
+        Initialize reader.
+
+        Args:
+            workbook_path: Path to .xlsx workbook
+        """
+        self.workbook_path = Path(workbook_path)
+
+        if not self.workbook_path.exists():
+            raise FileNotFoundError(f"Workbook not found: {workbook_path}")
+
+    def iter_rows(self, sheet_name: str) -> Iterator[Dict]:
+        """
+        Lazily yield the rows of a plain table sheet as dictionaries.
+
+        Row 1 is taken as headers; empty rows are skipped. Read-only
+        counterpart of TOCExcelUpdater.get_sheet_data.
+
+        Args:
+            sheet_name: Worksheet name
+
+        Yields:
+            Row dictionaries keyed by header
+        """
+        wb = load_workbook(self.workbook_path, read_only=True, data_only=True)
+        try:
+            if sheet_name not in wb.sheetnames:
+                return
+
+            rows = wb[sheet_name].iter_rows(values_only=True)
+            headers = next(rows, None)
+            if headers is None:
+                return
+
+            for row in rows:
+                if all(cell is None for cell in row):
+                    continue  # Skip empty rows
+                yield dict(zip(headers, row))
+        finally:
+            wb.close()
+
+    def iter_records(self, sheet_names: Optional[List[str]] = None) -> Iterator[TOCRecord]:
+        """
+        Lazily yield typed records from every recognised table.
+
+        Args:
+            sheet_names: Sheets to scan (default: all)
+
+        Yields:
+            TOCRecord per drainage area row
+        """
+        wb = load_workbook(self.workbook_path, read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                if sheet_names is not None and ws.title not in sheet_names:
+                    continue
+                yield from self._parse_sheet(ws.title, ws.iter_rows(values_only=True))
+        finally:
+            wb.close()
+
+    def read(self) -> List[TOCRecord]:
+        """Parse all records, merging TOC rows into drainage area rows by sheet order"""
+        return merge_records(list(self.iter_records()))
+
+    def _parse_sheet(self, sheet_name: str, rows) -> Iterator[TOCRecord]:
+        """Find header rows and turn the rows beneath them into records"""
+        tables: List[_Table] = []
+
+        for row_idx, row in enumerate(rows, start=1):
+            found = self._find_tables(row)
+            if found:
+                tables = found
+                continue
+
+            for table in tables:
+                record = self._parse_row(sheet_name, row_idx, row, table)
+                if record is not None:
+                    yield record
+
+    def _find_tables(self, row: Tuple) -> List[_Table]:
+        """Detect a header row; returns one table per label header in the row"""
+        headers = {col: HEADER_FIELDS.get(_normalize_header(value)) for col, value in enumerate(row)}
+        label_cols = [col for col, name in headers.items() if name == "area_label"]
+
+        # A label header alone (e.g. "Drainage Area" as a note) isn't a table
+        if not label_cols or sum(1 for name in headers.values() if name) < 2:
+            return []
+
+        tables = []
+        for i, label_col in enumerate(label_cols):
+            end = label_cols[i + 1] if i + 1 < len(label_cols) else len(row)
+            columns = {
+                col: name for col, name in headers.items()
+                if name and name != "area_label" and label_col < col < end
+            }
+            prefix, condition = LABEL_PREFIXES.get(_normalize_header(row[label_col]), (None, None))
+            tables.append(_Table(label_col, columns, prefix, condition))
+
+        return tables
+
+    def _parse_row(self, sheet_name: str, row_idx: int, row: Tuple, table: _Table) -> Optional[TOCRecord]:
+        """Build a record from one data row, or None for blank/total rows"""
+        if table.label_col >= len(row):
+            return None
+
+        label = row[table.label_col]
+        if label is None or (isinstance(label, str) and (not label.strip() or label.lower().startswith("total"))):
+            return None
+
+        if table.label_prefix and _to_float(label) is not None:
+            label = f"{table.label_prefix}{int(_to_float(label))}"
+
+        values = {
+            name: _to_float(row[col]) if col < len(row) else None
+            for col, name in table.columns.items()
+        }
+        if all(value is None for value in values.values()):
+            return None
+
+        outfall = row[table.label_col - 1] if table.label_col > 0 else None
+
+        return TOCRecord(
+            area_label=str(label).strip(),
+            sheet_name=sheet_name,
+            row=row_idx,
+            condition=table.condition,
+            outfall=outfall.strip() if isinstance(outfall, str) and outfall.strip() else None,
+            **values,
+        )
+
+
+def merge_records(records: List[TOCRecord]) -> List[TOCRecord]:
+    """
+    Combine records for the same area and condition from different sheets.
+
+    A workbook written by TOCExcelUpdater has the areas on one sheet and
+    the Tc components on another; fields missing from the first record for
+    a label are filled from later ones.
+    """
+    merged: Dict[Tuple, TOCRecord] = {}
+
+    for record in records:
+        key = (record.area_label, record.condition)
+        existing = merged.get(key)
+
+        if existing is None:
+            merged[key] = record
+            continue
+
+        for name, value in asdict(record).items():
+            if getattr(existing, name) is None and value is not None:
+                setattr(existing, name, value)
+
+    return list(merged.values())
+
+
+def import_toc_workbook(workbook_path: str) -> TOCWorkbookImport:
+    """
+    Import one TOC workbook.
+
+    Module-level so it can be sent to worker processes.
+
+    Args:
+        workbook_path: Path to .xlsx workbook
+
+    Returns:
+        TOCWorkbookImport with records, or error on failure
+    """
+    try:
+        return TOCWorkbookImport(path=str(workbook_path), records=TOCWorkbookReader(workbook_path).read())
+    except Exception as e:
+        return TOCWorkbookImport(path=str(workbook_path), error=str(e))
+
+
+def _resolve_under(root: Path, path: Path) -> Path:
+    """Resolve path (symlinks included) and require it to be inside root"""
+    resolved = path.resolve()
+    if resolved != root and root not in resolved.parents:
+        raise ValueError(f"Path is outside the import root: {path}")
+    return resolved
+
+
+def find_toc_workbooks(
+    directory: str,
+    pattern: str = "**/*.xlsx",
+    root: Optional[str] = None,
+    max_files: Optional[int] = None
+) -> List[str]:
+    """
+    Find TOC workbooks under a directory.
+
+    Args:
+        directory: Project directory to scan; relative to root when root is given
+        pattern: Glob pattern for workbooks, relative to directory
+        root: Import root - the directory and every matched workbook must
+              resolve inside it, after following symlinks (optional)
+        max_files: Maximum number of workbooks (optional)
+
+    Returns:
+        Sorted workbook paths
+
+    Raises:
+        ValueError: If the directory or pattern escapes root, the directory
+                    does not exist, or more than max_files workbooks match
+    """
+    if Path(pattern).is_absolute() or ".." in Path(pattern).parts:
+        raise ValueError(f"Invalid workbook pattern: {pattern}")
+
+    if root is not None:
+        root = Path(root).resolve()
+        directory = _resolve_under(root, root / directory)
+    else:
+        directory = Path(directory)
+
+    if not directory.is_dir():
+        raise ValueError(f"Not a directory: {directory}")
+
+    paths = []
+    # Skip Excel lock files (~$name.xlsx)
+    for path in directory.glob(pattern):
+        if path.name.startswith("~$"):
+            continue
+        if root is not None:
+            _resolve_under(root, path)
+        paths.append(str(path))
+        if max_files is not None and len(paths) > max_files:
+            raise ValueError(f"More than {max_files} workbooks match {pattern}; narrow the directory or pattern")
+
+    return sorted(paths)
+
+
+def import_toc_directory(
+    directory: str,
+    pattern: str = "**/*.xlsx",
+    max_workers: Optional[int] = None,
+    root: Optional[str] = None,
+    max_files: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> List[TOCWorkbookImport]:
+    """
+    Import every TOC workbook under a directory in parallel.
+
+    Each workbook is parsed in its own worker process. Workbooks that fail
+    to parse are reported with an error instead of stopping the import.
+
+    Args:
+        directory: Project directory to scan; relative to root when root is given
+        pattern: Glob pattern for workbooks (default: all .xlsx, recursively)
+        max_workers: Worker processes (default: CPU count)
+        root: Import root that every workbook must resolve inside (optional)
+        max_files: Maximum number of workbooks (optional)
+        executor: Shared process pool to run on (optional, not shut down here)
+
+    Returns:
+        One TOCWorkbookImport per workbook, sorted by path
+
+    Raises:
+        ValueError: See find_toc_workbooks
+    """
+    paths = find_toc_workbooks(directory, pattern, root=root, max_files=max_files)
+
+    if len(paths) <= 1 or max_workers == 1:
+        results = [import_toc_workbook(p) for p in paths]
+    elif executor is not None:
+        results = list(executor.map(import_toc_workbook, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(import_toc_workbook, paths))
+
+    failed = sum(1 for r in results if r.error)
+    logger.info(
+        f"Imported {sum(len(r.records) for r in results)} TOC records from {len(paths)} workbooks"
+        + (f" ({failed} failed)" if failed else "")
+    )
+
+    return results
@@ -1,12 +1,20 @@
 """Module B - UDC & DOTD Specification Extraction"""
 from .pdf_parser import PDFParser
+from .extraction_cache import PDFExtractionCache
 from .spec_extractor import SpecificationExtractor
-from .noaa_parser import NOAAAtlas14Parser
+from .noaa_parser import NOAAAtlas14Parser, IDFTable
+from .idf_registry import IDFRegistry, IDFDataset, idf_registry, LAFAYETTE_NOAA_ATLAS_14
 from .web_scraper import SpecificationWebScraper
 
 __all__ = [
     "PDFParser",
+    "PDFExtractionCache",
     "SpecificationExtractor",
     "NOAAAtlas14Parser",
+    "IDFTable",
+    "IDFRegistry",
+    "IDFDataset",
+    "idf_registry",
+    "LAFAYETTE_NOAA_ATLAS_14",
     "SpecificationWebScraper",
 ]
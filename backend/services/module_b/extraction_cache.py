@@ -0,0 +1,117 @@
+"""
+Module B - PDF Extraction Cache
+Content-addressed on-disk cache of PDFParser output
+"""
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+import gzip
+import json
+import logging
+import os
+import uuid
+
+from ..disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+
+class PDFExtractionCache(DiskCache):
+    """
+    On-disk cache of extracted PDF pages keyed by the SHA-256 of the PDF bytes.
+
+    Each entry is one gzip-compressed JSON-lines file: a header line with
+    the document metadata, then one line per page (text, tables, size).
+    The same regulatory manuals (UDC, DOTD) are uploaded again and again,
+    so a hit replaces pdfplumber entirely. Entries are evicted least
+    recently used first once the cache exceeds max_bytes.
+
+    Usage:
+        cache = PDFExtractionCache("/app/cache/pdfs")
+        parser = PDFParser("udc.pdf", cache=cache)
+        pages = parser.extract_text()  # second upload of the same bytes is a cache hit
+    """
+
+    # Bump when the entry layout changes so old entries are ignored
+    FORMAT_VERSION = 1
+
+    DEFAULT_MAX_BYTES = 1024 ** 3  # 1 GB
+
+    ENTRY_SUFFIXES = (".jsonl.gz",)
+
+    LABEL = "PDF cache"
+
+    def key_for(self, file_path: str, parser_version: str) -> str:
+        """
+        Compute the cache key for a PDF.
+
+        Args:
+            file_path: Path to the PDF
+            parser_version: Tag for everything on the parser side that
+                changes its output (parser version, table prefilter)
+
+        Returns:
+            SHA-256 hex digest of the file bytes, tagged with parser and format versions
+        """
+        return f"{self.file_digest(file_path)}-{parser_version}-f{self.FORMAT_VERSION}"
+
+    def entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.jsonl.gz"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached extraction.
+
+        Args:
+            key: Cache key from key_for()
+
+        Returns:
+            {"metadata": {...}, "pages": [...]}, or None on a miss
+        """
+        path = self.entry_path(key)
+
+        if not path.exists():
+            return None
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                pages = [json.loads(line) for line in f]
+        except (OSError, EOFError, ValueError) as e:
+            logger.warning(f"Discarding unreadable PDF cache entry {key[:12]}: {e}")
+            self.remove(key)
+            return None
+
+        if len(pages) != header.get("page_count"):
+            logger.warning(f"Discarding truncated PDF cache entry {key[:12]}")
+            self.remove(key)
+            return None
+
+        self.touch(key)
+
+        logger.debug(f"PDF cache hit: {key[:12]} ({len(pages)} pages)")
+        return {"metadata": header.get("metadata", {}), "pages": pages}
+
+    def put(self, key: str, pages: List[Dict[str, Any]], metadata: Dict[str, Any]):
+        """
+        Store an extraction.
+
+        Args:
+            key: Cache key from key_for()
+            pages: PDFParser.pages
+            metadata: PDFParser.get_metadata()
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = self.cache_dir / f"{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+                f.write(json.dumps({"metadata": metadata, "page_count": len(pages)}) + "\n")
+                for page in pages:
+                    f.write(json.dumps(page, separators=(",", ":")) + "\n")
+
+            os.replace(tmp_path, self.entry_path(key))
+            logger.info(f"Cached {len(pages)} extracted PDF pages: {key[:12]}")
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        self.evict()
@@ -0,0 +1,183 @@
+"""
+Module B - IDF Dataset Registry
+Process-wide, compile-once store of NOAA Atlas 14 IDF tables
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+import threading
+
+from .noaa_parser import NOAAAtlas14Parser, IDFTable
+
+logger = logging.getLogger(__name__)
+
+# (jurisdiction, location) - location is the spec's section_reference
+IDFKey = Tuple[str, str]
+
+LAFAYETTE_NOAA_ATLAS_14: IDFKey = ("NOAA Atlas 14", "Volume 9 - Lafayette, LA")
+
+
+def _standard_lafayette_records() -> List[Dict]:
+    parser = NOAAAtlas14Parser()
+    parser.load_standard_lafayette_data()
+    return parser.data
+
+
+@dataclass(frozen=True)
+class IDFDataset:
+    """One compiled IDF dataset; records and table are shared, never mutated"""
+    jurisdiction: str
+    location: str
+    records: Tuple[Dict, ...]
+    table: IDFTable
+
+    def parser(self) -> NOAAAtlas14Parser:
+        """A NOAAAtlas14Parser over this dataset, without recompiling"""
+        return NOAAAtlas14Parser.from_idf_table(self.table, list(self.records))
+
+
+class IDFRegistry:
+    """
+    Process-wide registry of compiled IDF tables.
+
+    Datasets are keyed by (jurisdiction, location). Each is compiled on
+    first use and then shared by every request and thread. Built-in
+    datasets (the standard Lafayette data) are always available;
+    rainfall_intensity rows from the specs table override them for the
+    same key once `sync` or `refresh_from_specs` has seen them.
+
+    Usage:
+        parser = idf_registry.parser()  # Lafayette, LA
+        intensity = parser.interpolate_intensity(12.5, 10)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._builtin: Dict[IDFKey, Callable[[], List[Dict]]] = {
+            LAFAYETTE_NOAA_ATLAS_14: _standard_lafayette_records,
+        }
+        self._spec_records: Dict[IDFKey, List[Dict]] = {}
+        self._datasets: Dict[IDFKey, IDFDataset] = {}
+        self._specs_version: Optional[Tuple] = None
+
+    def register(self, key: IDFKey, loader: Callable[[], List[Dict]]):
+        """Register a built-in dataset loader (called lazily, once)"""
+        with self._lock:
+            self._builtin[key] = loader
+            self._datasets.pop(key, None)
+
+    def keys(self) -> List[IDFKey]:
+        with self._lock:
+            return sorted(set(self._builtin) | set(self._spec_records))
+
+    def dataset(self, key: IDFKey = LAFAYETTE_NOAA_ATLAS_14) -> IDFDataset:
+        """
+        Compiled dataset for a key.
+
+        Raises:
+            KeyError: If no built-in or specs data exists for the key
+        """
+        dataset = self._datasets.get(key)
+        if dataset is not None:
+            return dataset
+
+        with self._lock:
+            dataset = self._datasets.get(key)
+            if dataset is None:
+                if key in self._spec_records:
+                    records = self._spec_records[key]
+                elif key in self._builtin:
+                    records = self._builtin[key]()
+                else:
+                    raise KeyError(f"No IDF data for {key[0]} ({key[1]})")
+
+                table = IDFTable.from_records(records)
+                for array in (table.durations, table.return_periods, table.intensity_grid):
+                    array.setflags(write=False)
+
+                dataset = IDFDataset(
+                    jurisdiction=key[0],
+                    location=key[1],
+                    records=tuple(records),
+                    table=table,
+                )
+                self._datasets[key] = dataset
+                logger.info(f"Compiled IDF dataset {key[0]} ({key[1]}): {len(records)} records")
+
+        return dataset
+
+    def parser(self, key: IDFKey = LAFAYETTE_NOAA_ATLAS_14) -> NOAAAtlas14Parser:
+        """NOAAAtlas14Parser backed by the shared compiled table"""
+        return self.dataset(key).parser()
+
+    def refresh_from_specs(self, records: List[Dict], version: Optional[Tuple] = None) -> bool:
+        """
+        Replace specs-backed datasets with rainfall_intensity records.
+
+        Args:
+            records: Spec rows as dicts (jurisdiction, section_reference,
+                duration_minutes, return_period_years, intensity_in_per_hr)
+            version: Fingerprint of the specs table; the refresh is skipped
+                when it matches the last one seen
+
+        Returns:
+            True if the datasets were rebuilt
+        """
+        with self._lock:
+            if version is not None and version == self._specs_version:
+                return False
+
+            grouped: Dict[IDFKey, List[Dict]] = {}
+            for record in records:
+                key = (record.get("jurisdiction"), record.get("section_reference") or "")
+                grouped.setdefault(key, []).append(record)
+
+            self._spec_records = grouped
+            self._specs_version = version
+            self._datasets.clear()
+
+        logger.info(f"IDF registry refreshed from specs: {len(grouped)} datasets, {len(records)} records")
+        return True
+
+    def sync(self, db) -> bool:
+        """
+        Refresh from the specs table if it changed since the last sync.
+
+        The table is fingerprinted by row count and latest extraction time
+        of its rainfall_intensity rows, so an unchanged table costs one
+        aggregate query.
+        """
+        from sqlalchemy import func
+        from models import Spec
+
+        rainfall = Spec.spec_type == "rainfall_intensity"
+        count, latest = db.query(func.count(Spec.id), func.max(Spec.extracted_at)).filter(rainfall).one()
+        version = (count, latest)
+        if version == self._specs_version:
+            return False
+
+        records = [
+            {
+                "jurisdiction": spec.jurisdiction,
+                "section_reference": spec.section_reference,
+                "duration_minutes": float(spec.duration_minutes),
+                "return_period_years": spec.return_period_years,
+                "intensity_in_per_hr": float(spec.intensity_in_per_hr),
+            }
+            for spec in db.query(Spec).filter(rainfall).order_by(Spec.extracted_at)
+            if spec.duration_minutes is not None
+            and spec.return_period_years is not None
+            and spec.intensity_in_per_hr is not None
+        ]
+        return self.refresh_from_specs(records, version=version)
+
+    def clear(self):
+        """Drop compiled datasets and specs data (built-in loaders are kept)"""
+        with self._lock:
+            self._spec_records = {}
+            self._datasets.clear()
+            self._specs_version = None
+
+
+# Shared by every request in the process
+idf_registry = IDFRegistry()
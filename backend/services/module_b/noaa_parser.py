@@ -2,15 +2,161 @@
 Module B - NOAA Atlas 14 Parser
 Specialized parser for NOAA Atlas 14 rainfall intensity data
 """
+from bisect import bisect_left
+from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple
+import math
 import re
 import logging
 
+import numpy as np
+
 from .pdf_parser import PDFParser
+from ..rounding import round_builtin_array
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class IDFTable:
+    """
+    Intensity-duration-frequency records compiled into a dense grid.
+
+    intensity_grid[d, p] is the intensity (in/hr) for durations[d] and
+    return_periods[p], NaN where the source has no record. Each return
+    period also keeps its own sorted (duration, intensity) column so
+    lookups and interpolation are a bisect instead of a record scan.
+    """
+    durations: np.ndarray
+    return_periods: np.ndarray
+    intensity_grid: np.ndarray
+
+    def __post_init__(self):
+        self.columns: Dict[float, Tuple[List[float], List[float]]] = {}
+        for p, period in enumerate(self.return_periods.tolist()):
+            present = ~np.isnan(self.intensity_grid[:, p])
+            self.columns[period] = (
+                self.durations[present].tolist(),
+                self.intensity_grid[present, p].tolist(),
+            )
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "IDFTable":
+        """Compile parser records; the first record wins for duplicate keys"""
+        values: Dict[Tuple[float, float], float] = {}
+        for record in records:
+            duration = record.get("duration_minutes")
+            period = record.get("return_period_years")
+            intensity = record.get("intensity_in_per_hr")
+            if duration is None or period is None or intensity is None:
+                continue
+            values.setdefault((duration, period), intensity)
+
+        durations = np.array(sorted({d for d, _ in values}), dtype=np.float64)
+        periods = np.array(sorted({p for _, p in values}), dtype=np.float64)
+        grid = np.full((len(durations), len(periods)), np.nan)
+        for (duration, period), intensity in values.items():
+            grid[np.searchsorted(durations, duration), np.searchsorted(periods, period)] = intensity
+
+        return cls(durations=durations, return_periods=periods, intensity_grid=grid)
+
+    def lookup(self, duration_minutes: float, return_period_years: float) -> Optional[float]:
+        """Exact tabulated intensity, or None"""
+        column = self.columns.get(return_period_years)
+        if column is None:
+            return None
+        durations, intensities = column
+        index = bisect_left(durations, duration_minutes)
+        if index < len(durations) and durations[index] == duration_minutes:
+            return intensities[index]
+        return None
+
+    def interpolate(
+        self,
+        duration_minutes: float,
+        return_period_years: float,
+        log_log: bool = False
+    ) -> Optional[float]:
+        """
+        Interpolate between the bounding durations of one return period.
+
+        Returns None outside the tabulated durations. Exact durations are
+        not handled here (see lookup).
+        """
+        column = self.columns.get(return_period_years)
+        if column is None or len(column[0]) < 2:
+            return None
+        durations, intensities = column
+
+        index = bisect_left(durations, duration_minutes)
+        if index == 0 or index >= len(durations):
+            return None
+
+        d1, d2 = durations[index - 1], durations[index]
+        i1, i2 = intensities[index - 1], intensities[index]
+
+        if log_log:
+            # IDF curves are close to straight lines in log-log space
+            if min(duration_minutes, d1, i1, i2) <= 0:
+                return None
+            d, d1, d2 = math.log(duration_minutes), math.log(d1), math.log(d2)
+            return math.exp(math.log(i1) + (math.log(i2) - math.log(i1)) * (d - d1) / (d2 - d1))
+
+        # Interpolate: i = i1 + (i2 - i1) * (d - d1) / (d2 - d1)
+        return i1 + (i2 - i1) * (duration_minutes - d1) / (d2 - d1)
+
+    def intensities(self, durations, return_periods, log_log: bool = False) -> np.ndarray:
+        """
+        Exact or interpolated intensities for broadcast durations x periods.
+
+        Matches the scalar lookup/interpolate (interpolated values rounded to
+        4 places); NaN where a period is not tabulated or a duration falls
+        outside its column.
+        """
+        durations, periods = np.broadcast_arrays(
+            np.asarray(durations, dtype=np.float64),
+            np.asarray(return_periods, dtype=np.float64),
+        )
+        result = np.full(durations.shape, np.nan)
+
+        for period in np.unique(periods):
+            column = self.columns.get(float(period))
+            if column is None:
+                continue
+            col_durations = np.asarray(column[0])
+            col_intensities = np.asarray(column[1])
+
+            selected = periods == period
+            d = durations[selected]
+            index = np.searchsorted(col_durations, d)
+            exact = col_durations[np.minimum(index, len(col_durations) - 1)] == d
+
+            if len(col_durations) < 2:
+                # Nothing to interpolate between; only exact durations resolve
+                values = np.full(d.shape, np.nan)
+            else:
+                inside = (index > 0) & (index < len(col_durations))
+
+                lower = np.clip(index - 1, 0, len(col_durations) - 2)
+                d1, d2 = col_durations[lower], col_durations[lower + 1]
+                i1, i2 = col_intensities[lower], col_intensities[lower + 1]
+
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    if log_log:
+                        inside &= (d > 0) & (d1 > 0) & (i1 > 0) & (i2 > 0)
+                        d, d1, d2 = np.log(d), np.log(d1), np.log(d2)
+                        values = np.exp(np.log(i1) + (np.log(i2) - np.log(i1)) * (d - d1) / (d2 - d1))
+                    else:
+                        values = i1 + (i2 - i1) * (d - d1) / (d2 - d1)
+
+                values = np.where(inside, round_builtin_array(values, 4), np.nan)
+
+            values[exact] = col_intensities[index[exact]]
+            result[selected] = values
+
+        return result
+
+
 class NOAAAtlas14Parser:
     """
     Parse NOAA Atlas 14 Precipitation-Frequency Atlas data.
@@ -35,7 +181,52 @@ class NOAAAtlas14Parser:
             pdf_parser: Optional PDFParser for extracting from NOAA PDF
         """
         self.parser = pdf_parser
-        self.data: List[Dict] = []
+        self._data: List[Dict] = []
+        self._idf_table: Optional[IDFTable] = None
+
+    @classmethod
+    def from_idf_table(cls, table: IDFTable, records: List[Dict]) -> "NOAAAtlas14Parser":
+        """
+        Parser over already-compiled records (see IDFRegistry).
+
+        Args:
+            table: IDFTable compiled from records
+            records: The records behind the table
+        """
+        parser = cls()
+        parser.data = records
+        parser._idf_table = table
+        return parser
+
+    @property
+    def data(self) -> List[Dict]:
+        """Intensity records (duration_minutes, return_period_years, intensity_in_per_hr)"""
+        return self._data
+
+    @data.setter
+    def data(self, records: List[Dict]):
+        self._data = records
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Drop the compiled IDF table.
+
+        Assigning `data` does this automatically; call it after editing the
+        record list in place.
+        """
+        self._idf_table = None
+
+    @property
+    def idf_table(self) -> IDFTable:
+        """Records compiled into an IDFTable (on first use after data changes)"""
+        if self._idf_table is None:
+            self._idf_table = IDFTable.from_records(self._data)
+            logger.debug(
+                f"Compiled IDF table: {len(self._idf_table.durations)} durations x "
+                f"{len(self._idf_table.return_periods)} return periods"
+            )
+        return self._idf_table
 
     def parse_intensity_table(self, table_data: List[List]) -> List[Dict]:
         """
@@ -126,17 +317,13 @@ class NOAAAtlas14Parser:
         Returns:
             Rainfall intensity in inches per hour, or None if not found
         """
-        for record in self.data:
-            if (record.get("duration_minutes") == duration_minutes and
-                record.get("return_period_years") == return_period_years):
-                return record.get("intensity_in_per_hr")
-
-        return None
+        return self.idf_table.lookup(duration_minutes, return_period_years)
 
     def interpolate_intensity(
         self,
         duration_minutes: float,
-        return_period_years: int
+        return_period_years: int,
+        log_log: bool = False
     ) -> Optional[float]:
         """
         Get or interpolate rainfall intensity.
@@ -146,6 +333,8 @@ class NOAAAtlas14Parser:
         Args:
             duration_minutes: Duration in minutes
             return_period_years: Return period in years
+            log_log: Interpolate log(intensity) against log(duration), the
+                usual form for IDF curves, instead of linearly
 
         Returns:
             Rainfall intensity (exact or interpolated)
@@ -155,49 +344,35 @@ class NOAAAtlas14Parser:
         if exact is not None:
             return exact
 
-        # Get all records for this return period
-        period_records = [
-            r for r in self.data
-            if r.get("return_period_years") == return_period_years
-        ]
-
-        if len(period_records) < 2:
+        interpolated = self.idf_table.interpolate(duration_minutes, return_period_years, log_log=log_log)
+        if interpolated is None:
             return None
 
-        # Sort by duration
-        period_records.sort(key=lambda x: x["duration_minutes"])
-
-        # Find bounding durations
-        lower_record = None
-        upper_record = None
-
-        for record in period_records:
-            dur = record["duration_minutes"]
-            if dur < duration_minutes:
-                lower_record = record
-            elif dur > duration_minutes and upper_record is None:
-                upper_record = record
-                break
-
-        if lower_record is None or upper_record is None:
-            return None
-
-        # Linear interpolation
-        d1 = lower_record["duration_minutes"]
-        d2 = upper_record["duration_minutes"]
-        i1 = lower_record["intensity_in_per_hr"]
-        i2 = upper_record["intensity_in_per_hr"]
-
-        # Interpolate: i = i1 + (i2 - i1) * (d - d1) / (d2 - d1)
-        interpolated = i1 + (i2 - i1) * (duration_minutes - d1) / (d2 - d1)
-
         logger.debug(
             f"Interpolated intensity for {duration_minutes} min, {return_period_years} yr: "
-            f"{interpolated:.4f} in/hr (between {d1} min={i1} and {d2} min={i2})"
+            f"{interpolated:.4f} in/hr"
         )
 
         return round(interpolated, 4)
 
+    def intensities(self, durations, return_periods, log_log: bool = False) -> np.ndarray:
+        """
+        Batch interpolate_intensity over broadcast durations and return periods.
+
+        Args:
+            durations: Durations in minutes (array-like)
+            return_periods: Return periods in years (array-like)
+            log_log: Interpolate in log-log space
+
+        Returns:
+            Intensities (in/hr), NaN where interpolate_intensity returns None
+
+        Example:
+            parser.intensities(tc_values[:, None], [10, 25, 50, 100])
+            -> intensity per (Tc, storm)
+        """
+        return self.idf_table.intensities(durations, return_periods, log_log=log_log)
+
     def _parse_duration(self, duration_str: str) -> Optional[float]:
         """
         Parse duration string to minutes.
@@ -4,11 +4,19 @@ Parse regulatory PDFs (UDC, DOTD) to extract structured data
 """
 import PyPDF2
 import pdfplumber
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Callable, Iterator, List, Dict, Optional, Any, Sequence, Tuple, TYPE_CHECKING
+import hashlib
 import logging
+import math
+import os
 import re
 
+if TYPE_CHECKING:
+    from .extraction_cache import PDFExtractionCache
+
 # LangChain imports (optional - only if OPENAI_API_KEY is set)
 try:
     from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -21,6 +29,80 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# progress_callback(pages_done, total_pages)
+ProgressCallback = Callable[[int, int], None]
+
+
+def _table_skip_reason(page, text: str, table_keywords: Optional[Sequence[str]]) -> Optional[str]:
+    """
+    Why extract_tables can be skipped on a page, or None if it may have tables.
+
+    pdfplumber's default table finder builds cells from ruling lines, so a
+    page without lines, rects or curves cannot produce a table. With
+    table_keywords, pages whose text mentions none of them are skipped too.
+    """
+    if not (page.lines or page.rects or page.curves):
+        return "no_ruling"
+    if table_keywords:
+        lowered = text.lower()
+        if not any(keyword in lowered for keyword in table_keywords):
+            return "no_keywords"
+    return None
+
+
+def _page_tables(page, text: str, table_keywords: Optional[Sequence[str]], stats: Counter) -> List:
+    """extract_tables behind the prefilter, counting pages into stats"""
+    stats["pages"] += 1
+    reason = _table_skip_reason(page, text, table_keywords)
+    if reason:
+        stats[f"skipped_{reason}"] += 1
+        return []
+    stats["extracted"] += 1
+    return page.extract_tables()
+
+
+def _extract_page(
+    page,
+    page_number: int,
+    table_keywords: Optional[Sequence[str]],
+    stats: Counter
+) -> Dict[str, Any]:
+    """Text, tables and size of one pdfplumber page"""
+    text = page.extract_text() or ""
+    return {
+        "page_number": page_number,
+        "text": text,
+        "tables": _page_tables(page, text, table_keywords, stats),
+        "width": page.width,
+        "height": page.height,
+    }
+
+
+def extract_page_range(
+    pdf_path: str,
+    first_page: int,
+    last_page: int,
+    table_keywords: Optional[Sequence[str]] = None
+) -> Tuple[List[Dict[str, Any]], Counter]:
+    """
+    Extract pages first_page..last_page (1-indexed, inclusive).
+
+    Module-level so it can be sent to worker processes; each call opens
+    the PDF itself.
+
+    Returns:
+        (pages, table prefilter stats)
+    """
+    stats = Counter()
+    with pdfplumber.open(pdf_path) as pdf:
+        pages = []
+        for page_number in range(first_page, last_page + 1):
+            page = pdf.pages[page_number - 1]
+            pages.append(_extract_page(page, page_number, table_keywords, stats))
+            # pdfplumber caches parsed layout objects per page
+            page.flush_cache()
+        return pages, stats
+
 
 class PDFParser:
     """
@@ -29,9 +111,30 @@ class PDFParser:
     Supports two modes:
     1. Basic text extraction (PyPDF2 + pdfplumber)
     2. AI-powered extraction with LangChain (requires OpenAI API key)
+
+    Pages can be read eagerly (extract_text) or on demand: get_page_text and
+    get_page_tables open the document lazily, extract only the requested
+    page, and keep results in a bounded per-page LRU cache.
     """
 
-    def __init__(self, pdf_path: str, use_langchain: bool = False, openai_api_key: Optional[str] = None):
+    # Bump when extraction output changes so cached extractions are ignored
+    PARSER_VERSION = 1
+
+    # Documents shorter than this are extracted in-process
+    MIN_PARALLEL_PAGES = 16
+
+    # Pages per worker task; small enough to balance load and report progress
+    MAX_CHUNK_PAGES = 25
+
+    def __init__(
+        self,
+        pdf_path: str,
+        use_langchain: bool = False,
+        openai_api_key: Optional[str] = None,
+        page_cache_size: int = 64,
+        table_keywords: Optional[Sequence[str]] = None,
+        cache: Optional["PDFExtractionCache"] = None
+    ):
         """
         Initialize PDF parser.
 
@@ -39,11 +142,30 @@ class PDFParser:
             pdf_path: Path to PDF file
             use_langchain: Use LangChain for intelligent extraction
             openai_api_key: OpenAI API key for LangChain (optional)
+            page_cache_size: Pages of text (and, separately, tables) kept
+                by on-demand page access
+            table_keywords: Only extract tables on pages whose text contains
+                one of these (case-insensitive); pages without ruling lines
+                are always skipped
+            cache: Optional on-disk cache of extracted pages keyed by file
+                content; a hit skips pdfplumber entirely
         """
         self.pdf_path = Path(pdf_path)
         self.use_langchain = use_langchain and LANGCHAIN_AVAILABLE
         self.openai_api_key = openai_api_key
         self.pages: List[Dict] = []
+        self.page_cache_size = page_cache_size
+        self._pdf = None
+        self._text_cache: "OrderedDict[int, str]" = OrderedDict()
+        self._table_cache: "OrderedDict[int, List]" = OrderedDict()
+        self.table_keywords = [k.lower() for k in table_keywords] if table_keywords else None
+        # Table prefilter counts: pages, extracted, skipped_no_ruling, skipped_no_keywords
+        self.table_stats: Counter = Counter()
+        self.cache = cache
+        self.from_cache = False
+        self._cache_key: Optional[str] = None
+        self._cache_checked = False
+        self._metadata: Optional[Dict] = None
 
         if not self.pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
@@ -52,35 +174,181 @@ class PDFParser:
             logger.warning("LangChain not available. Falling back to basic extraction.")
             self.use_langchain = False
 
-    def extract_text(self) -> List[Dict[str, Any]]:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the lazily opened document (reopened on next page access)"""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    @property
+    def tables_skipped(self) -> int:
+        """Pages where the prefilter skipped extract_tables"""
+        return self.table_stats["skipped_no_ruling"] + self.table_stats["skipped_no_keywords"]
+
+    @property
+    def page_count(self) -> int:
+        if self.pages or self._load_from_cache():
+            return len(self.pages)
+        return len(self._document().pages)
+
+    def _get_cache_key(self) -> str:
+        """Content hash of the PDF plus everything that changes the output"""
+        if self._cache_key is None:
+            version = f"p{self.PARSER_VERSION}"
+            if self.table_keywords:
+                keywords = "\n".join(sorted(self.table_keywords)).encode("utf-8")
+                version += f"-k{hashlib.sha256(keywords).hexdigest()[:12]}"
+            self._cache_key = self.cache.key_for(str(self.pdf_path), version)
+        return self._cache_key
+
+    def _load_from_cache(self) -> bool:
+        """Load pages and metadata from the cache if this PDF was extracted before"""
+        if self.cache is None or self.pages:
+            return bool(self.pages) and self.from_cache
+        if self._cache_checked:
+            return False
+        self._cache_checked = True
+
+        cached = self.cache.get(self._get_cache_key())
+        if cached is None:
+            return False
+
+        self.pages = cached["pages"]
+        self._metadata = cached["metadata"]
+        self.from_cache = True
+        logger.info(f"Loaded {len(self.pages)} extracted pages for {self.pdf_path.name} from cache")
+        return True
+
+    def _document(self):
+        if self._pdf is None:
+            self._pdf = pdfplumber.open(self.pdf_path)
+        return self._pdf
+
+    def _lazy_page(self, page_number: int):
+        pages = self._document().pages
+        if not 1 <= page_number <= len(pages):
+            raise ValueError(f"Page {page_number} not found (total pages: {len(pages)})")
+        return pages[page_number - 1]
+
+    def _cached(self, cache: OrderedDict, page_number: int, extract: Callable[[Any], Any]):
+        """LRU lookup; on a miss, extract from the page and drop its parsed layout"""
+        if page_number in cache:
+            cache.move_to_end(page_number)
+            return cache[page_number]
+
+        page = self._lazy_page(page_number)
+        value = extract(page)
+        page.flush_cache()
+
+        cache[page_number] = value
+        if len(cache) > self.page_cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def extract_text(
+        self,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[Dict[str, Any]]:
         """
         Extract text from all pages.
 
+        Args:
+            parallel: Split the pages into ranges across a process pool;
+                each worker opens the PDF itself and results are merged in
+                page order. Short documents still run in-process.
+            max_workers: Worker processes (default: CPU count)
+            progress_callback: Called as progress_callback(pages_done, total_pages)
+
         Returns:
             List of dictionaries with page number and text
         """
+        if self._load_from_cache():
+            if progress_callback:
+                progress_callback(len(self.pages), len(self.pages))
+            return self.pages
+
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
+            self._extract_text(parallel, max_workers, progress_callback)
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF: {e}")
+            raise
+
+        if self.cache is not None:
+            self.cache.put(self._get_cache_key(), self.pages, self.get_metadata())
+
+        return self.pages
+
+    def _extract_text(
+        self,
+        parallel: bool,
+        max_workers: Optional[int],
+        progress_callback: Optional[ProgressCallback]
+    ):
+        """Run pdfplumber over every page, in-process or in a process pool"""
+        with pdfplumber.open(self.pdf_path) as pdf:
+            total_pages = len(pdf.pages)
+
+            workers = max_workers or os.cpu_count() or 1
+            if not parallel or workers == 1 or total_pages < self.MIN_PARALLEL_PAGES:
                 self.pages = []
 
                 for page_num, page in enumerate(pdf.pages, start=1):
-                    text = page.extract_text() or ""
-                    tables = page.extract_tables()
-
-                    self.pages.append({
-                        "page_number": page_num,
-                        "text": text,
-                        "tables": tables,
-                        "width": page.width,
-                        "height": page.height,
-                    })
+                    self.pages.append(_extract_page(page, page_num, self.table_keywords, self.table_stats))
+                    if progress_callback:
+                        progress_callback(page_num, total_pages)
 
-            logger.info(f"Extracted text from {len(self.pages)} pages: {self.pdf_path.name}")
-            return self.pages
+                logger.info(
+                    f"Extracted text from {len(self.pages)} pages: {self.pdf_path.name} "
+                    f"(table extraction skipped on {self.tables_skipped} pages)"
+                )
+                return
 
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF: {e}")
-            raise
+        self.pages = self._extract_parallel(total_pages, workers, progress_callback)
+
+        logger.info(
+            f"Extracted text from {len(self.pages)} pages with {workers} workers: {self.pdf_path.name} "
+            f"(table extraction skipped on {self.tables_skipped} pages)"
+        )
+
+    def _extract_parallel(
+        self,
+        total_pages: int,
+        workers: int,
+        progress_callback: Optional[ProgressCallback]
+    ) -> List[Dict[str, Any]]:
+        """Extract page ranges in a process pool, merged in page order"""
+        # About four ranges per worker so a slow range doesn't hold up the pool
+        chunk = max(1, min(self.MAX_CHUNK_PAGES, math.ceil(total_pages / (workers * 4))))
+        ranges = [
+            (first, min(first + chunk - 1, total_pages))
+            for first in range(1, total_pages + 1, chunk)
+        ]
+
+        chunks: Dict[int, List[Dict[str, Any]]] = {}
+        pages_done = 0
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(extract_page_range, str(self.pdf_path), first, last, self.table_keywords): first
+                for first, last in ranges
+            }
+            for future in as_completed(futures):
+                pages, stats = future.result()
+                chunks[futures[future]] = pages
+                self.table_stats.update(stats)
+                pages_done += len(pages)
+                if progress_callback:
+                    progress_callback(pages_done, total_pages)
+
+        return [page for first in sorted(chunks) for page in chunks[first]]
 
     def search_text(self, pattern: str, case_sensitive: bool = False) -> List[Dict]:
         """
@@ -93,14 +361,10 @@ class PDFParser:
         Returns:
             List of matches with page number and context
         """
-        if not self.pages:
-            self.extract_text()
-
         flags = 0 if case_sensitive else re.IGNORECASE
         matches = []
 
-        for page in self.pages:
-            text = page["text"]
+        for page_number, text in self.iter_page_text():
             for match in re.finditer(pattern, text, flags):
                 # Get context (50 chars before and after)
                 start = max(0, match.start() - 50)
@@ -108,7 +372,7 @@ class PDFParser:
                 context = text[start:end]
 
                 matches.append({
-                    "page_number": page["page_number"],
+                    "page_number": page_number,
                     "matched_text": match.group(),
                     "context": context,
                     "start_pos": match.start(),
@@ -124,16 +388,14 @@ class PDFParser:
         Returns:
             List of tables with page number
         """
-        if not self.pages:
-            self.extract_text()
-
         all_tables = []
 
-        for page in self.pages:
-            if page["tables"]:
-                for table_idx, table in enumerate(page["tables"]):
+        for page_number in range(1, self.page_count + 1):
+            tables = self.get_page_tables(page_number)
+            if tables:
+                for table_idx, table in enumerate(tables):
                     all_tables.append({
-                        "page_number": page["page_number"],
+                        "page_number": page_number,
                         "table_index": table_idx,
                         "data": table,
                         "rows": len(table),
@@ -147,20 +409,47 @@ class PDFParser:
         """
         Get text from a specific page.
 
+        Only that page is extracted (unless extract_text already ran).
+
         Args:
             page_number: Page number (1-indexed)
 
         Returns:
             Text content of the page
         """
-        if not self.pages:
-            self.extract_text()
+        if self.pages or self._load_from_cache():
+            if not 1 <= page_number <= len(self.pages):
+                raise ValueError(f"Page {page_number} not found (total pages: {len(self.pages)})")
+            return self.pages[page_number - 1]["text"]
+
+        return self._cached(self._text_cache, page_number, lambda page: page.extract_text() or "")
+
+    def get_page_tables(self, page_number: int) -> List[List[List]]:
+        """
+        Get tables from a specific page, extracted on demand.
 
-        for page in self.pages:
-            if page["page_number"] == page_number:
-                return page["text"]
+        Args:
+            page_number: Page number (1-indexed)
 
-        raise ValueError(f"Page {page_number} not found (total pages: {len(self.pages)})")
+        Returns:
+            Tables on the page (rows of cells)
+        """
+        if self.pages or self._load_from_cache():
+            if not 1 <= page_number <= len(self.pages):
+                raise ValueError(f"Page {page_number} not found (total pages: {len(self.pages)})")
+            return self.pages[page_number - 1]["tables"]
+
+        text = self.get_page_text(page_number) if self.table_keywords else ""
+        return self._cached(
+            self._table_cache,
+            page_number,
+            lambda page: _page_tables(page, text, self.table_keywords, self.table_stats),
+        )
+
+    def iter_page_text(self) -> Iterator:
+        """Yield (page_number, text) for every page, extracting text only"""
+        for page_number in range(1, self.page_count + 1):
+            yield page_number, self.get_page_text(page_number)
 
     def extract_with_langchain(
         self,
@@ -238,6 +527,9 @@ class PDFParser:
         Returns:
             Dictionary with PDF metadata
         """
+        if self._metadata is not None:
+            return dict(self._metadata)
+
         try:
             with open(self.pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
@@ -23,6 +23,13 @@ class SpecificationExtractor:
     - Detention/retention requirements
     """
 
+    C_VALUE_TABLE_KEYWORDS = ["runoff coefficient", "c-value", "c value", "c factor"]
+    INTENSITY_TABLE_KEYWORDS = ["rainfall intensity", "intensity", "precipitation", "noaa atlas"]
+
+    # Any table the extractor can use mentions one of these, so pages
+    # without them can skip table extraction (PDFParser table_keywords)
+    TABLE_KEYWORDS = C_VALUE_TABLE_KEYWORDS + INTENSITY_TABLE_KEYWORDS
+
     def __init__(self, pdf_parser: PDFParser):
         """
         Initialize extractor.
@@ -48,7 +55,7 @@ class SpecificationExtractor:
             List of extracted C-value specifications
         """
         if table_keywords is None:
-            table_keywords = ["runoff coefficient", "c-value", "c value", "c factor"]
+            table_keywords = self.C_VALUE_TABLE_KEYWORDS
 
         # Extract all tables
         tables = self.parser.extract_tables()
@@ -134,7 +141,7 @@ class SpecificationExtractor:
             List of rainfall intensity specifications
         """
         if search_terms is None:
-            search_terms = ["rainfall intensity", "intensity", "precipitation", "noaa atlas"]
+            search_terms = self.INTENSITY_TABLE_KEYWORDS
 
         tables = self.parser.extract_tables()
         intensity_specs = []
@@ -1,11 +1,24 @@
 """Module C - Drainage Impact Analysis (DIA) Report Generator"""
-from .rational_method import RationalMethodCalculator, TimeOfConcentration
+from .rational_method import (
+    RationalMethodCalculator,
+    TimeOfConcentration,
+    TcArrayResult,
+    TcError,
+    TcSegment,
+    PeakFlowGrid,
+    FlowError,
+)
 from .report_generator import DIAReportGenerator
 from .exhibit_generator import ExhibitGenerator
 
 __all__ = [
     "RationalMethodCalculator",
     "TimeOfConcentration",
+    "TcArrayResult",
+    "TcError",
+    "TcSegment",
+    "PeakFlowGrid",
+    "FlowError",
     "DIAReportGenerator",
     "ExhibitGenerator",
 ]
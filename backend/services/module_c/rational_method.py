@@ -2,14 +2,178 @@
 Module C - Rational Method Calculator
 Implements Q = CiA for drainage flow calculations
 """
+from dataclasses import dataclass
+from enum import IntEnum
 from typing import Dict, List, Optional, Tuple
-from decimal import Decimal, ROUND_HALF_UP
 import math
 import logging
 
+import numpy as np
+
+from ..rounding import round_builtin_array, round_half_up, round_half_up_array
+
 logger = logging.getLogger(__name__)
 
 
+class TcError(IntEnum):
+    """Per-element error codes returned by the TimeOfConcentration array methods"""
+    OK = 0
+    INVALID_FLOW_LENGTH = 1
+    INVALID_ELEVATION_CHANGE = 2
+    INVALID_CURVE_NUMBER = 3
+    INVALID_RUNOFF_COEFFICIENT = 4
+    INVALID_SLOPE = 5
+    INVALID_MANNINGS_N = 6
+    INVALID_FLOW_DEPTH = 7
+    INVALID_RAINFALL = 8
+    SHEET_FLOW_TOO_LONG = 9
+    INVALID_HYDRAULIC_RADIUS = 10
+    INVALID_FLOW_TYPE = 11
+
+
+TC_ERROR_MESSAGES = {
+    TcError.INVALID_FLOW_LENGTH: "Flow length must be positive",
+    TcError.INVALID_ELEVATION_CHANGE: "Elevation change must be positive",
+    TcError.INVALID_CURVE_NUMBER: "Curve Number must be between 30 and 100",
+    TcError.INVALID_RUNOFF_COEFFICIENT: "Runoff coefficient must be between 0.0 and 1.0",
+    TcError.INVALID_SLOPE: "Slope must be positive",
+    TcError.INVALID_MANNINGS_N: "Manning's n is missing or invalid",
+    TcError.INVALID_FLOW_DEPTH: "Flow depth must be positive",
+    TcError.INVALID_RAINFALL: "2-year 24-hour rainfall must be positive",
+    TcError.SHEET_FLOW_TOO_LONG: "Sheet flow length must not exceed 300 ft",
+    TcError.INVALID_HYDRAULIC_RADIUS: "Hydraulic radius must be positive",
+    TcError.INVALID_FLOW_TYPE: "Flow type must be sheet, shallow or channel",
+}
+
+
+class FlowError(IntEnum):
+    """Per-element error codes returned by RationalMethodCalculator.calculate_peak_flow_grid"""
+    OK = 0
+    INVALID_C_VALUE = 1
+    INVALID_INTENSITY = 2
+    INVALID_AREA = 3
+
+
+FLOW_ERROR_MESSAGES = {
+    FlowError.INVALID_C_VALUE: "C-value must be between 0.0 and 1.0",
+    FlowError.INVALID_INTENSITY: "Rainfall intensity must be positive",
+    FlowError.INVALID_AREA: "Drainage area must be positive",
+}
+
+
+@dataclass
+class PeakFlowGrid:
+    """
+    Peak flows for every basin x storm (x leading axes such as condition).
+
+    All arrays share the grid's shape; peak_flow_cfs is NaN where the
+    error code is not FlowError.OK.
+    """
+    peak_flow_cfs: np.ndarray
+    c_values: np.ndarray
+    intensities: np.ndarray
+    areas: np.ndarray
+    errors: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        return self.errors == FlowError.OK
+
+    def first_error(self) -> Optional[str]:
+        """Message for the first invalid element (None if all valid)"""
+        invalid = np.argwhere(self.errors != FlowError.OK)
+        if len(invalid) == 0:
+            return None
+        index = tuple(int(i) for i in invalid[0])
+        return f"{FLOW_ERROR_MESSAGES[FlowError(int(self.errors[index]))]} at {index}"
+
+    def total_flow(self, axis: int = -2) -> np.ndarray:
+        """Sum of valid flows over an axis (default: basins, giving flow per storm)"""
+        return np.where(self.valid, self.peak_flow_cfs, 0.0).sum(axis=axis)
+
+
+# TR-55 flow segment types, in worksheet order
+TR55_FLOW_TYPES = ("sheet", "shallow", "channel")
+
+# TR-55 sheet flow is limited to 300 ft (Manning's kinematic solution)
+MAX_SHEET_FLOW_LENGTH_FT = 300.0
+
+# TR-55 shallow concentrated flow velocity: V = k * s^0.5 (ft/s), Figure 3-1
+SHALLOW_FLOW_VELOCITY_FACTOR = {"unpaved": 16.1345, "paved": 20.3282}
+
+
+@dataclass
+class TcSegment:
+    """
+    One reach of a TR-55 flow path.
+
+    Sheet flow needs mannings_n; channel flow needs mannings_n and either
+    hydraulic_radius_ft or flow_area_sqft with wetted_perimeter_ft.
+    """
+    flow_type: str  # "sheet", "shallow" or "channel"
+    length_ft: float
+    slope: float  # ft/ft
+    mannings_n: Optional[float] = None
+    paved: bool = False  # shallow concentrated flow surface
+    hydraulic_radius_ft: Optional[float] = None
+    flow_area_sqft: Optional[float] = None
+    wetted_perimeter_ft: Optional[float] = None
+
+    @property
+    def hydraulic_radius(self) -> float:
+        if self.hydraulic_radius_ft is not None:
+            return self.hydraulic_radius_ft
+        if self.flow_area_sqft is not None and self.wetted_perimeter_ft:
+            return self.flow_area_sqft / self.wetted_perimeter_ft
+        return math.nan
+
+
+@dataclass
+class TcArrayResult:
+    """Tc values from an array method; NaN where the error code is not TcError.OK"""
+    tc_minutes: np.ndarray
+    errors: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        return self.errors == TcError.OK
+
+    def error_counts(self) -> Dict[str, int]:
+        """Number of elements per error, e.g. {"INVALID_SLOPE": 12}"""
+        codes, counts = np.unique(self.errors[self.errors != TcError.OK], return_counts=True)
+        return {TcError(code).name: int(count) for code, count in zip(codes, counts)}
+
+
+def _checked_tc(method: str, checks, compute, decimals: Optional[int]) -> TcArrayResult:
+    """
+    Apply validation masks and evaluate a Tc formula on the valid elements.
+
+    Args:
+        method: Method name for logging
+        checks: (valid_mask, error_code) pairs in the scalar method's order -
+            an element gets the code of the first check it fails
+        compute: Function of a boolean mask returning Tc for those elements
+        decimals: Round to this many places (None: unrounded)
+    """
+    shape = np.broadcast(*[valid for valid, _ in checks]).shape
+    errors = np.zeros(shape, dtype=np.int8)
+
+    for valid, code in reversed(checks):
+        errors = np.where(valid, errors, np.int8(code))
+
+    ok = errors == TcError.OK
+    tc_minutes = np.full(shape, np.nan)
+    tc_minutes[ok] = compute(ok)
+
+    if decimals is not None:
+        tc_minutes = round_builtin_array(tc_minutes, decimals)
+
+    invalid = errors.size - int(ok.sum())
+    logger.debug(f"{method} Tc array: {errors.size} elements, {invalid} invalid")
+
+    return TcArrayResult(tc_minutes=tc_minutes, errors=errors)
+
+
 class TimeOfConcentration:
     """
     Calculate Time of Concentration (Tc) using various methods.
@@ -178,6 +342,402 @@ class TimeOfConcentration:
 
         return round(tc_minutes, 2)
 
+    # ------------------------------------------------------------------
+    # Array versions - same formulas over NumPy arrays (broadcast together).
+    # Invalid elements get an error code and NaN instead of raising.
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def nrcs_array(flow_length_ft, elevation_change_ft, cn=70.0, decimals: Optional[int] = 2) -> TcArrayResult:
+        """
+        NRCS Tc for arrays of flow paths.
+
+        Args:
+            flow_length_ft: Flow path lengths in feet
+            elevation_change_ft: Elevation changes along the flow paths
+            cn: Curve Numbers
+            decimals: Round to this many places (None: unrounded)
+
+        Returns:
+            TcArrayResult with Tc minutes and TcError codes
+        """
+        length, drop, cn = np.broadcast_arrays(
+            np.asarray(flow_length_ft, dtype=np.float64),
+            np.asarray(elevation_change_ft, dtype=np.float64),
+            np.asarray(cn, dtype=np.float64),
+        )
+
+        def compute(ok):
+            L, H, CN = length[ok], drop[ok], cn[ok]
+            slope = H / L
+            tc_hours = (L ** 0.8) * ((1000 / CN - 9) ** 0.7) / (1140 * (slope ** 0.5))
+            return tc_hours * 60
+
+        with np.errstate(invalid="ignore"):
+            checks = [
+                (length > 0, TcError.INVALID_FLOW_LENGTH),
+                (drop > 0, TcError.INVALID_ELEVATION_CHANGE),
+                ((cn >= 30) & (cn <= 100), TcError.INVALID_CURVE_NUMBER),
+            ]
+        return _checked_tc("NRCS", checks, compute, decimals)
+
+    @staticmethod
+    def kirpich_array(flow_length_ft, elevation_change_ft, decimals: Optional[int] = 2) -> TcArrayResult:
+        """
+        Kirpich Tc for arrays of flow paths.
+
+        Args:
+            flow_length_ft: Flow path lengths in feet
+            elevation_change_ft: Elevation changes in feet
+            decimals: Round to this many places (None: unrounded)
+
+        Returns:
+            TcArrayResult with Tc minutes and TcError codes
+        """
+        length, drop = np.broadcast_arrays(
+            np.asarray(flow_length_ft, dtype=np.float64),
+            np.asarray(elevation_change_ft, dtype=np.float64),
+        )
+
+        def compute(ok):
+            L, H = length[ok], drop[ok]
+            return 0.0078 * (L ** 0.77) * ((H / L) ** -0.385)
+
+        with np.errstate(invalid="ignore"):
+            checks = [
+                (length > 0, TcError.INVALID_FLOW_LENGTH),
+                (drop > 0, TcError.INVALID_ELEVATION_CHANGE),
+            ]
+        return _checked_tc("Kirpich", checks, compute, decimals)
+
+    @staticmethod
+    def faa_array(flow_length_ft, runoff_coefficient, slope_percent, decimals: Optional[int] = 2) -> TcArrayResult:
+        """
+        FAA Tc for arrays of flow paths.
+
+        Negative flow lengths are flagged too (the scalar method would
+        return a complex number).
+
+        Args:
+            flow_length_ft: Flow path lengths in feet
+            runoff_coefficient: Runoff coefficients (0.0 to 1.0)
+            slope_percent: Slopes in percent
+            decimals: Round to this many places (None: unrounded)
+
+        Returns:
+            TcArrayResult with Tc minutes and TcError codes
+        """
+        length, c, slope = np.broadcast_arrays(
+            np.asarray(flow_length_ft, dtype=np.float64),
+            np.asarray(runoff_coefficient, dtype=np.float64),
+            np.asarray(slope_percent, dtype=np.float64),
+        )
+
+        def compute(ok):
+            return (1.8 * (1.1 - c[ok]) * (length[ok] ** 0.5)) / (slope[ok] ** (1/3))
+
+        with np.errstate(invalid="ignore"):
+            checks = [
+                ((c >= 0.0) & (c <= 1.0), TcError.INVALID_RUNOFF_COEFFICIENT),
+                (slope > 0, TcError.INVALID_SLOPE),
+                (length >= 0, TcError.INVALID_FLOW_LENGTH),
+            ]
+        return _checked_tc("FAA", checks, compute, decimals)
+
+    @staticmethod
+    def manning_kinematic_array(
+        flow_length_ft,
+        mannings_n,
+        slope,
+        flow_depth_ft,
+        decimals: Optional[int] = 2
+    ) -> TcArrayResult:
+        """
+        Manning's kinematic Tc for arrays of flow paths.
+
+        The scalar method doesn't validate; here inputs that make the
+        formula undefined (zero/negative slope or depth) or negative
+        lengths and roughness are flagged.
+
+        Args:
+            flow_length_ft: Flow path lengths in feet
+            mannings_n: Manning's roughness coefficients
+            slope: Slopes (ft/ft)
+            flow_depth_ft: Flow depths in feet
+            decimals: Round to this many places (None: unrounded)
+
+        Returns:
+            TcArrayResult with Tc minutes and TcError codes
+        """
+        length, n, s, depth = np.broadcast_arrays(
+            np.asarray(flow_length_ft, dtype=np.float64),
+            np.asarray(mannings_n, dtype=np.float64),
+            np.asarray(slope, dtype=np.float64),
+            np.asarray(flow_depth_ft, dtype=np.float64),
+        )
+
+        def compute(ok):
+            tc_hours = (0.007 * n[ok] * length[ok]) / ((s[ok] ** 0.5) * (depth[ok] ** 0.67))
+            return tc_hours * 60
+
+        with np.errstate(invalid="ignore"):
+            checks = [
+                (length >= 0, TcError.INVALID_FLOW_LENGTH),
+                (n >= 0, TcError.INVALID_MANNINGS_N),
+                (s > 0, TcError.INVALID_SLOPE),
+                (depth > 0, TcError.INVALID_FLOW_DEPTH),
+            ]
+        return _checked_tc("Manning", checks, compute, decimals)
+
+    @staticmethod
+    def sheet_flow_array(flow_length_ft, mannings_n, slope, p2_inches, decimals: Optional[int] = 2) -> TcArrayResult:
+        """
+        TR-55 sheet flow travel time for arrays of segments.
+
+        Formula: Tt = 0.007 * (n * L)^0.8 / (P2^0.5 * s^0.4)  (hours)
+
+        Args:
+            flow_length_ft: Sheet flow lengths in feet (300 ft maximum)
+            mannings_n: Manning's n for sheet flow (TR-55 Table 3-1)
+            slope: Land slopes (ft/ft)
+            p2_inches: 2-year, 24-hour rainfall depths in inches
+            decimals: Round to this many places (None: unrounded)
+
+        Returns:
+            TcArrayResult with travel time minutes and TcError codes
+        """
+        length, n, s, p2 = np.broadcast_arrays(
+            np.asarray(flow_length_ft, dtype=np.float64),
+            np.asarray(mannings_n, dtype=np.float64),
+            np.asarray(slope, dtype=np.float64),
+            np.asarray(p2_inches, dtype=np.float64),
+        )
+
+        def compute(ok):
+            tt_hours = 0.007 * ((n[ok] * length[ok]) ** 0.8) / ((p2[ok] ** 0.5) * (s[ok] ** 0.4))
+            return tt_hours * 60
+
+        with np.errstate(invalid="ignore"):
+            checks = [
+                (length > 0, TcError.INVALID_FLOW_LENGTH),
+                (length <= MAX_SHEET_FLOW_LENGTH_FT, TcError.SHEET_FLOW_TOO_LONG),
+                (n > 0, TcError.INVALID_MANNINGS_N),
+                (s > 0, TcError.INVALID_SLOPE),
+                (p2 > 0, TcError.INVALID_RAINFALL),
+            ]
+        return _checked_tc("Sheet flow", checks, compute, decimals)
+
+    @staticmethod
+    def shallow_flow_array(flow_length_ft, slope, paved=False, decimals: Optional[int] = 2) -> TcArrayResult:
+        """
+        TR-55 shallow concentrated flow travel time for arrays of segments.
+
+        Velocity: V = 16.1345 * s^0.5 (unpaved) or 20.3282 * s^0.5 (paved) ft/s
+
+        Args:
+            flow_length_ft: Flow lengths in feet
+            slope: Watercourse slopes (ft/ft)
+            paved: Paved surface flags
+            decimals: Round to this many places (None: unrounded)
+
+        Returns:
+            TcArrayResult with travel time minutes and TcError codes
+        """
+        length, s, paved = np.broadcast_arrays(
+            np.asarray(flow_length_ft, dtype=np.float64),
+            np.asarray(slope, dtype=np.float64),
+            np.asarray(paved, dtype=bool),
+        )
+
+        def compute(ok):
+            factor = np.where(
+                paved[ok], SHALLOW_FLOW_VELOCITY_FACTOR["paved"], SHALLOW_FLOW_VELOCITY_FACTOR["unpaved"]
+            )
+            velocity = factor * (s[ok] ** 0.5)
+            return length[ok] / velocity / 60
+
+        with np.errstate(invalid="ignore"):
+            checks = [
+                (length > 0, TcError.INVALID_FLOW_LENGTH),
+                (s > 0, TcError.INVALID_SLOPE),
+            ]
+        return _checked_tc("Shallow flow", checks, compute, decimals)
+
+    @staticmethod
+    def channel_flow_array(
+        flow_length_ft,
+        mannings_n,
+        slope,
+        hydraulic_radius_ft,
+        decimals: Optional[int] = 2
+    ) -> TcArrayResult:
+        """
+        TR-55 channel flow travel time for arrays of segments.
+
+        Velocity from Manning's equation: V = 1.49 * r^(2/3) * s^0.5 / n (ft/s)
+
+        Args:
+            flow_length_ft: Channel lengths in feet
+            mannings_n: Manning's n for the channels
+            slope: Channel slopes (ft/ft)
+            hydraulic_radius_ft: Hydraulic radii (flow area / wetted perimeter)
+            decimals: Round to this many places (None: unrounded)
+
+        Returns:
+            TcArrayResult with travel time minutes and TcError codes
+        """
+        length, n, s, r = np.broadcast_arrays(
+            np.asarray(flow_length_ft, dtype=np.float64),
+            np.asarray(mannings_n, dtype=np.float64),
+            np.asarray(slope, dtype=np.float64),
+            np.asarray(hydraulic_radius_ft, dtype=np.float64),
+        )
+
+        def compute(ok):
+            velocity = 1.49 * (r[ok] ** (2 / 3)) * (s[ok] ** 0.5) / n[ok]
+            return length[ok] / velocity / 60
+
+        with np.errstate(invalid="ignore"):
+            checks = [
+                (length > 0, TcError.INVALID_FLOW_LENGTH),
+                (n > 0, TcError.INVALID_MANNINGS_N),
+                (s > 0, TcError.INVALID_SLOPE),
+                (r > 0, TcError.INVALID_HYDRAULIC_RADIUS),
+            ]
+        return _checked_tc("Channel flow", checks, compute, decimals)
+
+    @staticmethod
+    def tr55_segmented(segments: List, p2_inches: float) -> Dict:
+        """
+        Calculate Tc for one flow path as the sum of TR-55 segment travel times.
+
+        Args:
+            segments: TcSegment objects (or dicts of their fields), upstream to downstream
+            p2_inches: 2-year, 24-hour rainfall depth in inches
+
+        Returns:
+            Dictionary with sheet/shallow/channel lengths and travel times
+            (the keys TOCExcelUpdater.update_toc_calculations reads) plus tc_total
+
+        Raises:
+            ValueError: If a segment is invalid
+        """
+        result = TimeOfConcentration.tr55_segmented_batch({"path": segments}, p2_inches)["path"]
+
+        if "error" in result:
+            raise ValueError(result["error"])
+
+        return result
+
+    @staticmethod
+    def tr55_segmented_batch(flow_paths: Dict[str, List], p2_inches: float) -> Dict[str, Dict]:
+        """
+        Calculate TR-55 segmented Tc for many flow paths in one pass.
+
+        Segments of every path are flattened into arrays, each flow type's
+        travel times are computed with one array call, and the components
+        are summed per path. Components are rounded to 0.01 min and tc_total
+        is the sum of the rounded components, matching the TOC worksheet's
+        total formula.
+
+        Args:
+            flow_paths: Segments (TcSegment or dicts) keyed by area label
+            p2_inches: 2-year, 24-hour rainfall depth in inches
+
+        Returns:
+            Results keyed by area label, ready to pass as toc_data to
+            TOCExcelUpdater.update_toc_calculations. A path with an invalid
+            segment gets an "error" message instead of travel times.
+        """
+        labels = list(flow_paths)
+        path_index, type_code, rows = [], [], []
+
+        for i, label in enumerate(labels):
+            for segment in flow_paths[label]:
+                if not isinstance(segment, TcSegment):
+                    segment = TcSegment(**segment)
+                path_index.append(i)
+                type_code.append(
+                    TR55_FLOW_TYPES.index(segment.flow_type.lower())
+                    if segment.flow_type.lower() in TR55_FLOW_TYPES else -1
+                )
+                rows.append((
+                    segment.length_ft,
+                    segment.slope,
+                    math.nan if segment.mannings_n is None else segment.mannings_n,
+                    segment.paved,
+                    segment.hydraulic_radius,
+                ))
+
+        path_index = np.asarray(path_index, dtype=np.int64)
+        type_code = np.asarray(type_code, dtype=np.int64)
+        length, slope, n, paved, radius = (
+            np.asarray(column, dtype=np.float64) for column in zip(*rows)
+        ) if rows else (np.empty(0),) * 5
+
+        travel = np.full(len(rows), np.nan)
+        errors = np.full(len(rows), TcError.INVALID_FLOW_TYPE, dtype=np.int8)
+
+        for code, flow_type in enumerate(TR55_FLOW_TYPES):
+            mask = type_code == code
+            if not mask.any():
+                continue
+            if flow_type == "sheet":
+                segment_tt = TimeOfConcentration.sheet_flow_array(
+                    length[mask], n[mask], slope[mask], p2_inches, decimals=None
+                )
+            elif flow_type == "shallow":
+                segment_tt = TimeOfConcentration.shallow_flow_array(
+                    length[mask], slope[mask], paved[mask].astype(bool), decimals=None
+                )
+            else:
+                segment_tt = TimeOfConcentration.channel_flow_array(
+                    length[mask], n[mask], slope[mask], radius[mask], decimals=None
+                )
+            travel[mask] = segment_tt.tc_minutes
+            errors[mask] = segment_tt.errors
+
+        valid = errors == TcError.OK
+        bins = path_index * len(TR55_FLOW_TYPES) + np.maximum(type_code, 0)
+        size = len(labels) * len(TR55_FLOW_TYPES)
+        minutes = np.bincount(bins[valid], weights=travel[valid], minlength=size).reshape(-1, 3)
+        lengths = np.bincount(bins[valid], weights=length[valid], minlength=size).reshape(-1, 3)
+
+        results = {}
+        for i, label in enumerate(labels):
+            if not flow_paths[label]:
+                results[label] = {"error": "Flow path has no segments"}
+                continue
+
+            segment_errors = errors[path_index == i]
+            bad = segment_errors[segment_errors != TcError.OK]
+            if len(bad):
+                position = int(np.flatnonzero(segment_errors != TcError.OK)[0])
+                results[label] = {
+                    "error": f"Segment {position + 1}: {TC_ERROR_MESSAGES[TcError(int(bad[0]))]}",
+                }
+                continue
+
+            tc_sheet, tc_shallow, tc_channel = (round(float(value), 2) for value in minutes[i])
+            results[label] = {
+                "sheet_flow_length": round(float(lengths[i, 0]), 2),
+                "shallow_flow_length": round(float(lengths[i, 1]), 2),
+                "channel_flow_length": round(float(lengths[i, 2]), 2),
+                "tc_sheet": tc_sheet,
+                "tc_shallow": tc_shallow,
+                "tc_channel": tc_channel,
+                "tc_total": round(tc_sheet + tc_shallow + tc_channel, 2),
+                "method": "TR-55",
+            }
+
+        failed = sum(1 for result in results.values() if "error" in result)
+        logger.info(
+            f"TR-55 Tc: {len(labels)} flow paths, {len(rows)} segments"
+            + (f" ({failed} invalid)" if failed else "")
+        )
+
+        return results
+
 
 class RationalMethodCalculator:
     """
@@ -240,7 +800,7 @@ class RationalMethodCalculator:
         peak_flow = c_value * intensity_in_per_hr * area_acres
 
         # Round to specified precision
-        peak_flow = self._round_decimal(peak_flow, self.precision)
+        peak_flow = round_half_up(peak_flow, self.precision)
 
         logger.info(
             f"Rational Method: Q = {c_value:.3f} × {intensity_in_per_hr:.4f} × {area_acres:.4f} = {peak_flow:.3f} cfs"
@@ -255,6 +815,55 @@ class RationalMethodCalculator:
             "method": "Rational Method",
         }
 
+    def calculate_peak_flow_grid(self, c_values, intensities, areas) -> PeakFlowGrid:
+        """
+        Calculate peak flows for many basins and storms at once: Q = CiA.
+
+        Inputs broadcast on a (..., basin, storm) grid - C and A are per
+        basin, i is per basin and storm. Extra leading axes (e.g. existing
+        vs. proposed conditions) are carried through, so
+        C[condition, basin], i[condition, basin, storm] and A[basin] give
+        flows[condition, basin, storm].
+
+        Invalid elements get a FlowError code and NaN instead of raising.
+        Flows are rounded half-up to `precision` places exactly like
+        calculate_peak_flow.
+
+        Args:
+            c_values: Runoff coefficients, shape (..., basins)
+            intensities: Rainfall intensities (in/hr), shape (..., basins, storms)
+            areas: Drainage areas (acres), shape (..., basins)
+
+        Returns:
+            PeakFlowGrid with flows, broadcast inputs and error codes
+        """
+        c = np.asarray(c_values, dtype=np.float64)[..., None]
+        a = np.asarray(areas, dtype=np.float64)[..., None]
+        c, i, a = np.broadcast_arrays(c, np.asarray(intensities, dtype=np.float64), a)
+
+        errors = np.zeros(c.shape, dtype=np.int8)
+        with np.errstate(invalid="ignore"):
+            errors = np.where(a > 0, errors, np.int8(FlowError.INVALID_AREA))
+            errors = np.where(i > 0, errors, np.int8(FlowError.INVALID_INTENSITY))
+            errors = np.where((c >= 0.0) & (c <= 1.0), errors, np.int8(FlowError.INVALID_C_VALUE))
+
+        valid = errors == FlowError.OK
+        peak_flow = np.full(c.shape, np.nan)
+        peak_flow[valid] = round_half_up_array(c[valid] * i[valid] * a[valid], self.precision)
+
+        logger.info(
+            f"Rational Method grid: {peak_flow.size} flows {peak_flow.shape}, "
+            f"{peak_flow.size - int(valid.sum())} invalid"
+        )
+
+        return PeakFlowGrid(
+            peak_flow_cfs=peak_flow,
+            c_values=c,
+            intensities=i,
+            areas=a,
+            errors=errors,
+        )
+
     def calculate_multi_storm(
         self,
         c_value: float,
@@ -321,7 +930,7 @@ class RationalMethodCalculator:
         )
 
         return {
-            "composite_flow_cfs": self._round_decimal(total_flow, self.precision),
+            "composite_flow_cfs": round_half_up(total_flow, self.precision),
             "num_sub_areas": len(sub_area_flows),
             "controlling_tc_minutes": min_tc,
             "method": "Peak Flow Summation",
@@ -353,19 +962,11 @@ class RationalMethodCalculator:
             "pre_development_flow_cfs": pre_dev_flow_cfs,
             "post_development_flow_cfs": post_dev_flow_cfs,
             "target_flow_cfs": target_flow,
-            "reduction_required_cfs": self._round_decimal(reduction_required, self.precision),
+            "reduction_required_cfs": round_half_up(reduction_required, self.precision),
             "flow_increase_percent": round(increase_percent, 1),
             "detention_required": reduction_required > 0,
         }
 
-    def _round_decimal(self, value: float, decimal_places: int) -> float:
-        """Round to specified decimal places using ROUND_HALF_UP"""
-        if value is None:
-            return 0.0
-        d = Decimal(str(value))
-        rounded = d.quantize(Decimal(10) ** -decimal_places, rounding=ROUND_HALF_UP)
-        return float(rounded)
-
     def validate_accuracy(
         self,
         calculated_q: float,
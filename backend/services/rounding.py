@@ -0,0 +1,127 @@
+"""
+Shared numeric rounding for the calculators.
+
+Engineering values are rounded ROUND_HALF_UP on their decimal representation:
+the result of every function here is bit-identical to
+
+    float(Decimal(str(value)).quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_UP))
+
+Most values are rounded in plain float arithmetic. The decimal string only
+decides the result when the scaled value sits within float error of a .5 tie
+(2.675 is stored as 2.67499999...), so those values - and anything non-finite,
+too large to scale exactly, or rounded to negative places - go through Decimal.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+import math
+
+import numpy as np
+
+# Scaled values at or above 2**52 have no fractional bits left to round
+MAX_EXACT_SCALED = 2.0 ** 52
+
+# Widest scale where 10**places is an exact double
+MAX_EXACT_PLACES = 22
+
+
+def _near_tie(scaled: float) -> bool:
+    """True if float error could put `scaled` on either side of a .5 tie"""
+    return abs(scaled - math.floor(scaled) - 0.5) <= scaled * 1e-12 + 1e-9
+
+
+def round_half_up_decimal(value: float, decimal_places: int) -> float:
+    """Reference ROUND_HALF_UP through Decimal(str(value))"""
+    if value is None:
+        return 0.0
+    rounded = Decimal(str(value)).quantize(Decimal(1).scaleb(-decimal_places), rounding=ROUND_HALF_UP)
+    return float(rounded)
+
+
+def round_half_up(value: float, decimal_places: int) -> float:
+    """
+    Round to decimal places using ROUND_HALF_UP (half away from zero).
+
+    Args:
+        value: Number to round (None rounds to 0.0)
+        decimal_places: Places after the decimal point
+
+    Returns:
+        Rounded float, identical to round_half_up_decimal
+    """
+    # float64 (incl. np.float64) and int only: float32 prints shorter than
+    # its float64 value, and Decimal/None/bool keep the reference behaviour
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, (float, int))
+        or not 0 <= decimal_places <= MAX_EXACT_PLACES
+    ):
+        return round_half_up_decimal(value, decimal_places)
+
+    scale = 10.0 ** decimal_places
+    scaled = math.fabs(value) * scale
+
+    if not scaled < MAX_EXACT_SCALED or _near_tie(scaled):
+        return round_half_up_decimal(value, decimal_places)
+
+    return math.copysign(math.floor(scaled + 0.5), value) / scale
+
+
+def round_half_up_array(values, decimal_places: int) -> np.ndarray:
+    """
+    Vectorized round_half_up, matching it element for element.
+
+    Args:
+        values: Array-like of numbers
+        decimal_places: Places after the decimal point
+
+    Returns:
+        float64 array of rounded values with the input's shape
+    """
+    values = np.array(values, dtype=np.float64)
+    if not 0 <= decimal_places <= MAX_EXACT_PLACES:
+        flat = values.reshape(-1)
+        for idx in range(flat.size):
+            flat[idx] = round_half_up_decimal(float(flat[idx]), decimal_places)
+        return values
+
+    scale = 10.0 ** decimal_places
+    scaled = np.abs(values) * scale
+
+    rounded = np.copysign(np.floor(scaled + 0.5), values) / scale
+
+    with np.errstate(invalid="ignore"):
+        fraction = scaled - np.floor(scaled)
+        ambiguous = (
+            (np.abs(fraction - 0.5) <= scaled * 1e-12 + 1e-9)
+            | ~np.isfinite(scaled)
+            | (scaled >= MAX_EXACT_SCALED)
+        )
+
+    flat_values = values.reshape(-1)
+    flat_rounded = rounded.reshape(-1)
+    for idx in np.flatnonzero(ambiguous):
+        flat_rounded[idx] = round_half_up_decimal(float(flat_values[idx]), decimal_places)
+
+    return rounded
+
+
+def round_builtin_array(values, decimal_places: int) -> np.ndarray:
+    """
+    Vectorized Python round(value, places), matching it element for element.
+
+    np.round scales by 10**places before rounding, so it can disagree with
+    round() near ties; those values are rounded individually with round().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, decimal_places)
+
+    scaled = np.abs(values) * 10.0 ** decimal_places
+    with np.errstate(invalid="ignore"):
+        fraction = scaled - np.floor(scaled)
+        ambiguous = (np.abs(fraction - 0.5) <= scaled * 1e-12 + 1e-9) | ~np.isfinite(values)
+
+    flat_values = values.reshape(-1)
+    flat_rounded = rounded.reshape(-1)
+    for idx in np.flatnonzero(ambiguous):
+        flat_rounded[idx] = round(float(flat_values[idx]), decimal_places)
+
+    return rounded
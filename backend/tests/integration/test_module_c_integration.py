@@ -5,6 +5,8 @@ Tests the complete workflow with real Acadiana High data
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -14,7 +16,7 @@ from backend.services.module_c import (
     DIAReportGenerator,
     ExhibitGenerator,
 )
-from backend.services.module_b import NOAAAtlas14Parser
+from backend.services.module_b import NOAAAtlas14Parser, IDFRegistry, LAFAYETTE_NOAA_ATLAS_14
 
 
 class TestModuleCIntegration:
@@ -167,6 +169,122 @@ class TestModuleCIntegration:
         print(f"   10 min, 10-year: {i_10_10min:.2f} in/hr")
         print(f"   12.5 min, 10-year (interpolated): {i_12_10year:.2f} in/hr")
 
+    def test_noaa_idf_table_batch(self):
+        """Batch lookups match the scalar methods; log-log bends with the curve"""
+        noaa = NOAAAtlas14Parser()
+        noaa.load_standard_lafayette_data()
+
+        durations = np.array([5, 7.5, 10, 12.5, 22.0, 60, 90, 3])
+        periods = [10, 25, 50, 100, 500]
+        batch = noaa.intensities(durations[:, None], periods)
+
+        assert batch.shape == (8, 5)
+        for i, duration in enumerate(durations.tolist()):
+            for j, period in enumerate(periods):
+                expected = noaa.interpolate_intensity(duration, period)
+                if expected is None:
+                    assert np.isnan(batch[i, j])
+                else:
+                    assert batch[i, j] == expected
+
+        # A column with a single tabulated duration still resolves exact matches
+        sparse = NOAAAtlas14Parser()
+        sparse.data = [
+            {"duration_minutes": 10, "return_period_years": 10, "intensity_in_per_hr": 7.0},
+            {"duration_minutes": 5, "return_period_years": 25, "intensity_in_per_hr": 9.5},
+            {"duration_minutes": 15, "return_period_years": 25, "intensity_in_per_hr": 7.5},
+        ]
+        sparse_durations = [5, 10, 12.5, 15]
+        sparse_batch = sparse.intensities(np.array(sparse_durations)[:, None], [10, 25])
+        for i, duration in enumerate(sparse_durations):
+            for j, period in enumerate([10, 25]):
+                expected = sparse.interpolate_intensity(duration, period)
+                if expected is None:
+                    assert np.isnan(sparse_batch[i, j])
+                else:
+                    assert sparse_batch[i, j] == expected
+        assert sparse_batch[1, 0] == 7.0
+
+        # Intensity is convex in duration, so log-log sits below the chord
+        linear = noaa.interpolate_intensity(12.5, 10)
+        log_log = noaa.interpolate_intensity(12.5, 10, log_log=True)
+        assert log_log < linear
+        assert noaa.intensities(12.5, 10, log_log=True) == log_log
+
+        # The compiled table follows changes to the record list
+        noaa.data = [r for r in noaa.data if r["duration_minutes"] != 10]
+        assert noaa.get_intensity(10, 10) is None
+        assert noaa.interpolate_intensity(10, 10) == round(8.92 + (6.38 - 8.92) * 0.5, 4)
+
+        # Same-length in-place edits need an explicit invalidate()
+        noaa.data[0] = dict(noaa.data[0], intensity_in_per_hr=99.0)
+        noaa.invalidate()
+        assert noaa.get_intensity(noaa.data[0]["duration_minutes"], noaa.data[0]["return_period_years"]) == 99.0
+
+    def test_dia_intensity_matrix_resolves_unique_pairs(self):
+        """The DIA report looks up each distinct (Tc, storm) pair once"""
+        from api.routes.dia_report import _intensity_matrix
+
+        noaa = NOAAAtlas14Parser()
+        noaa.load_standard_lafayette_data()
+
+        batches = []
+        intensities = noaa.intensities
+
+        def counting_intensities(durations, return_periods, log_log=False):
+            batches.append(len(durations))
+            return intensities(durations, return_periods, log_log=log_log)
+
+        noaa.intensities = counting_intensities
+
+        # Three areas share the default Tc; 2000 min is past the 24-hour table
+        tc_values = [12.5, 12.5, 20.0, 12.5, 2000.0]
+        return_periods = [10, 25, 100]
+        matrix, stats = _intensity_matrix(noaa, tc_values, return_periods)
+
+        assert batches == [9]  # 3 distinct Tc x 3 storms, in one batch
+        assert matrix.shape == (5, 3)
+        for b, tc_minutes in enumerate(tc_values):
+            for s, return_period in enumerate(return_periods):
+                expected = noaa.interpolate_intensity(tc_minutes, return_period)
+                assert matrix[b, s] == (7.0 if expected is None else expected)
+
+        # Stored as results_summary["intensity_lookup"]
+        assert stats == {
+            "pairs": 15,
+            "unique_pairs": 9,
+            "cache_hits": 6,
+            "cache_hit_rate": 0.4,
+            "fallback_pairs": 3,
+        }
+
+    def test_idf_registry_shares_compiled_tables(self):
+        """One compiled table per dataset; specs rows replace it only when they change"""
+        registry = IDFRegistry()
+
+        first = registry.parser()
+        second = registry.parser()
+        assert first.idf_table is second.idf_table
+        assert first.interpolate_intensity(12.5, 10) == 6.815
+        assert not registry.dataset().table.intensity_grid.flags.writeable
+
+        specs = [
+            {
+                "jurisdiction": LAFAYETTE_NOAA_ATLAS_14[0],
+                "section_reference": LAFAYETTE_NOAA_ATLAS_14[1],
+                "duration_minutes": duration,
+                "return_period_years": 10,
+                "intensity_in_per_hr": intensity,
+            }
+            for duration, intensity in [(5, 9.0), (15, 6.0)]
+        ]
+        assert registry.refresh_from_specs(specs, version=(2, "t1"))
+        assert not registry.refresh_from_specs([], version=(2, "t1"))
+        assert registry.parser().interpolate_intensity(10, 10) == 7.5
+
+        registry.clear()
+        assert registry.parser().get_intensity(10, 10) == 7.25
+
     def test_report_generator_initialization(self):
         """Test DIA report generator initialization"""
         import tempfile
@@ -8,9 +8,15 @@ from pathlib import Path
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import numpy as np
+import pytest
+
 from backend.services.module_c.rational_method import (
     RationalMethodCalculator,
     TimeOfConcentration,
+    TcError,
+    TcSegment,
+    FlowError,
 )
 
 
@@ -279,6 +285,156 @@ def test_full_acadiana_high_simulation():
     return all_results
 
 
+def test_tc_arrays_match_scalar_methods():
+    """Array Tc methods agree with the scalar methods element by element"""
+    rng = np.random.default_rng(7)
+    lengths = rng.uniform(50, 3000, 200)
+    drops = rng.uniform(0.5, 40, 200)
+    cns = rng.uniform(30, 100, 200)
+    c_values = rng.uniform(0, 1, 200)
+    slopes = drops / lengths
+
+    tc = TimeOfConcentration()
+    nrcs = tc.nrcs_array(lengths, drops, cns)
+    kirpich = tc.kirpich_array(lengths, drops)
+    faa = tc.faa_array(lengths, c_values, slopes * 100)
+    manning = tc.manning_kinematic_array(lengths, 0.013, slopes, 0.5)
+
+    for i in range(200):
+        assert nrcs.tc_minutes[i] == tc.nrcs_method(lengths[i], drops[i], cns[i])
+        assert kirpich.tc_minutes[i] == tc.kirpich_method(lengths[i], drops[i])
+        assert faa.tc_minutes[i] == tc.faa_method(lengths[i], c_values[i], slopes[i] * 100)
+        assert manning.tc_minutes[i] == tc.manning_kinematic(lengths[i], 0.013, slopes[i], 0.5)
+
+    assert nrcs.valid.all() and kirpich.valid.all() and faa.valid.all() and manning.valid.all()
+
+
+def test_tc_array_error_codes():
+    """Invalid elements get the code of the first failed check and NaN"""
+    tc = TimeOfConcentration()
+
+    result = tc.nrcs_array(
+        flow_length_ft=[500.0, 0.0, 500.0, -1.0, 500.0],
+        elevation_change_ft=[10.0, 10.0, 0.0, 0.0, 10.0],
+        cn=[70.0, 70.0, 70.0, 70.0, 120.0],
+    )
+
+    assert list(result.errors) == [
+        TcError.OK,
+        TcError.INVALID_FLOW_LENGTH,
+        TcError.INVALID_ELEVATION_CHANGE,
+        TcError.INVALID_FLOW_LENGTH,
+        TcError.INVALID_CURVE_NUMBER,
+    ]
+    assert result.tc_minutes[0] == tc.nrcs_method(500.0, 10.0, 70.0)
+    assert np.isnan(result.tc_minutes[1:]).all()
+    assert result.error_counts() == {
+        "INVALID_FLOW_LENGTH": 2,
+        "INVALID_ELEVATION_CHANGE": 1,
+        "INVALID_CURVE_NUMBER": 1,
+    }
+
+    faa = tc.faa_array(500.0, [0.5, 1.5, np.nan], [2.0, 2.0, 2.0])
+    assert list(faa.errors) == [TcError.OK, TcError.INVALID_RUNOFF_COEFFICIENT, TcError.INVALID_RUNOFF_COEFFICIENT]
+
+
+def test_tc_array_sensitivity_sweep():
+    """Broadcasting a grid of parameters gives one Tc per combination"""
+    lengths = np.linspace(100, 2000, 100)[:, None, None]
+    drops = np.linspace(1, 20, 100)[None, :, None]
+    cns = np.linspace(40, 98, 10)[None, None, :]
+
+    result = TimeOfConcentration.nrcs_array(lengths, drops, cns, decimals=None)
+
+    assert result.tc_minutes.shape == (100, 100, 10)
+    assert result.valid.all()
+    # Tc falls as CN rises
+    assert (np.diff(result.tc_minutes, axis=2) < 0).all()
+
+
+def test_tr55_segmented_example():
+    """TR-55 Example 3-1: sheet, shallow concentrated and channel flow"""
+    result = TimeOfConcentration.tr55_segmented(
+        [
+            TcSegment("sheet", 100, 0.01, mannings_n=0.24),
+            TcSegment("shallow", 1400, 0.01),
+            TcSegment("channel", 7300, 0.005, mannings_n=0.05, flow_area_sqft=27, wetted_perimeter_ft=28.2),
+        ],
+        p2_inches=3.6,
+    )
+
+    # TR-55 worksheet: 0.30 + 0.24 + 1.01 = 1.55 hr (velocities rounded there)
+    assert abs(result["tc_sheet"] / 60 - 0.30) < 0.01
+    assert abs(result["tc_shallow"] / 60 - 0.24) < 0.01
+    assert abs(result["tc_channel"] / 60 - 1.01) < 0.03
+    assert result["tc_total"] == round(result["tc_sheet"] + result["tc_shallow"] + result["tc_channel"], 2)
+    assert result["channel_flow_length"] == 7300
+
+
+def test_tr55_segmented_batch():
+    """Batch results per area; invalid paths report an error without failing the rest"""
+    paths = {
+        "E-DA1": [{"flow_type": "sheet", "length_ft": 100, "slope": 0.02, "mannings_n": 0.15}],
+        "E-DA2": [
+            {"flow_type": "shallow", "length_ft": 300, "slope": 0.01, "paved": True},
+            {"flow_type": "shallow", "length_ft": 200, "slope": 0.01, "paved": True},
+        ],
+        "E-DA3": [{"flow_type": "sheet", "length_ft": 450, "slope": 0.02, "mannings_n": 0.15}],
+    }
+
+    results = TimeOfConcentration.tr55_segmented_batch(paths, p2_inches=5.0)
+
+    assert results["E-DA1"]["tc_sheet"] == results["E-DA1"]["tc_total"]
+    assert results["E-DA2"]["shallow_flow_length"] == 500
+    assert abs(results["E-DA2"]["tc_shallow"] - 500 / (20.3282 * 0.1) / 60) < 0.01
+    assert "300 ft" in results["E-DA3"]["error"]
+
+    with pytest.raises(ValueError):
+        TimeOfConcentration.tr55_segmented(paths["E-DA3"], p2_inches=5.0)
+
+
+def test_peak_flow_grid_matches_scalar():
+    """Grid flows equal calculate_peak_flow, including half-up ties"""
+    calc = RationalMethodCalculator()
+    rng = np.random.default_rng(17)
+    c_values = np.round(rng.uniform(0.1, 0.95, 50), 3)
+    areas = np.round(rng.uniform(0.05, 40.0, 50), 3)
+    intensities = np.round(rng.uniform(2.0, 14.0, (50, 4)), 2)
+
+    # Exact ties: 0.5 * 1.0 * 0.025 = 0.0125, 0.5 * 1.0 * 0.035 = 0.0175
+    c_values[:2] = 0.5
+    areas[:2] = [0.025, 0.035]
+    intensities[:2] = 1.0
+
+    grid = calc.calculate_peak_flow_grid(c_values, intensities, areas)
+
+    assert grid.peak_flow_cfs.shape == (50, 4)
+    assert grid.valid.all()
+    for b in range(50):
+        for s in range(4):
+            expected = calc.calculate_peak_flow(c_values[b], intensities[b, s], areas[b])
+            assert grid.peak_flow_cfs[b, s] == expected["peak_flow_cfs"]
+
+
+def test_peak_flow_grid_masks_and_conditions():
+    """Invalid inputs are flagged per element; leading axes broadcast"""
+    calc = RationalMethodCalculator()
+    c_values = [[0.50, 1.20, 0.60], [0.70, 0.80, 0.90]]  # existing / proposed
+    intensities = [[7.0, 9.0], [7.0, 9.0], [0.0, 9.0]]
+    areas = [2.0, 3.0, -1.0]
+
+    grid = calc.calculate_peak_flow_grid(c_values, intensities, areas)
+
+    assert grid.peak_flow_cfs.shape == (2, 3, 2)
+    assert grid.errors[0, 1, 0] == FlowError.INVALID_C_VALUE
+    assert grid.errors[1, 2, 0] == FlowError.INVALID_INTENSITY
+    assert grid.errors[1, 2, 1] == FlowError.INVALID_AREA
+    assert np.isnan(grid.peak_flow_cfs[~grid.valid]).all()
+    assert grid.peak_flow_cfs[1, 0, 1] == 0.7 * 9.0 * 2.0
+    assert grid.total_flow()[0, 0] == 0.5 * 7.0 * 2.0
+    assert grid.first_error().startswith("C-value")
+
+
 if __name__ == "__main__":
     """Run all tests"""
     print("\n" + "🚀"*40)
@@ -1,8 +1,45 @@
 """
 Unit tests for Module A - Area Calculation Engine
 """
+import shutil
+import time
+from pathlib import Path
+
 import pytest
-from backend.services.module_a import AreaCalculator, WeightedCValueCalculator
+import numpy as np
+from backend.services.module_a import (
+    AreaCalculator,
+    WeightedCValueCalculator,
+    SurveyCSVParser,
+    SurveyCache,
+    BatchAreaCalculator,
+    CValueResolver,
+    FlowRouter,
+    SurfaceModel,
+    TINCache,
+    TOCExcelUpdater,
+    TOCWorkbookReader,
+    import_toc_directory,
+)
+from backend.services.module_a.csv_parser import SurveyPoint, SurveyPointArray
+from backend.services.module_a.formula_evaluator import FormulaEvaluator, FormulaError
+from backend.services.module_a.surface_model import DEMGrid
+
+
+SURVEY_CSV = (
+    "Point Name,Northing,Easting,Elevation,Point Code,Operator Name,Work Order Name\n"
+    "100,620962.880,3042325.337,28.367,CP1,,Storm Topo\n"
+    "101,620257.693,3041215.901,30.199,CP2,,Storm Topo\n"
+    "2200,620791.13,3041780.15,29.87,CB INV,,Storm Topo\n"
+    "2201,620873.11,3041781.81,,CB INV,,Storm Topo\n"
+)
+
+
+@pytest.fixture
+def survey_csv(tmp_path):
+    path = tmp_path / "survey.csv"
+    path.write_text(SURVEY_CSV)
+    return path
 
 
 class TestAreaCalculator:
@@ -45,6 +82,62 @@ class TestAreaCalculator:
         assert result["pervious_area_sqft"] == 30000.0
         assert result["impervious_percentage"] == 25.0
 
+    def test_calculate_polygon_areas_matches_scalar(self):
+        """Test the batch API matches calculate_polygon_area for every polygon"""
+        calc = AreaCalculator()
+
+        polygons = [
+            [[0, 0], [100, 0], [100, 100], [0, 100]],
+            [[10.123, 5.456], [40.789, 7.001], [25.5, 33.333]],
+            [[0, 0], [10, 10], [10, 0], [0, 10]],  # Self-intersecting, fixed with buffer(0)
+        ]
+
+        batch = calc.calculate_polygon_areas(polygons)
+
+        for idx, coords in enumerate(polygons):
+            single = calc.calculate_polygon_area(coords)
+            for key, value in single.items():
+                assert batch[key][idx] == value
+
+    def test_calculate_polygon_areas_rejects_degenerate(self):
+        """Test the batch API raises ValueError for polygons under 3 vertices"""
+        calc = AreaCalculator()
+
+        with pytest.raises(ValueError):
+            calc.calculate_polygon_areas([[[0, 0], [1, 0], [1, 1]], [[0, 0], [100, 0]]])
+
+    def test_split_areas_overlay(self):
+        """Test overlay mode counts overlaps once and clips to the basin"""
+        calc = AreaCalculator()
+
+        total = [[0, 0], [200, 0], [200, 200], [0, 200]]
+        impervious = [
+            [[0, 0], [100, 0], [100, 100], [0, 100]],
+            [[50, 50], [150, 50], [150, 150], [50, 150]],  # Overlaps the first by 2,500 sqft
+            [[150, 150], [250, 150], [250, 250], [150, 250]],  # 2,500 sqft inside the basin
+            [[300, 300], [310, 300], [310, 310]],  # Entirely outside
+        ]
+
+        result = calc.calculate_split_areas(total, impervious, overlay=True)
+
+        assert result["impervious_area_sqft"] == 20000.0
+        assert result["pervious_area_sqft"] == 20000.0
+        assert result["impervious_percentage"] == 50.0
+
+    def test_split_areas_overlay_matches_sum_when_disjoint(self):
+        """Test overlay and summing agree for disjoint features inside the basin"""
+        calc = AreaCalculator()
+
+        total = [[0, 0], [200, 0], [200, 200], [0, 200]]
+        impervious = [
+            [[0, 0], [100, 0], [100, 100], [0, 100]],
+            [[100, 0], [150, 0], [150, 50]],  # Shares an edge with the first
+            [[120, 120], [180, 120], [180, 180], [120, 180]],
+        ]
+
+        assert (calc.calculate_split_areas(total, impervious, overlay=True)
+                == calc.calculate_split_areas(total, impervious))
+
     def test_invalid_polygon_raises_error(self):
         """Test that invalid polygon raises ValueError"""
         calc = AreaCalculator()
@@ -128,6 +221,897 @@ class TestWeightedCValueCalculator:
         result = calc.calculate_weighted_c(land_use)
         assert result["weighted_c_value"] == 0.750
 
+    def test_fuzzy_land_use_names(self):
+        """Test free-text land use names resolve to lookup keys"""
+        calc = WeightedCValueCalculator()
+
+        result = calc.calculate_weighted_c({
+            "Asphalt Pavement": 50000,
+            "Grass Flat": 50000,
+        })
+
+        assert result["breakdown"]["Asphalt Pavement"]["c_value"] == 0.90
+        assert result["breakdown"]["Grass Flat"]["c_value"] == 0.10
+        assert result["weighted_c_value"] == 0.500
+
+    def test_calculate_matrix_matches_per_basin(self):
+        """Test matrix weighted C-values match calculate_weighted_c"""
+        calc = WeightedCValueCalculator()
+        land_uses = ["pavement", "roof", "grass_flat"]
+        areas = np.array([
+            [50000, 0, 50000],
+            [60, 12, 28],
+            [12345.6, 789.1, 2345.6],
+        ])
+
+        result = calc.calculate_matrix(areas, land_uses, include_breakdown=True)
+
+        for i, row in enumerate(areas):
+            expected = calc.calculate_weighted_c(dict(zip(land_uses, row.tolist())))
+            assert result["weighted_c_values"][i] == expected["weighted_c_value"]
+            assert result["total_areas"][i] == expected["total_area"]
+            assert result["breakdowns"][i] == expected["breakdown"]
+
+    def test_calculate_matrix_breakdown_on_request(self):
+        """Test breakdowns are only built when requested"""
+        calc = WeightedCValueCalculator()
+
+        result = calc.calculate_matrix([[1.0, 1.0]], ["pavement", "grass_flat"])
+
+        assert "breakdowns" not in result
+        assert result["weighted_c_values"].tolist() == [0.5]
+
+    def test_calculate_matrix_rejects_empty_basin(self):
+        """Test a basin with no area raises ValueError"""
+        calc = WeightedCValueCalculator()
+
+        with pytest.raises(ValueError):
+            calc.calculate_matrix([[1.0, 1.0], [0.0, 0.0]], ["pavement", "grass_flat"])
+
+
+class TestCValueResolver:
+    """Tests for CValueResolver"""
+
+    def test_match_rules(self):
+        """Test exact, contained-key and containing-key matches"""
+        resolver = CValueResolver(["pavement", "asphalt", "grass_flat", "grass_steep", "roof"])
+
+        assert resolver.resolve("ROOF") == "roof"
+        assert resolver.resolve("grass - steep") == "grass_steep"
+        assert resolver.resolve("Asphalt Pavement") == "pavement"  # longest contained key
+        assert resolver.resolve("grass") == "grass_flat"  # shortest containing key
+        assert resolver.resolve("unknown_type") is None
+
+    def test_independent_of_table_order(self):
+        """Test ties resolve the same regardless of lookup table order"""
+        keys = ["concrete", "sidewalk", "pavement"]
+        forward = CValueResolver(keys)
+        backward = CValueResolver(list(reversed(keys)))
+
+        assert forward.resolve("Concrete Sidewalk") == backward.resolve("Concrete Sidewalk") == "concrete"
+
+    def test_resolutions_are_memoized(self):
+        """Test repeat lookups hit the LRU cache"""
+        resolver = CValueResolver(["pavement", "roof"])
+
+        resolver.resolve("Parking Lot Pavement")
+        resolver.resolve("Parking Lot Pavement")
+
+        assert resolver.resolve.cache_info().hits == 1
+
+    def test_shared_resolver_per_table(self):
+        """Test resolvers are shared until the table's keys change"""
+        lookup = {"pavement": 0.90, "roof": 0.85}
+        resolver = CValueResolver.for_lookup(lookup)
+
+        assert CValueResolver.for_lookup(dict(lookup)) is resolver
+
+        lookup["gravel"] = 0.50
+        assert CValueResolver.for_lookup(lookup) is not resolver
+        assert CValueResolver.for_lookup(lookup).resolve("Gravel Drive") == "gravel"
+
+
+class TestSurveyCSVParser:
+    """Tests for SurveyCSVParser"""
+
+    def test_parse_points(self, survey_csv):
+        """Test object-mode parse drops rows missing coordinates"""
+        parser = SurveyCSVParser(str(survey_csv))
+
+        points = parser.parse()
+
+        assert len(points) == 3
+        assert points[0].point_name == "100"
+        assert points[0].northing == 620962.880
+        assert points[2].point_code == "CB INV"
+
+    def test_columnar_parse(self, survey_csv):
+        """Test columnar mode keeps arrays and builds no SurveyPoint objects"""
+        parser = SurveyCSVParser(str(survey_csv), columnar=True)
+
+        columns = parser.parse_columns()
+
+        assert isinstance(parser.points, SurveyPointArray)
+        assert columns["elevation"].dtype == np.float64
+        assert list(columns["point_code"].categories) == ["CB INV", "CP1", "CP2"]
+        assert np.allclose(columns["easting"], [3042325.337, 3041215.901, 3041780.15])
+
+    def test_columnar_matches_object_mode(self, survey_csv):
+        """Test both modes produce identical statistics and DataFrames"""
+        object_parser = SurveyCSVParser(str(survey_csv))
+        columnar_parser = SurveyCSVParser(str(survey_csv), columnar=True)
+
+        assert object_parser.get_statistics() == columnar_parser.get_statistics()
+        assert object_parser.to_dataframe().equals(columnar_parser.to_dataframe())
+
+    def test_boundary_filter(self, survey_csv):
+        """Test point code filtering in both modes"""
+        object_parser = SurveyCSVParser(str(survey_csv))
+        columnar_parser = SurveyCSVParser(str(survey_csv), columnar=True)
+
+        boundary = object_parser.get_boundary_points("cp")
+        columns = columnar_parser.get_boundary_points("cp")
+
+        assert [p.point_name for p in boundary] == ["100", "101"]
+        assert list(columns["point_name"]) == ["100", "101"]
+
+    def test_boundary_edits_reach_parser_points(self, survey_csv):
+        """Test edits through filtered boundary points update the parsed points"""
+        parser = SurveyCSVParser(str(survey_csv))
+
+        boundary = parser.get_boundary_points("cp")
+        boundary[1].elevation = 1.0
+        boundary[1].point_code = "BOUNDARY"
+
+        assert parser.points.elevation[1] == 1.0
+        assert [p.point_code for p in parser.points] == ["CP1", "BOUNDARY", "CB INV"]
+
+    def test_streaming_statistics_match_full_parse(self, survey_csv):
+        """Test chunked statistics equal the in-memory statistics"""
+        full = SurveyCSVParser(str(survey_csv)).get_statistics()
+        streamed = SurveyCSVParser(str(survey_csv), chunksize=1).get_statistics()
+
+        assert streamed == full
+
+    def test_iter_batches_coerces_bad_rows(self, tmp_path):
+        """Test a non-numeric coordinate in a later chunk is dropped, not fatal"""
+        path = tmp_path / "bad.csv"
+        path.write_text(
+            "Point Name,Northing,Easting,Elevation\n"
+            "1,10,20,5\n2,11,21,6\n3,bad,22,7\n4,13,23,8\n"
+        )
+        parser = SurveyCSVParser(str(path))
+
+        batches = list(parser.iter_batches(chunksize=2))
+
+        assert [list(b["point_name"]) for b in batches] == [["1", "2"], ["4"]]
+        assert parser.columns is None
+
+    def test_columns_follow_widened_names(self, survey_csv):
+        """Test renaming a point to a longer name keeps the parser's columns current"""
+        parser = SurveyCSVParser(str(survey_csv))
+        points = parser.parse()
+
+        points[0].point_name = "BENCHMARK-100-RESET"
+        points[0].elevation = 99.0
+
+        assert parser.columns["point_name"][0] == "BENCHMARK-100-RESET"
+        assert parser.columns["elevation"][0] == 99.0
+        assert parser.to_dataframe()["point_name"].iloc[0] == "BENCHMARK-100-RESET"
+        assert parser.get_statistics()["elevation_max"] == 99.0
+
+    def test_iter_batches_coerce_resumes_after_blank_lines(self, tmp_path):
+        """Test the coercing retry resumes at the right row when blank lines precede it"""
+        path = tmp_path / "blank.csv"
+        path.write_text(
+            "Point Name,Northing,Easting,Elevation\n"
+            "1,10,20,5\n\n\n2,11,21,6\n3,12,22,7\n\n4,bad,23,8\n5,14,24,9\n"
+        )
+        parser = SurveyCSVParser(str(path))
+
+        batches = list(parser.iter_batches(chunksize=2))
+
+        assert [name for b in batches for name in b["point_name"]] == ["1", "2", "3", "5"]
+
+    def test_streaming_geojson_export(self, survey_csv, tmp_path):
+        """Test streamed GeoJSON is valid and contains every point"""
+        import json
+
+        parser = SurveyCSVParser(str(survey_csv), chunksize=2)
+        output = parser.export_to_geojson(str(tmp_path / "points.geojson"))
+
+        with open(output) as f:
+            geojson = json.load(f)
+
+        assert len(geojson["features"]) == 3
+        assert geojson["features"][0]["geometry"]["coordinates"] == [3042325.337, 620962.88, 28.367]
+
+    def test_preview(self, survey_csv):
+        """Test preview returns only the requested number of points"""
+        preview = SurveyCSVParser(str(survey_csv)).preview(2)
+
+        assert list(preview["point_name"]) == ["100", "101"]
+
+    def test_missing_columns_raises_error(self, tmp_path):
+        """Test that a CSV without coordinate columns raises ValueError"""
+        path = tmp_path / "bad.csv"
+        path.write_text("Point Name,Code\n1,CP\n")
+
+        with pytest.raises(ValueError):
+            SurveyCSVParser(str(path)).parse()
+
+
+class TestSurveyPointArray:
+    """Tests for the structured-array point store"""
+
+    def _points(self):
+        return SurveyPointArray.from_points([
+            SurveyPoint("1", 100.0, 200.0, 10.5, "EDGE"),
+            SurveyPoint("2", 101.0, 201.0, 11.5, "CP"),
+            SurveyPoint("3", 102.0, 202.0, 12.5, "EDGE"),
+        ])
+
+    def test_index_returns_point_view(self):
+        """Test index access exposes the SurveyPoint attributes"""
+        point = self._points()[-1]
+
+        assert point.point_name == "3"
+        assert point.northing == 102.0
+        assert point.point_code == "EDGE"
+        assert repr(point) == "SurveyPoint(3, N:102.0, E:202.0, Z:12.5)"
+        assert not hasattr(point, "__dict__")
+
+    def test_view_writes_through(self):
+        """Test attribute assignment on a view updates the array"""
+        points = self._points()
+
+        points[0].elevation = 9.0
+        points[0].point_code = "BOUNDARY"
+        points[0].point_name = "BM-LONG-NAME"
+
+        assert points.elevation[0] == 9.0
+        assert points[0].point_code == "BOUNDARY"
+        assert points[0].point_name == "BM-LONG-NAME"
+        assert points[1].point_name == "2"
+
+    def test_slicing_and_columns(self):
+        """Test slices return containers and columns are arrays"""
+        points = self._points()
+
+        subset = points[1:]
+
+        assert isinstance(subset, SurveyPointArray)
+        assert [p.point_name for p in subset] == ["2", "3"]
+        assert list(points.point_code) == ["EDGE", "CP", "EDGE"]
+        assert np.allclose(points.easting, [200.0, 201.0, 202.0])
+
+    def test_slice_edits_reach_parent(self):
+        """Test a code added through a slice resolves in the parent"""
+        points = self._points()
+
+        points[0:2].set_code(0, "NEWCODE")
+        points[1:][0].elevation = 5.0
+
+        assert [p.point_code for p in points] == ["NEWCODE", "CP", "EDGE"]
+        assert points.elevation[1] == 5.0
+        assert points[[0, 2]].code_categories is points.code_categories
+
+    def test_compact_storage(self):
+        """Test a record is a few dozen bytes, not a Python object graph"""
+        points = self._points()
+
+        assert points.nbytes == 3 * points.data.dtype.itemsize
+        assert points.data.dtype.itemsize <= 40
+
+
+class TestSurveyCache:
+    """Tests for the content-addressed parsed survey cache"""
+
+    def test_repeat_parse_is_cache_hit(self, survey_csv, tmp_path):
+        """Test a second parse of the same bytes loads a memory-mapped array"""
+        cache = SurveyCache(str(tmp_path / "cache"))
+        first = SurveyCSVParser(str(survey_csv), cache=cache).parse()
+
+        copy = tmp_path / "renamed.csv"
+        copy.write_bytes(survey_csv.read_bytes())
+        second = SurveyCSVParser(str(copy), cache=cache).parse()
+
+        assert isinstance(second.data, np.memmap)
+        assert [p.point_name for p in second] == [p.point_name for p in first]
+        assert list(second.point_code) == list(first.point_code)
+
+    def test_streamed_parse_populates_cache(self, survey_csv, tmp_path):
+        """Test chunked batches with differing point codes merge into one entry"""
+        cache = SurveyCache(str(tmp_path / "cache"))
+        streamed = SurveyCSVParser(str(survey_csv), chunksize=1, cache=cache).get_statistics()
+
+        parser = SurveyCSVParser(str(survey_csv), cache=cache)
+        points = parser.parse()
+
+        assert isinstance(points.data, np.memmap)
+        assert parser.get_statistics() == streamed
+        assert [p.point_code for p in points] == ["CP1", "CP2", "CB INV"]
+        assert not list((tmp_path / "cache").glob("*.part*"))
+
+    def test_cached_preview_reads_only_previewed_rows(self, survey_csv, tmp_path, monkeypatch):
+        """Test a preview of a cached survey never builds the full DataFrame"""
+        cache = SurveyCache(str(tmp_path / "cache"))
+        SurveyCSVParser(str(survey_csv), cache=cache).parse()
+
+        parser = SurveyCSVParser(str(survey_csv), chunksize=1, cache=cache)
+        parser.get_statistics()
+
+        def full_frame(self):
+            raise AssertionError("preview built the full DataFrame")
+
+        monkeypatch.setattr(SurveyCSVParser, "to_dataframe", full_frame)
+        preview = parser.preview(2)
+
+        assert isinstance(parser.points.data, np.memmap)
+        assert list(preview.columns) == ["point_name", "northing", "easting", "elevation", "point_code"]
+        assert list(preview["point_name"]) == ["100", "101"]
+        assert list(preview["point_code"].astype(str)) == ["CP1", "CP2"]
+
+    def test_lru_eviction(self, survey_csv, tmp_path):
+        """Test the least recently used entry is evicted over the size limit"""
+        cache = SurveyCache(str(tmp_path / "cache"))
+        points = SurveyCSVParser(str(survey_csv)).parse()
+
+        cache.put("a", points)
+        entry_bytes = cache.total_bytes()
+        cache.max_bytes = entry_bytes * 2
+        time.sleep(0.01)
+        cache.put("b", points)
+        time.sleep(0.01)
+        cache.get("a")
+        time.sleep(0.01)
+        cache.put("c", points)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+
+class TestBatchAreaCalculator:
+    """Test multi-basin batch calculation"""
+
+    @staticmethod
+    def make_basins(count):
+        return [
+            {
+                "area_label": f"E-DA{i + 1}",
+                "total_polygon": [[0, 0], [100 + i, 0], [100 + i, 100], [0, 100]],
+                "impervious_polygons": [[[0, 0], [50, 0], [50, 50], [0, 50]]],
+                "land_use_areas": {"pavement": 2500, "grass_flat": 7500 + 100 * i},
+            }
+            for i in range(count)
+        ]
+
+    def test_matches_single_basin_calculation(self):
+        """Test batch results match per-basin calculator results"""
+        basins = self.make_basins(3)
+        results = BatchAreaCalculator().calculate(basins)
+
+        area_calc = AreaCalculator()
+        c_calc = WeightedCValueCalculator()
+        for basin, result in zip(basins, results):
+            assert result["area_label"] == basin["area_label"]
+            assert result["area_result"] == area_calc.calculate_split_areas(
+                basin["total_polygon"], basin["impervious_polygons"]
+            )
+            assert result["c_result"] == c_calc.calculate_weighted_c(basin["land_use_areas"])
+            assert result["elapsed_ms"] >= 0
+
+    def test_process_pool_preserves_order(self):
+        """Test the parallel path returns results in input order"""
+        basins = self.make_basins(6)
+        serial = BatchAreaCalculator(max_workers=1).calculate(basins)
+        parallel = BatchAreaCalculator(max_workers=2, min_parallel_basins=1).calculate(basins)
+
+        assert [r["area_label"] for r in parallel] == [b["area_label"] for b in basins]
+        assert [r["area_result"] for r in parallel] == [r["area_result"] for r in serial]
+
+    def test_shared_executor_is_reused(self):
+        """Test calls with a shared pool run on it and leave it open"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        basins = self.make_basins(4)
+        serial = BatchAreaCalculator(max_workers=1).calculate(basins)
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            calc = BatchAreaCalculator(min_parallel_basins=1, executor=pool)
+            first = calc.calculate(basins)
+            second = calc.calculate(basins)
+
+        assert [r["c_result"] for r in first] == [r["c_result"] for r in serial]
+        assert [r["area_label"] for r in second] == [b["area_label"] for b in basins]
+
+    def test_failed_basin_reports_error(self):
+        """Test a bad basin is reported without failing the batch"""
+        basins = self.make_basins(2)
+        basins[1]["total_polygon"] = [[0, 0], [100, 0]]
+
+        results = BatchAreaCalculator().calculate(basins)
+
+        assert "error" not in results[0]
+        assert results[1]["area_label"] == "E-DA2"
+        assert "error" in results[1]
+
+
+class TestTOCExcelUpdater:
+    """Tests for TOCExcelUpdater"""
+
+    DRAINAGE_AREAS = [
+        {
+            "area_label": f"E-DA{i}",
+            "total_area_acres": 1.5 * i,
+            "impervious_area_acres": 0.5 * i,
+            "pervious_area_acres": 1.0 * i,
+            "weighted_c_value": 0.45,
+            "impervious_percentage": 33.3,
+        }
+        for i in range(1, 6)
+    ]
+
+    TOC_DATA = {"E-DA1": {"tc_sheet": 5.2, "tc_shallow": 3.8, "tc_channel": 2.1}}
+
+    def test_streaming_export_matches_update(self, tmp_path):
+        """Test write-only export produces the same cells as the in-memory path"""
+        from openpyxl import load_workbook
+
+        updater = TOCExcelUpdater()
+        updater.create_new_workbook()
+        updater.update_drainage_area_data("Drainage Areas", self.DRAINAGE_AREAS)
+        updater.update_toc_calculations("TOC Calculations", self.TOC_DATA)
+        updater.save(str(tmp_path / "classic.xlsx"))
+
+        rows = TOCExcelUpdater().export_streaming(
+            str(tmp_path / "streamed.xlsx"),
+            drainage_areas=iter(self.DRAINAGE_AREAS),
+            toc_data=self.TOC_DATA,
+        )
+        assert rows == 6
+
+        classic = load_workbook(tmp_path / "classic.xlsx")
+        streamed = load_workbook(tmp_path / "streamed.xlsx")
+        assert streamed.sheetnames == classic.sheetnames
+
+        for name in classic.sheetnames:
+            expected = [[cell.value for cell in row] for row in classic[name].iter_rows()]
+            assert [[cell.value for cell in row] for row in streamed[name].iter_rows()] == expected
+
+        assert streamed["Drainage Areas"]["B2"].number_format == "0.00"
+        assert streamed["Drainage Areas"]["E2"].number_format == "0.000"
+        assert streamed["Drainage Areas"]["A1"].font.b
+        assert streamed["TOC Calculations"]["H2"].value == "=SUM(E2:G2)"
+
+    def test_template_fill_keeps_template_fonts(self, tmp_path):
+        """Test data rows written into a template keep the template's font"""
+        from openpyxl import Workbook
+        from openpyxl.styles import Font
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Drainage Areas"
+        for col in range(1, 9):
+            ws.cell(row=2, column=col).font = Font(name="Arial Narrow", size=9)
+        wb.save(tmp_path / "template.xlsx")
+
+        updater = TOCExcelUpdater()
+        updater.load_template(str(tmp_path / "template.xlsx"))
+        updater.update_drainage_area_data("Drainage Areas", self.DRAINAGE_AREAS[:1])
+
+        cell = updater.workbook["Drainage Areas"]["B2"]
+        assert cell.font.name == "Arial Narrow"
+        assert cell.number_format == "0.00"
+        assert cell.border.left.style == "thin"
+        assert cell.style == "Normal"
+
+    def test_fill_named_ranges(self, tmp_path):
+        """Test only the cells behind named ranges are written"""
+        from openpyxl import Workbook, load_workbook
+        from openpyxl.workbook.defined_name import DefinedName
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Summary"
+        ws["D1"] = "keep me"
+        wb.defined_names["PROJECT_NAME"] = DefinedName("PROJECT_NAME", attr_text="Summary!$B$1")
+        wb.defined_names["AREA_LABELS"] = DefinedName("AREA_LABELS", attr_text="Summary!$A$3:$A$5")
+        wb.save(tmp_path / "template.xlsx")
+
+        updater = TOCExcelUpdater()
+        updater.load_template(str(tmp_path / "template.xlsx"))
+        written = updater.fill_named_ranges({
+            "PROJECT_NAME": "Acadiana High",
+            "AREA_LABELS": ["E-DA1", "E-DA2"],
+        })
+        updater.save(str(tmp_path / "filled.xlsx"))
+
+        ws = load_workbook(tmp_path / "filled.xlsx")["Summary"]
+        assert written == 3
+        assert ws["B1"].value == "Acadiana High"
+        assert [ws[f"A{row}"].value for row in range(3, 6)] == ["E-DA1", "E-DA2", None]
+        assert ws["D1"].value == "keep me"
+
+        with pytest.raises(ValueError):
+            updater.fill_named_ranges({"MISSING": 1})
+
+
+class TestFormulaEvaluator:
+    """Tests for FormulaEvaluator and cached formula values"""
+
+    @pytest.fixture
+    def workbook(self):
+        from openpyxl import Workbook
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "TOC"
+        ws.append(["E-DA1", 0, 0, 0, 5.2, 3.8, 2.1, "=SUM(E1:G1)"])
+        ws["A3"] = "=H1*2"
+        ws["A4"] = "=A4+1"
+
+        lookup = wb.create_sheet("C Values")
+        lookup.append(["pavement", 0.90])
+        lookup.append(["roof", 0.85])
+        return wb
+
+    @pytest.mark.parametrize("formula,expected", [
+        ("=SUM(E1:G1)", 11.1),
+        ("=ROUND(SUM(E1:G1)*1.05,1)", 11.7),
+        ("=PRODUCT(E1,2)", 10.4),
+        ("=SUMPRODUCT(E1:F1,E1:F1)", 5.2 ** 2 + 3.8 ** 2),
+        ("=VLOOKUP(\"roof\",'C Values'!A1:B2,2,FALSE)", 0.85),
+        ("=INDEX('C Values'!B1:B2,MATCH(\"pavement\",'C Values'!A1:A2,0))", 0.90),
+        ("=IF(H1>10,\"long\",\"short\")", "long"),
+        ("=IF(B1=0,0,E1/B1)", 0),
+        ("=IF(B1<>0,E1/B1,\"n/a\")", "n/a"),
+        ("=IF(B1=0,IF(C1=0,1,E1/C1),E1/B1)", 1),
+        ("=IF(E1>0,ROUND(E1,0))", 5),
+        ("=IF(Z9=\"\",1,2)+IF(Z9=0,10,20)", 11),
+        ("=A3", 22.2),
+        ("=-2^2+50%", 4.5),
+    ])
+    def test_evaluate(self, workbook, formula, expected):
+        """Test supported formula types"""
+        result = FormulaEvaluator.for_workbook(workbook).evaluate(formula, "TOC")
+
+        if isinstance(expected, str):
+            assert result == expected
+        else:
+            assert result == pytest.approx(expected)
+
+    @pytest.mark.parametrize("formula", [
+        "=A4", "=NPV(0.1,E1:G1)", "=SUM(E:E)", "=1/0", "=IF(B1=0,1,2,3)",
+        "=(-8)^0.5", "=10.0^400", "=10^308*10",
+    ])
+    def test_unsupported_raises(self, workbook, formula):
+        """Test circular references, unsupported formulas and #NUM! results raise FormulaError"""
+        with pytest.raises(FormulaError):
+            FormulaEvaluator.for_workbook(workbook).evaluate(formula, "TOC")
+
+    def test_saved_workbook_has_cached_values(self, tmp_path):
+        """Test formula results are readable in data_only mode after save and streaming export"""
+        from openpyxl import load_workbook
+
+        toc_data = {"E-DA1": {"tc_sheet": 5.2, "tc_shallow": 3.8, "tc_channel": 2.1}}
+
+        updater = TOCExcelUpdater()
+        updater.create_new_workbook()
+        updater.update_toc_calculations("TOC Calculations", toc_data)
+        updater.save(str(tmp_path / "saved.xlsx"))
+
+        TOCExcelUpdater().export_streaming(str(tmp_path / "streamed.xlsx"), toc_data=toc_data)
+
+        for name in ("saved.xlsx", "streamed.xlsx"):
+            ws = load_workbook(tmp_path / name, data_only=True)["TOC Calculations"]
+            assert ws["H2"].value == pytest.approx(11.1)
+
+            # Formula is kept for Excel
+            assert load_workbook(tmp_path / name)["TOC Calculations"]["H2"].value == "=SUM(E2:G2)"
+
+        assert updater.get_sheet_data("TOC Calculations")[0]["Tc Total (min)"] == pytest.approx(11.1)
+
+    def test_num_error_formula_left_uncached(self, tmp_path):
+        """Test a formula with no real result saves without a cached value"""
+        from openpyxl import load_workbook
+
+        updater = TOCExcelUpdater()
+        updater.create_new_workbook()
+        ws = updater.workbook.create_sheet("Checks")
+        ws["A1"] = "=(-8)^0.5"
+        ws["A2"] = "=10.0^400"
+        ws["A3"] = "=2^3"
+        updater.save(str(tmp_path / "num.xlsx"))
+
+        values = load_workbook(tmp_path / "num.xlsx", data_only=True)["Checks"]
+        assert [values[f"A{row}"].value for row in range(1, 4)] == [None, None, 8]
+
+
+class TestTOCWorkbookReader:
+    """Tests for read-only TOC workbook import"""
+
+    SUNSET_PARK = Path(__file__).resolve().parents[3] / "project_context" / "25-020 TOC Calculation SUNSET PARK.xlsx"
+
+    @pytest.fixture
+    def generated_workbook(self, tmp_path):
+        updater = TOCExcelUpdater()
+        updater.create_new_workbook()
+        updater.update_drainage_area_data("Drainage Areas", [
+            {"area_label": "E-DA1", "total_area_acres": 1.25, "weighted_c_value": 0.55},
+        ])
+        updater.update_toc_calculations("TOC Calculations", {
+            "E-DA1": {"tc_sheet": 5.2, "tc_shallow": 3.8, "tc_channel": 2.1},
+        })
+        path = tmp_path / "generated.xlsx"
+        updater.save(str(path))
+        return path
+
+    def test_generated_workbook_round_trip(self, generated_workbook):
+        """Test drainage area and TOC sheets merge into one record"""
+        records = TOCWorkbookReader(str(generated_workbook)).read()
+
+        assert len(records) == 1
+        assert records[0].area_label == "E-DA1"
+        assert records[0].total_area_acres == 1.25
+        assert records[0].weighted_c_value == 0.55
+        assert records[0].tc_sheet == 5.2
+        assert records[0].tc_channel == 2.1
+        assert records[0].tc_minutes == pytest.approx(11.1)  # cached =SUM() result
+
+    @pytest.mark.skipif(not SUNSET_PARK.exists(), reason="Sample workbook not available")
+    def test_legacy_calc_summary(self):
+        """Test the side-by-side existing/proposed summary layout"""
+        records = {r.area_label: r for r in TOCWorkbookReader(str(self.SUNSET_PARK)).read()}
+
+        assert set(records) == {"E-DA1", "E-DA2", "POST-DA1", "POST-DA2"}
+        assert records["E-DA1"].condition == "existing"
+        assert records["POST-DA2"].condition == "proposed"
+        assert records["E-DA1"].outfall == "Outfall 1"
+        assert records["E-DA1"].tc_minutes == pytest.approx(18.087, abs=0.001)
+        assert records["POST-DA1"].hydraulic_length_ft == 334.56
+
+    def test_get_sheet_data_read_only(self, generated_workbook):
+        """Test get_sheet_data streams the file when no workbook is loaded"""
+        updater = TOCExcelUpdater(str(generated_workbook))
+
+        rows = updater.get_sheet_data("Drainage Areas")
+
+        assert updater.workbook is None
+        assert rows[0]["Drainage Area"] == "E-DA1"
+
+    def test_import_directory(self, generated_workbook, tmp_path):
+        """Test parallel directory import reports bad workbooks"""
+        shutil.copy(generated_workbook, tmp_path / "copy.xlsx")
+        (tmp_path / "broken.xlsx").write_text("not a workbook")
+        (tmp_path / "~$generated.xlsx").write_text("lock file")
+
+        results = import_toc_directory(str(tmp_path), max_workers=2)
+
+        assert [Path(r.path).name for r in results] == ["broken.xlsx", "copy.xlsx", "generated.xlsx"]
+        assert results[0].error is not None
+        assert [len(r.records) for r in results[1:]] == [1, 1]
+
+    def test_import_directory_on_shared_executor(self, generated_workbook, tmp_path):
+        """Test a shared pool parses the workbooks and is left open"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        shutil.copy(generated_workbook, tmp_path / "copy.xlsx")
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            first = import_toc_directory(str(tmp_path), executor=pool)
+            second = import_toc_directory(str(tmp_path), executor=pool)
+
+        assert [len(r.records) for r in first] == [1, 1]
+        assert [r.to_dict() for r in second] == [r.to_dict() for r in first]
+
+    def test_import_directory_confined_to_root(self, generated_workbook, tmp_path):
+        """Test imports under a root reject escapes and cap the workbook count"""
+        root = tmp_path / "projects"
+        (root / "sunset").mkdir(parents=True)
+        shutil.copy(generated_workbook, root / "sunset" / "toc.xlsx")
+        (root / "sunset" / "outside.xlsx").symlink_to(generated_workbook)
+
+        with pytest.raises(ValueError, match="outside the import root"):
+            import_toc_directory("sunset", root=str(root))
+        with pytest.raises(ValueError, match="outside the import root"):
+            import_toc_directory("../", root=str(root))
+        with pytest.raises(ValueError, match="outside the import root"):
+            import_toc_directory(str(tmp_path), root=str(root))
+        with pytest.raises(ValueError, match="Invalid workbook pattern"):
+            import_toc_directory("sunset", pattern="../*.xlsx", root=str(root))
+
+        results = import_toc_directory("sunset", pattern="toc.xlsx", root=str(root), max_files=1)
+        assert [len(r.records) for r in results] == [1]
+
+        (root / "sunset" / "outside.xlsx").unlink()
+        shutil.copy(generated_workbook, root / "sunset" / "toc2.xlsx")
+        with pytest.raises(ValueError, match="More than 1 workbooks"):
+            import_toc_directory("sunset", root=str(root), max_files=1)
+
+
+class TestSurfaceModel:
+    """Test TIN surface, DEM rasterization and flow path tracing"""
+
+    @staticmethod
+    def sloped_plane(n=2000, seed=0):
+        """Random points on a plane falling 2 ft per 100 ft to the east"""
+        rng = np.random.default_rng(seed)
+        x = np.concatenate([rng.uniform(0, 1000, n), [0, 1000, 0, 1000]])
+        y = np.concatenate([rng.uniform(0, 1000, n), [0, 0, 1000, 1000]])
+        return x, y, 100 - 0.02 * x
+
+    def test_rasterize_plane(self):
+        """Barycentric interpolation reproduces a plane exactly"""
+        x, y, z = self.sloped_plane()
+        dem = SurfaceModel.from_points(x, y, z).rasterize(cell_size=10.0)
+
+        cx, _ = dem.cell_centers()
+        assert dem.shape == (100, 100)
+        assert not np.isnan(dem.elevation).any()
+        assert np.allclose(dem.elevation, 100 - 0.02 * cx)
+
+    def test_flow_path_on_plane(self):
+        """Path runs due east across the basin"""
+        x, y, z = self.sloped_plane()
+        surface = SurfaceModel.from_points(x, y, z)
+
+        path = surface.flow_path([(100, 100), (900, 100), (900, 900), (100, 900)], cell_size=10.0)
+
+        assert path.length_ft == pytest.approx(790.0)
+        assert path.elevation_change_ft == pytest.approx(15.8)
+        assert path.slope == pytest.approx(0.02)
+        assert path.coordinates[0][0] < path.coordinates[-1][0]
+        assert np.ptp(path.coordinates[:, 1]) == 0
+
+    def test_flow_path_ends_at_pit(self):
+        """Paths stop at the low point of a bowl"""
+        gx, gy = np.meshgrid(np.arange(0, 101, 5.0), np.arange(0, 101, 5.0))
+        gz = np.hypot(gx - 50, gy - 50) / 10
+        surface = SurfaceModel.from_points(gx.ravel(), gy.ravel(), gz.ravel())
+
+        path = surface.flow_path([(0, 0), (100, 0), (100, 100), (0, 100)], cell_size=5.0)
+
+        # Ends in one of the four cells around the centre
+        assert np.hypot(*(path.coordinates[-1][:2] - 50)) < 5
+        assert path.elevation_change_ft > 0
+
+    def test_triangulation_cache(self, tmp_path):
+        """Same points reuse the cached triangulation, in memory and on disk"""
+        x, y, z = self.sloped_plane(n=500)
+
+        cache = TINCache(str(tmp_path))
+        first = SurfaceModel.from_points(x, y, z, cache=cache)
+        second = SurfaceModel.from_points(x, y, z + 1, cache=cache)
+        assert second.triangles is first.triangles
+
+        reloaded = SurfaceModel.from_points(x, y, z, cache=TINCache(str(tmp_path)))
+        assert np.array_equal(reloaded.triangles, first.triangles)
+        assert len(list(tmp_path.glob("*.tin.npy"))) == 1
+
+    def test_triangulation_cache_evicts_by_size(self, tmp_path):
+        """Persisted triangulations are evicted least recently used first"""
+        cache = TINCache(str(tmp_path), max_entries=1)
+        first = SurfaceModel.from_points(*self.sloped_plane(n=300, seed=1), cache=cache)
+        first_key = TINCache.key_for(first.x, first.y)
+
+        cache.max_bytes = cache.total_bytes()
+        SurfaceModel.from_points(*self.sloped_plane(n=300, seed=2), cache=cache)
+
+        assert len(list(tmp_path.glob("*.tin.npy"))) == 1
+        assert cache.get(first_key) is None
+
+    def test_too_few_points(self):
+        with pytest.raises(ValueError):
+            SurfaceModel.from_points([0, 1], [0, 1], [1, 2])
+
+    def test_basin_outside_survey(self):
+        x, y, z = self.sloped_plane(n=200)
+        surface = SurfaceModel.from_points(x, y, z)
+
+        with pytest.raises(ValueError):
+            surface.flow_path([(5000, 5000), (5100, 5000), (5100, 5100)])
+
+
+class TestFlowRouter:
+    """Test depression routing, flow accumulation and basin delineation"""
+
+    @staticmethod
+    def valley_dem(size=60, cell_size=10.0):
+        """Two V-shaped valleys draining south, split by a ridge down the middle"""
+        rows, cols = np.mgrid[0:size, 0:size].astype(float)
+        # Slight eastward tilt so the ridge column drains to one side
+        elevation = 100 + 0.05 * rows + 0.2 * np.abs((cols % (size // 2)) - size // 4) - 0.001 * cols
+        return DEMGrid(elevation, 0.0, 0.0, cell_size)
+
+    def test_depression_drains_to_edge(self):
+        """A bowl is filled to its spill level and routed out, not left as a sink"""
+        rows, cols = np.mgrid[0:40, 0:40].astype(float)
+        bowl = 3.0 * np.exp(-((rows - 20) ** 2 + (cols - 20) ** 2) / 40)
+        dem = DEMGrid(100 + 0.1 * rows - bowl, 0.0, 0.0, 5.0)
+
+        router = FlowRouter(dem)
+        _, terminals = dem.downstream_lengths(router.receivers)
+
+        assert router._boundary().ravel()[terminals].all()
+        assert (router.filled >= dem.elevation).all()
+        assert router.filled[20, 20] > dem.elevation[20, 20]
+        assert router.flow_accumulation().ravel()[terminals].max() > 100
+
+    def test_accumulation_conserves_cells(self):
+        """Every cell is counted once at the outlets, for D8 and D-infinity"""
+        router = FlowRouter(self.valley_dem())
+        index = np.arange(router.receivers.size)
+        outlets = router.receivers == index
+
+        assert router.flow_accumulation("d8").ravel()[outlets].sum() == pytest.approx(3600)
+        assert router.flow_accumulation("dinf").ravel()[outlets].sum() == pytest.approx(3600)
+
+    def test_dinf_direction_on_plane(self):
+        """Flow angle follows the plane's aspect and splits between two cells"""
+        rows, cols = np.mgrid[0:20, 0:20].astype(float)
+        # Falls toward the east and slightly north: aspect atan(0.5) ~ 26.6 degrees
+        dem = DEMGrid(100 - cols - 0.5 * rows, 0.0, 0.0, 1.0)
+
+        angle, receiver_1, receiver_2, fraction_1 = FlowRouter(dem).dinf_directions()
+        cell = 10 * 20 + 10
+
+        assert angle[10, 10] == pytest.approx(np.arctan(0.5))
+        assert receiver_1[cell] == cell + 1
+        assert receiver_2[cell] == cell + 21
+        assert fraction_1[cell] == pytest.approx(1 - np.arctan(0.5) / (np.pi / 4))
+
+    def test_invalid_method(self):
+        with pytest.raises(ValueError):
+            FlowRouter(self.valley_dem()).flow_accumulation("mfd")
+
+    def test_delineate_pour_points(self):
+        """Outlets in each valley split the site in half"""
+        router = FlowRouter(self.valley_dem())
+        basins = router.basins(pour_points=[(155.0, 0.0), (455.0, 0.0)], snap_distance=20.0)
+
+        assert [b.label for b in basins] == [1, 2]
+        for basin in basins:
+            assert basin.cell_count == 1800
+            assert basin.polygon.geom_type == "Polygon"
+            assert basin.area_acres == pytest.approx(180000 / 43560.0)
+
+        split = AreaCalculator(precision=4).calculate_split_areas(basins[0].coordinates)
+        assert split["total_area_acres"] == pytest.approx(basins[0].area_acres, abs=1e-4)
+
+    def test_nested_pour_points(self):
+        """An upstream outlet carves a sub-basin out of the downstream one"""
+        router = FlowRouter(self.valley_dem())
+        labels = router.delineate(pour_points=[(155.0, 0.0), (155.0, 300.0)], snap_distance=20.0)
+
+        assert (labels == 2).sum() > 0
+        assert (labels == 1).sum() + (labels == 2).sum() == 1800
+        assert (labels[31:, :30] == 2).all()
+
+    def test_delineate_edge_outlets(self):
+        """Without pour points, basins are numbered largest first and small ones dropped"""
+        router = FlowRouter(self.valley_dem())
+        labels = router.delineate(min_area_acres=1.0)
+
+        counts = np.bincount(labels.ravel())[1:]
+        assert len(counts) == 2
+        assert list(counts) == sorted(counts, reverse=True)
+
+    def test_surface_model_basins(self):
+        """Survey points to basins in one call"""
+        rng = np.random.default_rng(3)
+        x = np.concatenate([rng.uniform(0, 600, 3000), [0, 600, 0, 600]])
+        y = np.concatenate([rng.uniform(0, 600, 3000), [0, 0, 600, 600]])
+        z = 100 + 0.005 * y + 0.02 * np.abs(x - 300)
+
+        basins = SurfaceModel.from_points(x, y, z).delineate_basins(
+            pour_points=[(300.0, 0.0)], cell_size=10.0, snap_distance=30.0
+        )
+
+        assert len(basins) == 1
+        assert basins[0].area_acres > 0.5 * 360000 / 43560.0
+
 
 # Integration test with real Acadiana High data
 class TestAcadianaHighExample:
@@ -0,0 +1,180 @@
+"""
+Unit tests for Module B - PDF Parser
+"""
+import pdfplumber
+import pytest
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from backend.services.module_b.pdf_parser import PDFParser
+from backend.services.module_b.extraction_cache import PDFExtractionCache
+
+
+def _write_pdf(path, page_count: int):
+    """PDF with a heading and a 3x3 ruled table on every page"""
+    pdf = canvas.Canvas(str(path), pagesize=letter)
+    for page in range(1, page_count + 1):
+        pdf.drawString(72, 720, f"Section {page} - Runoff coefficient C = 0.{page % 10}5")
+        for row in range(3):
+            for col in range(3):
+                pdf.rect(72 + col * 100, 600 - row * 20, 100, 20)
+                pdf.drawString(76 + col * 100, 606 - row * 20, f"R{row}C{col}")
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+def _write_mixed_pdf(path):
+    """Text-only pages, a ruled C-value table, and a ruled table without keywords"""
+    pdf = canvas.Canvas(str(path), pagesize=letter)
+    for page in range(1, 11):
+        pdf.drawString(72, 720, f"Chapter {page} narrative text only")
+        if page in (4, 8):
+            header = "Runoff Coefficient" if page == 4 else "Pipe Schedule"
+            pdf.drawString(72, 650, header)
+            for row in range(2):
+                for col in range(2):
+                    pdf.rect(72 + col * 100, 600 - row * 20, 100, 20)
+                    pdf.drawString(76 + col * 100, 606 - row * 20, f"{row}{col}")
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+@pytest.fixture(scope="module")
+def manual_pdf(tmp_path_factory):
+    return _write_pdf(tmp_path_factory.mktemp("pdf") / "manual.pdf", page_count=40)
+
+
+class TestPDFParser:
+    """Test page extraction"""
+
+    def test_parallel_matches_serial(self, manual_pdf):
+        """Parallel extraction returns the same pages in page order"""
+        serial = PDFParser(str(manual_pdf)).extract_text()
+
+        progress = []
+        parallel = PDFParser(str(manual_pdf)).extract_text(
+            parallel=True,
+            max_workers=2,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+        assert parallel == serial
+        assert [p["page_number"] for p in parallel] == list(range(1, 41))
+        assert "Section 7" in parallel[6]["text"]
+        assert parallel[0]["tables"][0][0] == ["R0C0", "R0C1", "R0C2"]
+
+        # Progress is monotonic and ends at the page count
+        assert progress[-1] == (40, 40)
+        assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+    def test_serial_progress(self, manual_pdf):
+        progress = []
+        PDFParser(str(manual_pdf)).extract_text(progress_callback=lambda done, total: progress.append(done))
+
+        assert progress == list(range(1, 41))
+
+    def test_lazy_page_access(self, manual_pdf, monkeypatch):
+        """A single page costs a single page extraction, then hits the LRU"""
+        extracted = []
+        extract_text = pdfplumber.page.Page.extract_text
+
+        def counting_extract_text(page, *args, **kwargs):
+            extracted.append(page.page_number)
+            return extract_text(page, *args, **kwargs)
+
+        monkeypatch.setattr(pdfplumber.page.Page, "extract_text", counting_extract_text)
+
+        with PDFParser(str(manual_pdf), page_cache_size=2) as parser:
+            assert "Section 31" in parser.get_page_text(31)
+            assert parser.get_page_text(31) == parser.get_page_text(31)
+            assert extracted == [31]
+            assert parser.pages == []
+
+            parser.get_page_text(1)
+            parser.get_page_text(2)  # evicts page 31
+            parser.get_page_text(31)
+            assert extracted == [31, 1, 2, 31]
+
+            assert parser.get_page_tables(5)[0][1] == ["R1C0", "R1C1", "R1C2"]
+            assert parser.page_count == 40
+            assert [m["page_number"] for m in parser.search_text(r"Section 4\b")] == [4]
+
+            with pytest.raises(ValueError):
+                parser.get_page_text(41)
+
+    def test_table_prefilter(self, tmp_path):
+        """Pages without ruling lines (or keywords) skip extract_tables"""
+        path = _write_mixed_pdf(tmp_path / "udc.pdf")
+
+        parser = PDFParser(str(path))
+        pages = parser.extract_text()
+        assert [p["page_number"] for p in pages if p["tables"]] == [4, 8]
+        assert parser.table_stats["skipped_no_ruling"] == 8
+        assert parser.tables_skipped == 8
+
+        parser = PDFParser(str(path), table_keywords=["runoff coefficient"])
+        pages = parser.extract_text()
+        assert [p["page_number"] for p in pages if p["tables"]] == [4]
+        assert parser.table_stats["extracted"] == 1
+        assert parser.table_stats["skipped_no_keywords"] == 1
+
+        lazy = PDFParser(str(path))
+        assert lazy.get_page_tables(2) == []
+        assert lazy.get_page_tables(4) == pages[3]["tables"]
+        assert dict(lazy.table_stats) == {"pages": 2, "skipped_no_ruling": 1, "extracted": 1}
+
+
+class TestPDFExtractionCache:
+    """Test the content-addressed extraction cache"""
+
+    def test_hit_skips_pdfplumber(self, manual_pdf, tmp_path, monkeypatch):
+        cache = PDFExtractionCache(str(tmp_path / "cache"))
+
+        first = PDFParser(str(manual_pdf), cache=cache)
+        pages = first.extract_text()
+        metadata = first.get_metadata()
+        assert not first.from_cache
+        assert len(list((tmp_path / "cache").glob("*.jsonl.gz"))) == 1
+
+        def no_pdfplumber(*args, **kwargs):
+            raise AssertionError("pdfplumber opened on a cache hit")
+
+        monkeypatch.setattr(pdfplumber, "open", no_pdfplumber)
+        monkeypatch.setattr("backend.services.module_b.pdf_parser.PyPDF2.PdfReader", no_pdfplumber)
+
+        # Same bytes under another name
+        copy = tmp_path / "copy.pdf"
+        copy.write_bytes(manual_pdf.read_bytes())
+
+        second = PDFParser(str(copy), cache=cache)
+        assert second.extract_text() == pages
+        assert second.from_cache
+        assert second.get_metadata() == metadata
+        assert PDFParser(str(copy), cache=cache).get_page_text(3) == pages[2]["text"]
+
+    def test_key_tracks_parser_output(self, manual_pdf, tmp_path):
+        cache = PDFExtractionCache(str(tmp_path))
+        plain = PDFParser(str(manual_pdf), cache=cache)
+        filtered = PDFParser(str(manual_pdf), cache=cache, table_keywords=["runoff"])
+
+        assert plain._get_cache_key() != filtered._get_cache_key()
+        assert plain._get_cache_key() == cache.key_for(str(manual_pdf), f"p{PDFParser.PARSER_VERSION}")
+
+    def test_corrupt_entry_and_eviction(self, tmp_path):
+        cache = PDFExtractionCache(str(tmp_path), max_bytes=10 ** 9)
+        pages = [{"page_number": 1, "text": "x" * 5000, "tables": [[["a", None]]], "width": 612, "height": 792}]
+
+        cache.put("a", pages, {"total_pages": 1})
+        assert cache.get("a") == {"metadata": {"total_pages": 1}, "pages": pages}
+
+        cache.entry_path("a").write_bytes(b"not gzip")
+        assert cache.get("a") is None
+        assert not cache.entry_path("a").exists()
+
+        cache.put("b", pages, {})
+        cache.max_bytes = cache.total_bytes()
+        cache.put("c", pages, {})
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
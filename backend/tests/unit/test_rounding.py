@@ -0,0 +1,95 @@
+"""
+Unit tests for the shared rounding kernel
+
+Equivalence properties are checked against the Decimal reference over
+seeded random samples built to hit every branch: plain values, exact and
+inexact .5 ties, signed zeros, tiny and huge magnitudes, and non-finite values.
+"""
+import math
+
+import pytest
+import numpy as np
+from backend.services.rounding import (
+    round_half_up,
+    round_half_up_array,
+    round_half_up_decimal,
+    round_builtin_array,
+)
+
+
+def _samples(decimal_places: int, seed: int) -> np.ndarray:
+    """Adversarial float64 samples for rounding to decimal_places"""
+    rng = np.random.default_rng(seed)
+    scale = 10.0 ** decimal_places
+    ties = (rng.integers(-10**6, 10**6, 2000) + 0.5) / scale
+    return np.concatenate([
+        rng.uniform(-1e5, 1e5, 2000),
+        rng.uniform(-1.0, 1.0, 2000),
+        np.round(rng.uniform(-1e3, 1e3, 2000), decimal_places + 1),
+        ties,
+        np.nextafter(ties, np.inf),
+        np.nextafter(ties, -np.inf),
+        rng.standard_normal(500) * 10.0 ** -(decimal_places + 3),
+        10.0 ** rng.uniform(10, 20, 200) * rng.choice([-1, 1], 200),
+        [0.0, -0.0, 2.675, 1.005, -2.675, 0.125, -0.125, 1e-300],
+    ])
+
+
+def _same(a: float, b: float) -> bool:
+    """Bit-level equality, including the sign of zero and NaN"""
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return a == b and math.copysign(1.0, a) == math.copysign(1.0, b)
+
+
+class TestRoundHalfUp:
+    """Scalar and array kernels against Decimal(str(v)).quantize(ROUND_HALF_UP)"""
+
+    @pytest.mark.parametrize("decimal_places", [0, 1, 2, 3, 4, 6])
+    def test_scalar_matches_decimal(self, decimal_places):
+        for value in _samples(decimal_places, seed=decimal_places).tolist():
+            expected = round_half_up_decimal(value, decimal_places)
+            assert _same(round_half_up(value, decimal_places), expected), value
+
+    @pytest.mark.parametrize("decimal_places", [0, 1, 2, 3, 4, 6])
+    def test_array_matches_scalar(self, decimal_places):
+        values = _samples(decimal_places, seed=100 + decimal_places)
+        rounded = round_half_up_array(values.reshape(-1, 2), decimal_places)
+
+        assert rounded.shape == (values.size // 2, 2)
+        for value, result in zip(values.tolist(), rounded.reshape(-1).tolist()):
+            assert _same(result, round_half_up_decimal(value, decimal_places)), value
+
+    def test_ties_round_away_from_zero(self):
+        assert round_half_up(2.5, 0) == 3.0
+        assert round_half_up(-2.5, 0) == -3.0
+        assert round_half_up(2.675, 2) == 2.68  # stored as 2.67499999...
+        assert round_half_up(0.0125, 3) == 0.013
+        assert list(round_half_up_array([0.5, 1.5, -0.5, 2.675], 0)) == [1.0, 2.0, -1.0, 3.0]
+
+    def test_special_values(self):
+        assert round_half_up(None, 2) == 0.0
+        assert round_half_up(7, 2) == 7.0
+        assert round_half_up(np.float64(1.005), 2) == 1.01
+        # float32 rounds on its own (short) repr, like Decimal(str(v))
+        assert round_half_up(np.float32(0.125), 2) == round_half_up_decimal(np.float32(0.125), 2)
+        assert math.isnan(round_half_up(float("nan"), 2))
+        assert np.isnan(round_half_up_array([np.nan, 1.0], 2)[0])
+        assert math.copysign(1.0, round_half_up(-0.001, 2)) == -1.0
+
+    def test_negative_places(self):
+        assert round_half_up(1250.0, -2) == 1300.0
+        assert list(round_half_up_array([1249.0, -1250.0], -2)) == [1200.0, -1300.0]
+
+
+class TestRoundBuiltinArray:
+    """Vectorized round() used for C-values and Tc arrays"""
+
+    @pytest.mark.parametrize("decimal_places", [1, 2, 3])
+    def test_matches_builtin_round(self, decimal_places):
+        values = _samples(decimal_places, seed=200 + decimal_places)
+        values = values[np.abs(values) < 1e15]
+        rounded = round_builtin_array(values, decimal_places)
+
+        for value, result in zip(values.tolist(), rounded.tolist()):
+            assert _same(result, round(value, decimal_places)), value